@@ -9,4 +9,7 @@
 pip install --upgrade pip
 pip install --no-cache-dir -r requirements.txt -r requirements-web.txt
 touch /app/opt-out
-/app/web.py -o /app/opt-out -p 8888
+mkdir -p /app/cache
+# exec, so the web app receives SIGTERM and can save its caches on shutdown
+exec /app/web.py -o /app/opt-out -p 8888 -t "${GITHUB_TOKEN}" \
+    -s "${SNAPSHOT_FILE:-/app/cache/snapshot}"
@@ -10,13 +10,24 @@
 # pylint: disable=missing-function-docstring
 
 import argparse
+import concurrent.futures
+import copy
+import dataclasses
+import datetime
+import functools
+import os
 import random
 import re
+import sys
 import typing
+import urllib.parse
 import urllib.request
 
-import agithub.GitHub
-import bs4
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import agithub.base
+    import agithub.GitHub
+
+    from . import draws, sampling
 
 MAINTAINER_HTML_LIST_URL = "https://www.riot-os.org/maintainers.html"
 MAINTAINER_HTML_LIST_ID = "maintainer-list"
@@ -24,15 +35,26 @@ MAINTAINER_HTML_ENTRY_SEARCH = {"name": "h5", "class_": "card-title"}
 OPT_OUT_FORUM = "https://forum.riot-os.org/t/release-management-opt-out/3354"
 GITHUB_ORGA = "RIOT-OS"
 GITHUB_REPO = "RIOT"
+# seconds a single upstream request may block
+UPSTREAM_TIMEOUT = 30.0
+# pages of a GitHub listing fetched at the same time
+GITHUB_MAX_CONCURRENT_PAGES = 8
+# bytes read at once when streaming a response
+STREAM_CHUNK_SIZE = 64 * 1024
+# the only fields of a release used by release_manager_of() and the history index
+RELEASE_FIELDS = ("tag_name", "author.login", "published_at")
 
 
 class GitHubError(Exception):
     pass
 
 
-def get_maintainers() -> dict[str, int]:
+def get_maintainers(timeout: float = UPSTREAM_TIMEOUT) -> dict[str, int]:
+    # bs4 is only needed here, so do not make every importer pay for it
+    import bs4  # pylint: disable=import-outside-toplevel
+
     maintainers = {}
-    with urllib.request.urlopen(MAINTAINER_HTML_LIST_URL) as ml:
+    with urllib.request.urlopen(MAINTAINER_HTML_LIST_URL, timeout=timeout) as ml:
         soup = bs4.BeautifulSoup(ml.read(), "html.parser")
         maintainer_list = soup.find(id=MAINTAINER_HTML_LIST_ID)
         maintainer_list = maintainer_list.find_all(**MAINTAINER_HTML_ENTRY_SEARCH)
@@ -42,21 +64,164 @@ def get_maintainers() -> dict[str, int]:
     return maintainers
 
 
-def get_past_release_managers(github: agithub.GitHub.GitHub) -> dict[str, int]:
-    release_managers = {}
-    status, data = github.repos[GITHUB_ORGA][GITHUB_REPO].releases.get()
+def github_client(
+    token: str = None, timeout: float = UPSTREAM_TIMEOUT, **kwargs
+) -> "agithub.GitHub.GitHub":
+    import agithub.GitHub  # pylint: disable=import-outside-toplevel
+
+    github = agithub.GitHub.GitHub(token=token, paginate=True, **kwargs)
+    if timeout is not None:
+        # agithub does not support timeouts, so set it on every new connection
+        get_connection = github.client.get_connection
+
+        def get_connection_with_timeout():
+            conn = get_connection()
+            conn.timeout = timeout
+            return conn
+
+        github.client.get_connection = get_connection_with_timeout
+    return github
+
+
+def link_urls(headers: typing.Optional[list[tuple[str, str]]]) -> dict[str, str]:
+    """Map the relation types of an RFC 8288 Link header to their URLs
+
+    >>> link_urls([("Link", '<https://a.b/c?page=2>; rel="next", '
+    ...                     '<https://a.b/c?page=5>; rel="last"')])
+    {'next': 'https://a.b/c?page=2', 'last': 'https://a.b/c?page=5'}
+    """
+    urls = {}
+    for name, value in headers or []:
+        if name.lower() != "link":
+            continue
+        for link in re.finditer(r'<([^>]*)>\s*;[^,]*?rel="?([^",;]+)"?', value):
+            urls[link.group(2)] = link.group(1)
+    return urls
+
+
+def page_urls(last_url: str) -> list[str]:
+    """URLs of all pages up to ``last_url`` but the first
+
+    >>> page_urls("https://a.b/c?per_page=30&page=3")
+    ['https://a.b/c?per_page=30&page=2', 'https://a.b/c?per_page=30&page=3']
+    """
+    url = urllib.parse.urlsplit(last_url)
+    query = urllib.parse.parse_qsl(url.query)
+    last = int(dict(query)["page"])
+    return [
+        url._replace(
+            query=urllib.parse.urlencode(
+                [(k, page if k == "page" else v) for k, v in query]
+            )
+        ).geturl()
+        for page in range(2, last + 1)
+    ]
+
+
+def _stream_page(client: "agithub.base.Client", url: str, fields: typing.Iterable[str]):
+    # pylint: disable=import-outside-toplevel
+    import agithub.base
+
+    from . import jsonstream
+
+    # like agithub.GitHub.GitHubClient.request(), wait for the rate limit to
+    # reset if the client is configured to
+    if client.sleep_on_ratelimit and client.no_ratelimit_remaining():
+        client.sleep_until_more_ratelimit()
+    while True:
+        conn = client.get_connection()
+        try:
+            conn.request(
+                "GET", client.prop.constructUrl(url), None, dict(client.default_headers)
+            )
+            response = conn.getresponse()
+            client.headers = response.getheaders()
+            if response.status == 200:
+                chunks = iter(functools.partial(response.read, STREAM_CHUNK_SIZE), b"")
+                return response.status, [
+                    jsonstream.project(item, fields)
+                    for item in jsonstream.iter_array(chunks)
+                ]
+            body = agithub.base.ResponseBody(response).processBody()
+        finally:
+            conn.close()
+        if not (
+            response.status == 403
+            and client.sleep_on_ratelimit
+            and client.no_ratelimit_remaining()
+        ):
+            return response.status, body
+        client.sleep_until_more_ratelimit()
+
+
+def _get_page(
+    github: "agithub.GitHub.GitHub", url: str, fields: typing.Iterable[str] = None
+) -> tuple[list, list[tuple[str, str]]]:
+    # every thread needs its own client, as the client keeps the response headers
+    client = copy.copy(github.client)
+    client.paginate = False
+    if fields is None:
+        status, data = client.get(url)
+    else:
+        status, data = _stream_page(client, url, fields)
     if status != 200:
         raise GitHubError(data)
-    for release in data:
-        if not re.match(r"^\d{4}\.\d{2}$", release["tag_name"]):
-            # skip point releases and RCs
+    return data, client.headers
+
+
+def get_all_pages(
+    github: "agithub.GitHub.GitHub",
+    url: str,
+    max_concurrent_pages: int = GITHUB_MAX_CONCURRENT_PAGES,
+    fields: typing.Iterable[str] = None,
+) -> list:
+    """Get all pages of a GitHub listing
+
+    In contrast to agithub's ``paginate`` option, which follows the ``next``
+    links one page after another, all pages after the first are requested
+    concurrently using the ``last`` link of the first page.
+
+    If ``fields`` are given, the pages are decoded while they are received and
+    only the given (dotted) fields of every item are kept (see
+    :py:func:`release_manager_finder.jsonstream.project`).
+    """
+    data, headers = _get_page(github, url, fields)
+    last_url = link_urls(headers).get("last")
+    if last_url is None:
+        return data
+    urls = page_urls(last_url)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(min(max_concurrent_pages, len(urls)), 1)
+    ) as executor:
+        # map() yields the pages in order
+        for page, _ in executor.map(lambda u: _get_page(github, u, fields), urls):
+            data.extend(page)
+    return data
+
+
+def release_manager_of(release: dict) -> typing.Optional[str]:
+    if not re.match(r"^\d{4}\.\d{2}$", release["tag_name"]):
+        # skip point releases and RCs
+        return None
+    if release["tag_name"] == "2016.07":
+        # for some reason that release was authored by miri64, while kYc0o was the
+        # release manager
+        return "kYc0o"
+    return release["author"]["login"]
+
+
+def get_past_releases(github: "agithub.GitHub.GitHub") -> list[dict]:
+    return get_all_pages(
+        github, f"/repos/{GITHUB_ORGA}/{GITHUB_REPO}/releases", fields=RELEASE_FIELDS
+    )
+
+
+def get_past_release_managers(github: "agithub.GitHub.GitHub") -> dict[str, int]:
+    release_managers = {}
+    for release in get_past_releases(github):
+        release_manager = release_manager_of(release)
+        if release_manager is None:
             continue
-        if release["tag_name"] == "2016.07":
-            # for some reason that release was authored by miri64, while kYc0o was the
-            # release manager
-            release_manager = "kYc0o"
-        else:
-            release_manager = release["author"]["login"]
         if release_manager not in release_managers:
             release_managers[release_manager] = 1
         else:
@@ -75,25 +240,51 @@ def update_next_release_managers(
         maintainers[rm] += 1
 
 
-def get_opt_out_list(opt_out_filename: str = None) -> list[str]:
-    opt_out_list = []
-    if opt_out_filename:
-        with open(opt_out_filename, encoding="utf-8") as opt_out_file:
-            for maintainer in opt_out_file:
-                maintainer = maintainer.strip()
-                if maintainer and not maintainer.startswith("#"):
-                    opt_out_list.append(maintainer)
-    return opt_out_list
+# parsed roster files, keyed by path and validated against (mtime, size)
+_ROSTER_FILE_CACHE: dict[str, tuple[tuple[int, int], tuple[str, ...]]] = {}
 
 
-def get_attendees_list(attendees_filename: str = None) -> list[str]:
-    attendees_list = []
-    with open(attendees_filename, encoding="utf-8") as attendees_file:
-        for maintainer in attendees_file:
+def _parse_roster_file(roster_filename: str) -> tuple[str, ...]:
+    roster = []
+    with open(roster_filename, encoding="utf-8") as roster_file:
+        for maintainer in roster_file:
             maintainer = maintainer.strip()
             if maintainer and not maintainer.startswith("#"):
-                attendees_list.append(maintainer)
-    return attendees_list
+                roster.append(maintainer)
+    return tuple(roster)
+
+
+def read_roster_file(roster_filename: str) -> list[str]:
+    try:
+        stat = os.stat(roster_filename)
+    except OSError:
+        # let open() report the error (or deal with files that are not on disk)
+        return list(_parse_roster_file(roster_filename))
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _ROSTER_FILE_CACHE.get(roster_filename)
+    if cached is None or cached[0] != version:
+        cached = (version, _parse_roster_file(roster_filename))
+        _ROSTER_FILE_CACHE[roster_filename] = cached
+    return list(cached[1])
+
+
+def get_opt_out_list(
+    opt_out_filename: str = None, opt_out_forum: str = None
+) -> list[str]:
+    opt_out_list = read_roster_file(opt_out_filename) if opt_out_filename else []
+    if opt_out_forum:
+        from . import forum  # pylint: disable=import-outside-toplevel,cyclic-import
+
+        thread = forum.OptOutThread(opt_out_forum)
+        thread.refresh()
+        opt_out_list = opt_out_list + [
+            login for login in thread.opt_out if login not in opt_out_list
+        ]
+    return opt_out_list
+
+
+def get_attendees_list(attendees_filename: str = None) -> list[str]:
+    return read_roster_file(attendees_filename)
 
 
 def filter_out_opt_out(
@@ -145,6 +336,17 @@ def generate_selection_pool(
     return least_managing(maintainers_sorted, current_maintainers)
 
 
+def eligible_maintainers(
+    rm_tally: typing.Iterator[tuple[int, str]],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+    current_maintainers: typing.Sequence[str],
+) -> list[tuple[int, str]]:
+    maintainers_sorted = filter_out_opt_out(rm_tally, opt_out_list)
+    maintainers_sorted = filter_out_non_attendees(maintainers_sorted, attendees_list)
+    return [m for m in maintainers_sorted if m[1] in current_maintainers]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -159,11 +361,20 @@ def parse_args() -> argparse.Namespace:
         default=None,
         nargs="?",
     )
+    parser.add_argument(
+        "-O",
+        "--opt-out-forum",
+        help="Also treat maintainers as opting out who said so in the forum "
+        f"thread at this URL, i.e., {OPT_OUT_FORUM}",
+        metavar="URL",
+        default=None,
+    )
     parser.add_argument(
         "attendees_list",
         help="File with list of maintainers attending the VMA "
-        "(GitHub user names, one per line)",
+        "(GitHub user names, one per line), not allowed with -b",
         default=None,
+        nargs="?",
     )
     parser.add_argument(
         "-n",
@@ -172,7 +383,99 @@ def parse_args() -> argparse.Namespace:
         type=str,
         action="append",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--since",
+        help="Only count releases published on or after this date (YYYY-MM-DD)",
+        type=datetime.date.fromisoformat,
+        default=None,
+    )
+    parser.add_argument(
+        "--until",
+        help="Only count releases published before this date (YYYY-MM-DD)",
+        type=datetime.date.fromisoformat,
+        default=None,
+    )
+    parser.add_argument(
+        "-k",
+        "--releases",
+        help="Number of upcoming releases to draw release managers for (default: 1)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "-w",
+        "--weighted",
+        help="Draw from all eligible maintainers, weighted by how many releases "
+        "they managed and how recently",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-a",
+        "--active-months",
+        help="Treat maintainers without commits or reviews in RIOT in the last "
+        "ACTIVE_MONTHS months as opting out",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        help="Directory or JSON Lines manifest of attendee/opt-out scenarios to "
+        "evaluate instead of a single attendees list",
+        default=None,
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        help="Output format of --batch (default: jsonl)",
+        choices=["jsonl", "csv"],
+        default="jsonl",
+    )
+    args = parser.parse_args()
+    if args.attendees_list is None and not args.batch:
+        # both lists are optional positionals, so a single list ended up as the
+        # opt-out list, but only the opt-out list can be left out
+        args.opt_out_list, args.attendees_list = None, args.opt_out_list
+        if args.attendees_list is None:
+            parser.error("the following arguments are required: attendees_list")
+    if args.releases < 1:
+        parser.error("argument -k/--releases: must be at least 1")
+    if args.releases > 1 and (args.weighted or args.batch):
+        parser.error("argument -k/--releases: not allowed with -w or -b")
+    if args.weighted and args.batch:
+        parser.error("argument -w/--weighted: not allowed with -b")
+    if args.attendees_list is not None and args.batch:
+        parser.error("argument attendees_list: not allowed with -b")
+    if args.active_months is not None and args.active_months < 1:
+        parser.error("argument -a/--active-months: must be at least 1")
+    if args.active_months is not None and args.batch:
+        parser.error("argument -a/--active-months: not allowed with -b")
+    return args
+
+
+def exclude_inactive(
+    args: argparse.Namespace,
+    github: "agithub.GitHub.GitHub",
+    current_maintainers: dict[str, int],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+) -> list[str]:
+    """The opt-out list plus the candidates without recent activity (with
+    ``-a/--active-months``)"""
+    if args.active_months is None:
+        return opt_out_list
+    from . import activity  # pylint: disable=import-outside-toplevel,cyclic-import
+
+    candidates = activity.activity_candidates(
+        current_maintainers, opt_out_list, attendees_list
+    )
+    since = activity.activity_since(args.active_months)
+    return opt_out_list + [
+        login
+        for login, active in activity.get_activity(github, candidates, since).items()
+        # maintainers with unknown activity are not left out
+        if active is False
+    ]
 
 
 def get_results(
@@ -195,11 +498,10 @@ def get_results(
     return rm_tally, least_managing_maintainers
 
 
-def print_results(
+def print_inputs(
     rm_tally: typing.Iterator[tuple[int, str]],
     opt_out_list: list[str],
     attendees_list: list[str],
-    least_managing_maintainers: list[tuple[int, str]],
 ) -> None:
     print("Current release management tally")
     print("================================")
@@ -213,26 +515,144 @@ def print_results(
     print("==============")
     for maintainer in sorted(attendees_list):
         print(f"{maintainer}")
+
+
+def print_results(
+    rm_tally: typing.Iterator[tuple[int, str]],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+    least_managing_maintainers: list[tuple[int, str]],
+    sampler: "sampling.AliasTable" = None,
+) -> None:
+    print_inputs(rm_tally, opt_out_list, attendees_list)
     print("\n\nSelection pool")
     print("==============")
     try:
-        for maintainer in least_managing_maintainers:
-            print(f"{maintainer[0]:3d}\t{maintainer[1]}")
-        print(
-            "\n\nThe next release manager is: "
-            f"{random.choice(least_managing_maintainers)[1]}"
-        )
+        if sampler is None:
+            for maintainer in least_managing_maintainers:
+                print(f"{maintainer[0]:3d}\t{maintainer[1]}")
+            next_release_manager = random.choice(least_managing_maintainers)[1]
+        else:
+            for i, maintainer in enumerate(least_managing_maintainers):
+                print(
+                    f"{maintainer[0]:3d}\t{sampler.probability(i):6.1%}\t"
+                    f"{maintainer[1]}"
+                )
+            next_release_manager = sampler.draw()
+        print(f"\n\nThe next release manager is: {next_release_manager}")
     except (ValueError, IndexError):
         print("Selection pool is empty!")
 
 
+def get_release_tally(
+    github: "agithub.GitHub.GitHub",
+    since: datetime.date = None,
+    until: datetime.date = None,
+) -> dict[str, int]:
+    if since is None and until is None:
+        return get_past_release_managers(github)
+    from . import history  # pylint: disable=import-outside-toplevel,cyclic-import
+
+    index = history.HistoryIndex.from_github(get_past_releases(github))
+    return index.tally(since, until)
+
+
+def print_draws(
+    rm_tally: typing.Iterator[tuple[int, str]],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+    upcoming: list["draws.Draw"],
+) -> None:
+    print_inputs(rm_tally, opt_out_list, attendees_list)
+    for draw in upcoming:
+        title = f"Selection pool for release {draw.release}"
+        print(f"\n\n{title}")
+        print("=" * len(title))
+        for maintainer in draw.selection_pool:
+            print(f"{maintainer[0]:3d}\t{maintainer[1]}")
+        if draw.release_manager is None:
+            print("Selection pool is empty!")
+        else:
+            print(
+                f"\nThe release manager of release {draw.release} is: "
+                f"{draw.release_manager}"
+            )
+
+
+def batch_main(args: argparse.Namespace) -> None:
+    from . import batch  # pylint: disable=import-outside-toplevel,cyclic-import
+
+    # the opt-out list and forum thread apply to all scenarios
+    opt_out_list = get_opt_out_list(args.opt_out_list, args.opt_out_forum)
+    scenarios = (
+        dataclasses.replace(scenario, opt_out=opt_out_list + scenario.opt_out)
+        for scenario in batch.load_scenarios(args.batch)
+    )
+    # fetch everything once and evaluate all scenarios against it
+    github = github_client(args.gh_token)
+    current_maintainers = get_maintainers()
+    past_release_managers = get_release_tally(github, args.since, args.until)
+    batch.WRITERS[args.format](
+        batch.evaluate_scenarios(
+            current_maintainers,
+            past_release_managers,
+            args.next_release_manager or [],
+            scenarios,
+        ),
+        sys.stdout,
+    )
+
+
+def weighted_main(args: argparse.Namespace) -> None:
+    # pylint: disable=import-outside-toplevel,cyclic-import
+    from . import history, sampling
+
+    opt_out_list = get_opt_out_list(args.opt_out_list, args.opt_out_forum)
+    attendees_list = get_attendees_list(args.attendees_list)
+    github = github_client(args.gh_token)
+    current_maintainers = get_maintainers()
+    opt_out_list = exclude_inactive(
+        args, github, current_maintainers, opt_out_list, attendees_list
+    )
+    # recency of the releases is part of the weights, so keep the history
+    index = history.HistoryIndex.from_github(get_past_releases(github))
+    rm_tally, _ = index.get_results(
+        current_maintainers,
+        args.next_release_manager or [],
+        opt_out_list,
+        attendees_list,
+        args.since,
+        args.until,
+    )
+    pool = eligible_maintainers(
+        rm_tally, opt_out_list, attendees_list, current_maintainers
+    )
+    # the same releases as in the tally
+    last_releases = index.last_releases(args.since, args.until)
+    sampler = None
+    if pool:
+        sampler = sampling.weighted_sampler(
+            pool, last_releases, next_release_managers=args.next_release_manager or []
+        )
+    print_results(rm_tally, opt_out_list, attendees_list, pool, sampler)
+
+
 def main():
     args = parse_args()
-    opt_out_list = get_opt_out_list(args.opt_out_list)
+    if args.batch:
+        batch_main(args)
+        return
+    if args.weighted:
+        weighted_main(args)
+        return
+    opt_out_list = get_opt_out_list(args.opt_out_list, args.opt_out_forum)
     attendees_list = get_attendees_list(args.attendees_list)
-    github = agithub.GitHub.GitHub(token=args.gh_token, paginate=True)
+    github = github_client(args.gh_token)
     current_maintainers = get_maintainers()
-    past_release_managers = get_past_release_managers(github)
+    opt_out_list = exclude_inactive(
+        args, github, current_maintainers, opt_out_list, attendees_list
+    )
+    past_release_managers = get_release_tally(github, args.since, args.until)
     rm_tally, least_managing_maintainers = get_results(
         current_maintainers,
         past_release_managers,
@@ -240,6 +660,19 @@ def main():
         opt_out_list,
         attendees_list,
     )
+    if args.releases > 1:
+        from . import draws  # pylint: disable=import-outside-toplevel,cyclic-import
+
+        eligible = eligible_maintainers(
+            rm_tally, opt_out_list, attendees_list, current_maintainers
+        )
+        print_draws(
+            rm_tally,
+            opt_out_list,
+            attendees_list,
+            draws.draw_release_managers(eligible, args.releases),
+        )
+        return
     print_results(
         rm_tally,
         opt_out_list,
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Recent activity of maintainers in RIOT-OS/RIOT
+
+Maintainers who neither authored a commit nor reviewed a pull request in the
+last months can be left out of the selection pool by treating them like they
+opted out. Every lookup costs up to two GitHub API requests, so the lookups of
+all candidates run concurrently.
+
+Reviews are looked up with the search API, which allows far fewer requests
+than the rest of the API (:py:data:`SEARCH_RATE` per minute with a token,
+:py:data:`SEARCH_RATE_UNAUTHENTICATED` without). The searches of this process
+are throttled to the rate of the client. If no search is left, the activity of
+a maintainer without recent commits is unknown (:py:data:`None`), and they are
+not left out.
+"""
+
+import collections
+import concurrent.futures
+import copy
+import datetime
+import threading
+import time
+import typing
+import urllib.parse
+
+from . import GITHUB_ORGA, GITHUB_REPO, GitHubError
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import agithub.base
+    import agithub.GitHub
+
+# months without commits or reviews after which a maintainer is inactive
+ACTIVITY_MONTHS = 12
+ACTIVITY_MAX_CONCURRENT = 8
+# searches allowed per minute with and without a token
+SEARCH_RATE = 30
+SEARCH_RATE_UNAUTHENTICATED = 10
+
+
+def activity_since(
+    months: int = ACTIVITY_MONTHS, now: datetime.datetime = None
+) -> datetime.datetime:
+    """Start of the last ``months`` (of average length)
+
+    >>> now = datetime.datetime(2025, 7, 1, tzinfo=datetime.timezone.utc)
+    >>> activity_since(6, now)
+    datetime.datetime(2024, 12, 30, 9, 0, tzinfo=datetime.timezone.utc)
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return now - datetime.timedelta(days=months * 365.25 / 12)
+
+
+def _get(client: "agithub.base.Client", path: str, **params) -> typing.Any:
+    status, data = client.get(f"{path}?{urllib.parse.urlencode(params)}")
+    if status != 200:
+        raise GitHubError(data)
+    return data
+
+
+class SearchThrottle:  # pylint: disable=too-few-public-methods
+    """Sliding window over the searches of the last ``period`` seconds"""
+
+    def __init__(self, rate: int = SEARCH_RATE, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._lock = threading.Lock()
+        self._times: collections.deque[float] = collections.deque()
+
+    def acquire(self, wait: bool = False) -> bool:
+        """Take a search from the window, returns False if none is left and
+        ``wait`` is not set"""
+        with self._lock:
+            now = time.monotonic()
+            while self._times and self._times[0] <= now - self.period:
+                self._times.popleft()
+            if len(self._times) < self.rate:
+                self._times.append(now)
+                return True
+            if not wait:
+                return False
+            # reserve the search at the time the oldest one leaves the window
+            start = self._times.popleft() + self.period
+            self._times.append(start)
+        time.sleep(start - now)
+        return True
+
+
+# unauthenticated searches are limited per IP address, apart from the
+# searches with a token
+_search_throttles = {
+    True: SearchThrottle(SEARCH_RATE),
+    False: SearchThrottle(SEARCH_RATE_UNAUTHENTICATED),
+}
+
+
+def search_throttle(client: "agithub.base.Client") -> SearchThrottle:
+    """Throttle for the searches of ``client``, by whether it has a token"""
+    return _search_throttles["authorization" in client.default_headers]
+
+
+def is_active(
+    github: "agithub.GitHub.GitHub", login: str, since: datetime.datetime
+) -> typing.Optional[bool]:
+    """Did ``login`` author a commit or review a pull request since ``since``
+
+    :py:data:`None` if the search for reviews is rate limited. A client that
+    sleeps on rate limits waits for the next search instead.
+    """
+    # every thread needs its own client, as the client keeps the response headers
+    client = copy.copy(github.client)
+    client.paginate = False
+    repo = f"{GITHUB_ORGA}/{GITHUB_REPO}"
+    since = since.astimezone(datetime.timezone.utc).replace(microsecond=0)
+    commits = _get(
+        client,
+        f"/repos/{repo}/commits",
+        author=login,
+        since=since.isoformat().replace("+00:00", "Z"),
+        per_page=1,
+    )
+    if commits:
+        return True
+    if not search_throttle(client).acquire(wait=client.sleep_on_ratelimit):
+        return None
+    # reviews can only be searched by the last update of the pull request
+    query = urllib.parse.urlencode(
+        {
+            "q": f"repo:{repo} type:pr reviewed-by:{login} "
+            f"updated:>={since.date().isoformat()}",
+            "per_page": 1,
+        }
+    )
+    status, reviewed = client.get(f"/search/issues?{query}")
+    if status in (403, 429):
+        # search rate limit of the token (or secondary rate limit) exceeded
+        return None
+    if status != 200:
+        raise GitHubError(reviewed)
+    return reviewed["total_count"] > 0
+
+
+def get_activity(
+    github: "agithub.GitHub.GitHub",
+    logins: typing.Iterable[str],
+    since: datetime.datetime,
+    max_concurrent: int = ACTIVITY_MAX_CONCURRENT,
+) -> dict[str, typing.Optional[bool]]:
+    """Look up whether each of ``logins`` was active since ``since``
+
+    See :py:func:`is_active` for the values.
+    """
+    logins = sorted(set(logins))
+    if not logins:
+        return {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(max_concurrent, len(logins))
+    ) as executor:
+        return dict(
+            zip(
+                logins,
+                executor.map(lambda login: is_active(github, login, since), logins),
+            )
+        )
+
+
+def activity_candidates(
+    current_maintainers: typing.Iterable[str],
+    opt_out_list: typing.Iterable[str],
+    attendees_list: typing.Iterable[str],
+) -> set[str]:
+    """Maintainers who would be eligible if they were active
+
+    >>> maintainers = ["huey", "dewey", "louie"]
+    >>> sorted(activity_candidates(maintainers, ["huey"], ["huey", "dewey"]))
+    ['dewey']
+    """
+    return (set(current_maintainers) & set(attendees_list)) - set(opt_out_list)
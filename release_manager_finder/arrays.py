@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=import-outside-toplevel
+
+"""Array-backed implementation of :py:func:`release_manager_finder.get_results`
+
+The tally is kept as NumPy arrays (logins, release counts and a mask of current
+maintainers), so ordering the tally and determining the selection pool are
+vectorized operations. This pays off for large synthetic rosters, e.g., in
+what-if analyses, where the same tally is evaluated for many opt-out and
+attendee lists.
+
+NumPy is an optional dependency (see ``requirements-forecast.txt``).
+"""
+
+import typing
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+
+def selection_pool_mask(
+    counts: "numpy.ndarray", eligible: "numpy.ndarray"
+) -> "numpy.ndarray":
+    """Vectorized equivalent of :py:func:`release_manager_finder.least_managing`
+
+    ``eligible`` marks current maintainers that attend and did not opt out.
+    :py:func:`~release_manager_finder.least_managing` adds the next-least
+    managing maintainers to the pool as long as it has at most one member, so
+    the pool consists of all eligible maintainers with a count of at most the
+    second smallest eligible count. Works on the last axis, so many tallies can
+    be evaluated at once.
+    """
+    import numpy as np
+
+    masked = np.where(eligible, counts, np.iinfo(counts.dtype).max)
+    if masked.shape[-1] < 2:
+        return eligible.copy()
+    second_smallest = np.partition(masked, 1, axis=-1)[..., 1:2]
+    return eligible & (counts <= second_smallest)
+
+
+class TallyArrays:
+    def __init__(
+        self,
+        current_maintainers: dict[str, int],
+        past_release_managers: dict[str, int],
+    ):
+        import numpy as np
+
+        maintainers = current_maintainers.copy()
+        maintainers.update(past_release_managers)
+        # sorted logins, so a stable sort by count yields the (count, login)
+        # order of sort_by_release_management()
+        self.logins = np.array(sorted(maintainers), dtype=str)
+        self.counts = np.fromiter(
+            (maintainers[m] for m in self.logins.tolist()),
+            dtype=np.int64,
+            count=len(self.logins),
+        )
+        self.current = self.mask(current_maintainers)
+
+    def mask(self, logins: typing.Iterable[str]) -> "numpy.ndarray":
+        import numpy as np
+
+        return np.isin(self.logins, np.array(list(logins), dtype=str))
+
+    def indices(self, logins: typing.Sequence[str]) -> "numpy.ndarray":
+        import numpy as np
+
+        logins = np.array(logins, dtype=str)
+        idx = np.searchsorted(self.logins, logins)
+        found = idx < len(self.logins)
+        found[found] = self.logins[idx[found]] == logins[found]
+        if not found.all():
+            # same as update_next_release_managers() for unknown maintainers
+            raise KeyError(logins[~found][0].item())
+        return idx
+
+    def add_releases(self, release_managers: typing.Sequence[str]) -> None:
+        import numpy as np
+
+        if len(release_managers):
+            np.add.at(self.counts, self.indices(release_managers), 1)
+
+    def order(self) -> "numpy.ndarray":
+        import numpy as np
+
+        return np.argsort(self.counts, kind="stable")
+
+    def selection_pool(
+        self, opt_out_list: typing.Iterable[str], attendees_list: typing.Iterable[str]
+    ) -> "numpy.ndarray":
+        eligible = self.current & self.mask(attendees_list) & ~self.mask(opt_out_list)
+        return selection_pool_mask(self.counts, eligible)
+
+    def as_tuples(self, indices: "numpy.ndarray") -> list[tuple[int, str]]:
+        return list(zip(self.counts[indices].tolist(), self.logins[indices].tolist()))
+
+
+def get_results(
+    current_maintainers: dict[str, int],
+    past_release_managers: dict[str, int],
+    next_release_managers: list[str],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    tally = TallyArrays(current_maintainers, past_release_managers)
+    tally.add_releases(next_release_managers)
+    order = tally.order()
+    pool = tally.selection_pool(opt_out_list, attendees_list)
+    return tally.as_tuples(order), tally.as_tuples(order[pool[order]])
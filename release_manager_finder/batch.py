@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Evaluate many attendee/opt-out scenarios against one fetched tally
+
+Scenarios are given either as a directory or as a manifest.
+
+In a directory, every subdirectory is a scenario named after it. It contains an
+``attendees`` file and optionally ``opt-out`` and ``next-rm`` files, all in the
+format of the files :py:func:`release_manager_finder.main` takes.
+
+A manifest is a JSON Lines file with one scenario object per line, e.g.::
+
+    {"name": "vma-2025-01", "attendees": "vma-2025-01.txt", "opt_out": ["huey"]}
+
+``attendees``, ``opt_out`` and ``next_release_managers`` are either lists of
+GitHub user names or file names relative to the manifest.
+"""
+
+import csv
+import dataclasses
+import json
+import os
+import random
+import typing
+
+from . import bitsets, interned, read_roster_file
+
+SCENARIO_FILES = {
+    "attendees": "attendees",
+    "opt_out": "opt-out",
+    "next_release_managers": "next-rm",
+}
+
+
+@dataclasses.dataclass
+class Scenario:
+    name: str
+    attendees: list[str]
+    opt_out: list[str] = dataclasses.field(default_factory=list)
+    next_release_managers: list[str] = dataclasses.field(default_factory=list)
+
+
+def _scenario_from_directory(directory: str) -> Scenario:
+    kwargs = {}
+    for field, filename in SCENARIO_FILES.items():
+        path = os.path.join(directory, filename)
+        if field == "attendees" or os.path.exists(path):
+            kwargs[field] = read_roster_file(path)
+    return Scenario(name=os.path.basename(directory), **kwargs)
+
+
+def _scenario_from_manifest(entry: dict, base: str, lineno: int) -> Scenario:
+    kwargs = {"name": str(entry.get("name", lineno))}
+    for field in SCENARIO_FILES:
+        value = entry.get(field)
+        if isinstance(value, str):
+            value = read_roster_file(os.path.join(base, value))
+        if value is not None:
+            kwargs[field] = list(value)
+    return Scenario(**kwargs)
+
+
+def load_scenarios(path: str) -> typing.Iterator[Scenario]:
+    if os.path.isdir(path):
+        for entry in sorted(os.scandir(path), key=lambda e: e.name):
+            if entry.is_dir():
+                yield _scenario_from_directory(entry.path)
+        return
+    base = os.path.dirname(path)
+    with open(path, encoding="utf-8") as manifest:
+        for lineno, line in enumerate(manifest, start=1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield _scenario_from_manifest(json.loads(line), base, lineno)
+
+
+def evaluate_scenarios(
+    current_maintainers: dict[str, int],
+    past_release_managers: dict[str, int],
+    next_release_managers: list[str],
+    scenarios: typing.Iterable[Scenario],
+) -> typing.Iterator[dict]:
+    tally = interned.Tally(current_maintainers, past_release_managers)
+    tally.add_releases(next_release_managers)
+    bits = bitsets.BitsetTally(tally)
+    for scenario in scenarios:
+        scenario_bits = bits
+        if scenario.next_release_managers:
+            # only scenarios adding release managers need their own counts
+            scenario_tally = tally.copy()
+            scenario_tally.add_releases(scenario.next_release_managers)
+            scenario_bits = bitsets.BitsetTally(scenario_tally)
+        pool = scenario_bits.as_tuples(
+            scenario_bits.selection_pool(
+                scenario_bits.mask(scenario.opt_out),
+                scenario_bits.mask(scenario.attendees),
+            )
+        )
+        yield {
+            "scenario": scenario.name,
+            "selection_pool": pool,
+            "next_release_manager": random.choice(pool)[1] if pool else None,
+        }
+
+
+def write_jsonl(results: typing.Iterable[dict], output: typing.TextIO) -> None:
+    for result in results:
+        output.write(json.dumps(result, separators=(",", ":")) + "\n")
+        output.flush()
+
+
+def write_csv(results: typing.Iterable[dict], output: typing.TextIO) -> None:
+    writer = csv.writer(output)
+    writer.writerow(["scenario", "releases", "selection_pool", "next_release_manager"])
+    for result in results:
+        pool = result["selection_pool"]
+        writer.writerow(
+            [
+                result["scenario"],
+                " ".join(str(m[0]) for m in pool),
+                " ".join(m[1] for m in pool),
+                result["next_release_manager"] or "",
+            ]
+        )
+        output.flush()
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
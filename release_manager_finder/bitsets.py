@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Selection pools of many scenarios as bitwise operations on one tally
+
+A :py:class:`BitsetTally` numbers the members of an
+:py:class:`~release_manager_finder.interned.Tally` by their position in the
+ordered tally, so a set of logins is an :py:class:`int` with bit ``i`` set for
+the ``i``-th member. Opt-out and attendee lists are encoded once per scenario,
+after that the selection pool costs a handful of operations on those integers,
+independent of the number of maintainers.
+"""
+
+import typing
+
+from . import interned
+
+
+class BitsetTally:
+    """Bitsets over the members of ``tally`` in the order of the tally
+
+    >>> tally = interned.Tally(
+    ...     {"huey": 0, "dewey": 0, "louie": 0}, {"huey": 2, "dewey": 1, "louie": 1}
+    ... )
+    >>> bits = BitsetTally(tally)
+    >>> pool = bits.selection_pool(bits.mask(["louie"]), bits.mask(["huey", "louie"]))
+    >>> bits.as_tuples(pool)
+    [(2, 'huey')]
+    """
+
+    __slots__ = ("logins", "counts", "bits", "current", "levels")
+
+    def __init__(self, tally: interned.Tally):
+        order = tally.order()
+        logins = tally.roster.logins
+        self.logins = [logins[i] for i in order]
+        self.counts = [tally.counts[i] for i in order]
+        self.bits = {login: 1 << pos for pos, login in enumerate(self.logins)}
+        self.current = self.mask(logins[i] for i in tally.current)
+        # levels[pos] has all members with at most as many releases as the one
+        # at pos, i.e., all positions up to the last one with the same count
+        self.levels = [0] * len(order)
+        end = len(order)
+        for pos in reversed(range(len(order))):
+            if pos + 1 < len(order) and self.counts[pos + 1] != self.counts[pos]:
+                end = pos + 1
+            self.levels[pos] = (1 << end) - 1
+
+    def __len__(self) -> int:
+        return len(self.logins)
+
+    def mask(self, logins: typing.Iterable[str]) -> int:
+        # unknown logins can not be in the pool
+        bits = self.bits
+        mask = 0
+        for login in logins:
+            mask |= bits.get(login, 0)
+        return mask
+
+    def selection_pool(self, opt_out: int, attendees: int) -> int:
+        eligible = self.current & attendees & ~opt_out
+        # see interned.Tally.selection_pool(): the pool reaches up to the count
+        # of the second least managing eligible maintainer
+        rest = eligible & (eligible - 1)
+        if not rest:
+            return eligible
+        second = (rest & -rest).bit_length() - 1
+        return eligible & self.levels[second]
+
+    def as_tuples(self, mask: int) -> list[tuple[int, str]]:
+        tuples = []
+        while mask:
+            lowest = mask & -mask
+            pos = lowest.bit_length() - 1
+            tuples.append((self.counts[pos], self.logins[pos]))
+            mask ^= lowest
+        return tuples
+
+
+def get_results(
+    current_maintainers: dict[str, int],
+    past_release_managers: dict[str, int],
+    next_release_managers: list[str],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    tally = interned.Tally(current_maintainers, past_release_managers)
+    tally.add_releases(next_release_managers)
+    bits = BitsetTally(tally)
+    pool = bits.selection_pool(bits.mask(opt_out_list), bits.mask(attendees_list))
+    return bits.as_tuples((1 << len(bits)) - 1), bits.as_tuples(pool)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Draw the release managers of several upcoming releases in one go
+
+Drawing the release manager of the next release and passing them with
+``-n/--next-release-manager`` to draw the one of the release after is the same
+as adding a release to the winner's count in memory and drawing again. The
+eligible maintainers are kept in buckets by release count, so a draw only moves
+the winner to the next bucket instead of sorting the tally again.
+"""
+
+import bisect
+import dataclasses
+import random
+import typing
+
+
+class Buckets:
+    """Eligible maintainers grouped by their release count"""
+
+    def __init__(self, eligible: typing.Iterable[tuple[int, str]]):
+        self.buckets: dict[int, list[str]] = {}
+        for count, login in eligible:
+            self.buckets.setdefault(count, []).append(login)
+        for bucket in self.buckets.values():
+            bucket.sort()
+        # distinct counts in ascending order
+        self.levels = sorted(self.buckets)
+
+    def selection_pool(self) -> list[tuple[int, str]]:
+        """Same as :py:func:`release_manager_finder.least_managing`: the least
+        managing maintainers and, if there is only one, the next-least
+        managing ones"""
+        pool = []
+        for count in self.levels[:2]:
+            if len(pool) > 1:
+                break
+            pool.extend((count, login) for login in self.buckets[count])
+        return pool
+
+    def add_release(self, login: str, count: int) -> None:
+        bucket = self.buckets[count]
+        del bucket[bisect.bisect_left(bucket, login)]
+        if not bucket:
+            del self.buckets[count]
+            del self.levels[bisect.bisect_left(self.levels, count)]
+        if count + 1 not in self.buckets:
+            self.buckets[count + 1] = []
+            bisect.insort(self.levels, count + 1)
+        bisect.insort(self.buckets[count + 1], login)
+
+
+@dataclasses.dataclass
+class Draw:
+    release: int
+    selection_pool: list[tuple[int, str]]
+    release_manager: typing.Optional[str]
+
+
+def draw_release_managers(
+    eligible: typing.Iterable[tuple[int, str]],
+    releases: int,
+    rng: random.Random = random,
+) -> list[Draw]:
+    """Draw release managers for the next ``releases`` releases
+
+    ``eligible`` are the ``(count, login)`` tuples of all current maintainers
+    that attend and did not opt out (see
+    :py:func:`release_manager_finder.eligible_maintainers`).
+    """
+    buckets = Buckets(eligible)
+    draws = []
+    for release in range(1, releases + 1):
+        pool = buckets.selection_pool()
+        if not pool:
+            draws.append(Draw(release, pool, None))
+            continue
+        count, release_manager = rng.choice(pool)
+        buckets.add_release(release_manager, count)
+        draws.append(Draw(release, pool, release_manager))
+    return draws
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=import-outside-toplevel
+
+"""Monte Carlo forecast of how the draw distributes release management
+
+Every simulated release cycle each current maintainer attends the VMA and opts
+out of release management with their given probability. The next release
+manager is then drawn the same way :py:func:`release_manager_finder.get_results`
+and :py:func:`random.choice` would (see
+:py:func:`release_manager_finder.arrays.selection_pool_mask`), and the tally is
+updated before the next cycle. Many runs are simulated at once as rows of NumPy
+arrays.
+
+NumPy is an optional dependency (see ``requirements-forecast.txt``).
+"""
+
+import concurrent.futures
+import dataclasses
+import typing
+
+from .arrays import selection_pool_mask
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+
+@dataclasses.dataclass
+class ForecastConfig:
+    cycles: int = 10
+    runs: int = 100_000
+    seed: typing.Optional[int] = None
+    # runs are simulated in chunks of this size, each with its own random
+    # stream, so results for a given seed do not depend on ``processes``
+    chunk_size: int = 50_000
+    processes: typing.Optional[int] = None
+
+
+@dataclasses.dataclass
+class Forecast:  # pylint: disable=too-many-instance-attributes
+    maintainers: list[str]
+    cycles: int
+    runs: int
+    expected_load: list[float]
+    load_stddev: list[float]
+    at_least_once: list[float]
+    empty_pool_rate: float
+    gini: float
+
+    def per_maintainer(self) -> typing.Iterator[tuple[str, float, float, float]]:
+        return zip(
+            self.maintainers, self.expected_load, self.load_stddev, self.at_least_once
+        )
+
+
+def _gini(load: "numpy.ndarray") -> "numpy.ndarray":
+    import numpy as np
+
+    n = load.shape[-1]
+    total = load.sum(axis=-1)
+    ranks = np.arange(1, n + 1)
+    weighted = (np.sort(load, axis=-1) * ranks).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gini = (2 * weighted) / (n * total) - (n + 1) / n
+    return np.where(total > 0, gini, 0.0)
+
+
+def _simulate_chunk(args: tuple) -> tuple:  # pylint: disable=too-many-locals
+    import numpy as np
+
+    counts, attendance, opt_out, cycles, runs, seed_seq = args
+    rng = np.random.default_rng(seed_seq)
+    counts = np.tile(np.asarray(counts, dtype=np.int64), (runs, 1))
+    load = np.zeros_like(counts)
+    rows = np.arange(runs)
+    empty_pools = 0
+    for _ in range(cycles):
+        eligible = (rng.random(counts.shape) < attendance) & ~(
+            rng.random(counts.shape) < opt_out
+        )
+        pool = selection_pool_mask(counts, eligible)
+        # uniform draw from the pool: member with the highest random key wins
+        keys = np.where(pool, rng.random(counts.shape), -1.0)
+        winners = keys.argmax(axis=-1)
+        drawn = pool.any(axis=-1)
+        empty_pools += runs - int(drawn.sum())
+        counts[rows[drawn], winners[drawn]] += 1
+        load[rows[drawn], winners[drawn]] += 1
+    return (
+        load.sum(axis=0),
+        (load**2).sum(axis=0),
+        (load > 0).sum(axis=0),
+        empty_pools,
+        float(_gini(load).sum()),
+    )
+
+
+def simulate(
+    tally: dict[str, int],
+    attendance: dict[str, float],
+    opt_out: dict[str, float],
+    config: ForecastConfig = None,
+) -> Forecast:
+    """Forecast the release management load of the current maintainers
+
+    :param tally: Releases managed so far (e.g. the merged maintainers and
+        past release managers as used by
+        :py:func:`release_manager_finder.get_results`).
+    :param attendance: Probability of each *current* maintainer to attend a
+        VMA. Only maintainers listed here can be drawn.
+    :param opt_out: Probability of a maintainer to be on the opt-out list.
+        Maintainers not listed never opt out.
+    """
+    # pylint: disable=too-many-locals
+    import numpy as np
+
+    config = config or ForecastConfig()
+    maintainers = sorted(attendance)
+    counts = [tally.get(m, 0) for m in maintainers]
+    attend_p = np.array([attendance[m] for m in maintainers], dtype=float)
+    opt_out_p = np.array([opt_out.get(m, 0.0) for m in maintainers], dtype=float)
+    chunks = []
+    remaining = config.runs
+    seeds = np.random.SeedSequence(config.seed).spawn(
+        -(-config.runs // config.chunk_size)
+    )
+    for seed_seq in seeds:
+        runs = min(remaining, config.chunk_size)
+        remaining -= runs
+        chunks.append((counts, attend_p, opt_out_p, config.cycles, runs, seed_seq))
+    if config.processes and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(config.processes) as executor:
+            results = list(executor.map(_simulate_chunk, chunks))
+    else:
+        results = [_simulate_chunk(chunk) for chunk in chunks]
+    load_sum, load_sq_sum, at_least_once, empty_pools, gini = (
+        sum(r[i] for r in results) for i in range(5)
+    )
+    mean = load_sum / config.runs
+    return Forecast(
+        maintainers=maintainers,
+        cycles=config.cycles,
+        runs=config.runs,
+        expected_load=mean.tolist(),
+        load_stddev=np.sqrt(
+            np.maximum(load_sq_sum / config.runs - mean**2, 0)
+        ).tolist(),
+        at_least_once=(at_least_once / config.runs).tolist(),
+        empty_pool_rate=empty_pools / (config.runs * config.cycles),
+        gini=gini / config.runs,
+    )
+
+
+def print_forecast(forecast: Forecast) -> None:
+    print(f"Forecast over {forecast.cycles} releases ({forecast.runs} simulated runs)")
+    print("=" * 79)
+    print(" Expected  Std.dev.  P(>=1)\tMaintainer")
+    for maintainer, expected, stddev, at_least_once in sorted(
+        forecast.per_maintainer(), key=lambda m: (-m[1], m[0])
+    ):
+        print(f"{expected:9.3f} {stddev:9.3f} {at_least_once:7.1%}\t{maintainer}")
+    print(f"\n\nMean Gini coefficient of the load: {forecast.gini:.3f}")
+    print(f"Releases without selection pool: {forecast.empty_pool_rate:.1%}")
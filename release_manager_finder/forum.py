@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Opt-out list from the posts of the opt-out thread on the RIOT forum
+
+Maintainers opt out of (or back into) release management by posting in the
+thread at :py:data:`~release_manager_finder.OPT_OUT_FORUM`. The thread is read
+via the JSON API of Discourse, the software running the forum. Only the posts
+after the last processed one are fetched, so refreshing an up-to-date
+:py:class:`OptOutThread` costs a single small request. Posts can be edited or
+deleted later on, so every :py:data:`FORUM_FULL_READ`-th refresh reads the
+whole thread again.
+
+The forum user name of the author of a post is taken as their GitHub user name.
+The last post of an author that says they "opt out" or "opt (back) in" decides.
+Quoted text and the first post, which describes the thread, are ignored.
+"""
+
+import html
+import json
+import re
+import typing
+import urllib.parse
+import urllib.request
+
+from . import OPT_OUT_FORUM, UPSTREAM_TIMEOUT
+
+# pages of newer posts fetched by one refresh at most (Discourse sends 20 posts
+# per page)
+FORUM_MAX_PAGES = 50
+# refreshes after which the whole thread is read again to catch edited and
+# deleted posts
+FORUM_FULL_READ = 60
+
+_QUOTES = re.compile(r"<(aside|blockquote)\b.*?</\1>", re.S | re.I)
+_TAGS = re.compile(r"<[^>]+>")
+_DECISION = re.compile(
+    r"\bopt(?:s|ed|ing)?(?:\s+(?:me|myself))?[\s-]+(?:back[\s-]+)?(in|out)\b",
+    re.I,
+)
+
+
+def post_decision(cooked: str) -> typing.Optional[bool]:
+    """True if the post (as HTML) opts out, False if it opts back in
+
+    >>> post_decision("<p>Please opt me out of the next releases.</p>")
+    True
+    >>> post_decision("<p>After opting out last year, I'd like to opt back in.</p>")
+    False
+    >>> post_decision('<aside class="quote"><p>I opt out</p></aside><p>Noted!</p>')
+    """
+    text = html.unescape(_TAGS.sub(" ", _QUOTES.sub(" ", cooked)))
+    decisions = _DECISION.findall(text)
+    if not decisions:
+        return None
+    return decisions[-1].lower() == "out"
+
+
+def posts_url(url: str) -> str:
+    """URL of the posts of the thread at ``url`` as JSON
+
+    >>> posts_url("https://forum.riot-os.org/t/release-management-opt-out/3354/12")
+    'https://forum.riot-os.org/t/3354/posts.json'
+    """
+    parsed = urllib.parse.urlsplit(url)
+    segments = parsed.path.strip("/").split("/")
+    # /t/<slug>/<topic ID>[/<post number>] or /t/<topic ID>[/<post number>]
+    topic_ids = [segment for segment in segments[1:3] if segment.isdigit()]
+    if parsed.scheme not in ("http", "https") or segments[0] != "t" or not topic_ids:
+        raise ValueError(f"{url!r} is not a forum thread")
+    return f"{parsed.scheme}://{parsed.netloc}/t/{topic_ids[0]}/posts.json"
+
+
+class OptOutThread:
+    def __init__(self, url: str = OPT_OUT_FORUM):
+        self.url = url
+        self.posts_url = posts_url(url)
+        self.last_post_number = 0
+        self.decisions: dict[str, bool] = {}
+        self.reads_since_full = 0
+
+    @property
+    def opt_out(self) -> list[str]:
+        return sorted(login for login, out in self.decisions.items() if out)
+
+    @property
+    def full_read_due(self) -> bool:
+        return self.reads_since_full >= FORUM_FULL_READ
+
+    def fetch_posts(
+        self, timeout: float = UPSTREAM_TIMEOUT, full: bool = False
+    ) -> list[dict]:
+        """Posts after the last processed one (all with ``full``), oldest first
+
+        Does not change the thread, so it can be run in another thread than
+        :py:meth:`apply`.
+        """
+        posts = []
+        after = 0 if full else self.last_post_number
+        for _ in range(FORUM_MAX_PAGES):
+            query = urllib.parse.urlencode({"post_number": after, "asc": "true"})
+            request = urllib.request.Request(
+                f"{self.posts_url}?{query}", headers={"Accept": "application/json"}
+            )
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                page = json.load(response)["post_stream"]["posts"]
+            page = sorted(
+                (post for post in page if post["post_number"] > after),
+                key=lambda post: post["post_number"],
+            )
+            if not page:
+                break
+            posts.extend(page)
+            after = page[-1]["post_number"]
+        return posts
+
+    def apply(self, posts: typing.Iterable[dict], full: bool = False) -> bool:
+        """Process ``posts``, returns if the opt-out list changed
+
+        With ``full``, ``posts`` are the whole thread and replace all decisions.
+        """
+        before = self.opt_out
+        if full:
+            self.last_post_number = 0
+            self.decisions = {}
+            self.reads_since_full = 0
+        else:
+            self.reads_since_full += 1
+        for post in posts:
+            if post["post_number"] <= self.last_post_number:
+                continue
+            self.last_post_number = post["post_number"]
+            if (
+                post["post_number"] == 1
+                # only regular posts, no moderator actions or whispers
+                or post.get("post_type", 1) != 1
+                or post.get("deleted_at")
+                or post.get("user_deleted")
+                or post.get("hidden")
+            ):
+                continue
+            decision = post_decision(post.get("cooked", ""))
+            if decision is not None:
+                self.decisions[post["username"]] = decision
+        return self.opt_out != before
+
+    def refresh(self, timeout: float = UPSTREAM_TIMEOUT) -> bool:
+        full = self.full_read_due
+        return self.apply(self.fetch_posts(timeout, full), full)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Index of past releases for release management tallies over time windows
+
+:py:func:`release_manager_finder.get_past_release_managers` only keeps one
+count per release manager. A :py:class:`HistoryIndex` keeps every counted
+release with its date and, per release manager, the sorted dates of their
+releases. The number of releases someone managed in a time window is then the
+difference of two positions in that list, found by bisection.
+"""
+
+import bisect
+import dataclasses
+import datetime
+import itertools
+import typing
+
+from . import get_results, release_manager_of
+
+# OlegHahm created releases 2013.08, 2014.01, 2014.05, and 2014.12, which are not
+# listed in RIOT-OS/RIOT/releases (see get_past_release_managers())
+UNLISTED_RELEASES = tuple(
+    {"tag_name": tag, "author": {"login": "OlegHahm"}}
+    for tag in ("2013.08", "2014.01", "2014.05", "2014.12")
+)
+
+DateLike = typing.Union[datetime.date, datetime.datetime, str]
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class Release:
+    date: datetime.datetime
+    tag: str
+    release_manager: str
+
+
+def as_datetime(value: typing.Optional[DateLike]) -> typing.Optional[datetime.datetime]:
+    """Convert dates and ISO 8601 strings to datetimes (in UTC if no timezone)
+
+    >>> as_datetime("2020-07-15T12:00:00Z")
+    datetime.datetime(2020, 7, 15, 12, 0, tzinfo=datetime.timezone.utc)
+    >>> as_datetime(datetime.date(2020, 1, 1))
+    datetime.datetime(2020, 1, 1, 0, 0, tzinfo=datetime.timezone.utc)
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+
+def release_date(release: dict) -> datetime.datetime:
+    """Publication date of a release or the first of the month of its tag
+
+    >>> release_date({"tag_name": "2014.05"})
+    datetime.datetime(2014, 5, 1, 0, 0, tzinfo=datetime.timezone.utc)
+    """
+    if release.get("published_at"):
+        return as_datetime(release["published_at"])
+    year, month = release["tag_name"].split(".")[:2]
+    return as_datetime(datetime.date(int(year), int(month), 1))
+
+
+class HistoryIndex:
+    def __init__(self, releases: typing.Iterable[Release]):
+        self.releases = sorted(releases)
+        self.dates = [release.date for release in self.releases]
+        self.dates_by_manager: dict[str, list[datetime.datetime]] = {}
+        for release in self.releases:
+            self.dates_by_manager.setdefault(release.release_manager, []).append(
+                release.date
+            )
+
+    @classmethod
+    def from_github(cls, releases: typing.Iterable[dict]) -> "HistoryIndex":
+        """Index releases as returned by the GitHub API (and the unlisted ones)"""
+        index = []
+        for release in itertools.chain(releases, UNLISTED_RELEASES):
+            release_manager = release_manager_of(release)
+            if release_manager is not None:
+                index.append(
+                    Release(release_date(release), release["tag_name"], release_manager)
+                )
+        return cls(index)
+
+    def count_release(self, release: dict, delta: int = 1) -> "HistoryIndex":
+        """Index with a release as returned by the GitHub API added (``delta``
+        > 0) or removed
+
+        >>> index = HistoryIndex.from_github([])
+        >>> release = {"tag_name": "2025.01", "author": {"login": "huey"}}
+        >>> index.count_release(release).tally()["huey"]
+        1
+        >>> index.count_release(release).count_release(release, -1) == index
+        True
+        """
+        release_manager = release_manager_of(release)
+        if release_manager is None:
+            return self
+        # releases are identified by their tag, so redeliveries change nothing
+        releases = [r for r in self.releases if r.tag != release["tag_name"]]
+        if delta > 0:
+            releases.append(
+                Release(release_date(release), release["tag_name"], release_manager)
+            )
+        return HistoryIndex(releases)
+
+    @staticmethod
+    def _window(
+        dates: list[datetime.datetime], since: DateLike = None, until: DateLike = None
+    ) -> tuple[int, int]:
+        # since is inclusive, until is exclusive
+        start = 0 if since is None else bisect.bisect_left(dates, as_datetime(since))
+        end = (
+            len(dates)
+            if until is None
+            else bisect.bisect_left(dates, as_datetime(until))
+        )
+        return start, max(start, end)
+
+    def __len__(self) -> int:
+        return len(self.releases)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HistoryIndex):
+            return NotImplemented
+        return self.releases == other.releases
+
+    def last_releases(
+        self, since: DateLike = None, until: DateLike = None
+    ) -> dict[str, datetime.datetime]:
+        """Date of the last release of every release manager, only counting
+        releases from ``since`` until (excluding) ``until`` like
+        :py:meth:`tally`"""
+        last_releases = {}
+        for release_manager, dates in self.dates_by_manager.items():
+            start, end = self._window(dates, since, until)
+            if end > start:
+                last_releases[release_manager] = dates[end - 1]
+        return last_releases
+
+    def window(self, since: DateLike = None, until: DateLike = None) -> list[Release]:
+        start, end = self._window(self.dates, since, until)
+        return self.releases[start:end]
+
+    def count(
+        self, release_manager: str, since: DateLike = None, until: DateLike = None
+    ) -> int:
+        dates = self.dates_by_manager.get(release_manager, [])
+        start, end = self._window(dates, since, until)
+        return end - start
+
+    def tally(self, since: DateLike = None, until: DateLike = None) -> dict[str, int]:
+        """Like :py:func:`release_manager_finder.get_past_release_managers` but
+        only counting releases from ``since`` until (excluding) ``until``"""
+        tally = {}
+        for release_manager in self.dates_by_manager:
+            count = self.count(release_manager, since, until)
+            if count:
+                tally[release_manager] = count
+        return tally
+
+    def get_results(  # pylint: disable=too-many-arguments
+        self,
+        current_maintainers: dict[str, int],
+        next_release_managers: list[str],
+        opt_out_list: list[str],
+        attendees_list: list[str],
+        since: DateLike = None,
+        until: DateLike = None,
+    ) -> tuple[typing.Iterator[tuple[int, str]], list[tuple[int, str]]]:
+        return get_results(
+            current_maintainers,
+            self.tally(since, until),
+            next_release_managers,
+            opt_out_list,
+            attendees_list,
+        )
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Compact tally with logins interned to integer IDs
+
+A :py:class:`Roster` maps every login it has seen to a small integer ID once and
+can be shared between evaluations. A :py:class:`Tally` stores release counts in
+an :py:class:`array.array` indexed by those IDs, and the opt-out and attendee
+filters work on sets of IDs. Tuples of ``(count, login)`` are only created for
+the final results.
+"""
+
+import array
+import heapq
+import typing
+
+
+class Roster:
+    __slots__ = ("logins", "ids")
+
+    def __init__(self, logins: typing.Iterable[str] = ()):
+        self.logins: list[str] = []
+        self.ids: dict[str, int] = {}
+        for login in logins:
+            self.intern(login)
+
+    def __len__(self) -> int:
+        return len(self.logins)
+
+    def intern(self, login: str) -> int:
+        try:
+            return self.ids[login]
+        except KeyError:
+            self.ids[login] = len(self.logins)
+            self.logins.append(login)
+            return self.ids[login]
+
+    def id_set(self, logins: typing.Iterable[str]) -> set[int]:
+        # unknown logins can not be in any tally, so do not intern them
+        ids = self.ids
+        return {ids[login] for login in logins if login in ids}
+
+
+class Tally:
+    __slots__ = ("roster", "counts", "members", "current")
+
+    def __init__(
+        self,
+        current_maintainers: dict[str, int],
+        past_release_managers: dict[str, int],
+        roster: Roster = None,
+    ):
+        self.roster = roster if roster is not None else Roster()
+        self.current = {self.roster.intern(m) for m in current_maintainers}
+        for login in past_release_managers:
+            self.roster.intern(login)
+        # the roster may be shared, so only some of its IDs are members
+        self.counts = array.array("l", [0]) * len(self.roster)
+        self.members = set(self.current)
+        for tally in (current_maintainers, past_release_managers):
+            for login, count in tally.items():
+                login_id = self.roster.ids[login]
+                self.counts[login_id] = count
+                self.members.add(login_id)
+
+    def copy(self) -> "Tally":
+        # members and current maintainers are never changed after construction
+        tally = Tally.__new__(Tally)
+        tally.roster = self.roster
+        tally.counts = array.array(self.counts.typecode, self.counts)
+        tally.members = self.members
+        tally.current = self.current
+        return tally
+
+    def add_releases(self, release_managers: typing.Iterable[str]) -> None:
+        for login in release_managers:
+            login_id = self.roster.ids.get(login)
+            if login_id not in self.members:
+                # same as update_next_release_managers() for unknown maintainers
+                raise KeyError(login)
+            self.counts[login_id] += 1
+
+    def order(self) -> list[int]:
+        counts, logins = self.counts, self.roster.logins
+        return sorted(self.members, key=lambda i: (counts[i], logins[i]))
+
+    def selection_pool(
+        self, order: list[int], opt_out_ids: set[int], attendee_ids: set[int]
+    ) -> list[int]:
+        eligible = (self.current & attendee_ids) - opt_out_ids
+        counts = self.counts
+        # see arrays.selection_pool_mask(): least_managing() extends the pool to
+        # the next level as long as it has at most one member
+        lowest = heapq.nsmallest(2, (counts[i] for i in eligible))
+        if len(lowest) < 2:
+            return [i for i in order if i in eligible]
+        return [i for i in order if i in eligible and counts[i] <= lowest[1]]
+
+    def as_tuples(self, ids: typing.Iterable[int]) -> list[tuple[int, str]]:
+        counts, logins = self.counts, self.roster.logins
+        return [(counts[i], logins[i]) for i in ids]
+
+
+def get_results(
+    current_maintainers: dict[str, int],
+    past_release_managers: dict[str, int],
+    next_release_managers: list[str],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+    roster: Roster = None,
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    tally = Tally(current_maintainers, past_release_managers, roster)
+    tally.add_releases(next_release_managers)
+    order = tally.order()
+    pool = tally.selection_pool(
+        order, tally.roster.id_set(opt_out_list), tally.roster.id_set(attendees_list)
+    )
+    return tally.as_tuples(order), tally.as_tuples(pool)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-function-docstring
+
+"""Streaming decoding of JSON arrays
+
+:py:func:`iter_array` decodes the elements of a JSON array one after another
+while the array is still being received, so only one element needs to be held
+in memory at a time. :py:func:`project` reduces an element to the fields that
+are actually used.
+"""
+
+import codecs
+import json
+import re
+import typing
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_array(
+    chunks: typing.Iterable[bytes], encoding: str = "utf-8"
+) -> typing.Iterator[typing.Any]:
+    """Decode the elements of a JSON array received in ``chunks``
+
+    >>> list(iter_array([b'[{"a": 1', b'}, 2', b'3, "x"]']))
+    [{'a': 1}, 23, 'x']
+    """
+    decoder = json.JSONDecoder()
+    decode = codecs.getincrementaldecoder(encoding)().decode
+    chunks = iter(chunks)
+    buffer, pos = "", 0
+    expect = "["
+
+    def read_more() -> bool:
+        nonlocal buffer, pos
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buffer, pos = buffer[pos:] + decode(chunk), 0
+        return True
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if not read_more():
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            continue
+        char = buffer[pos]
+        if expect == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            pos += 1
+            expect = "value or ]"
+        elif char == "]" and expect != "value":
+            return
+        elif expect == ", or ]":
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect = "value"
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if read_more():
+                    continue
+                raise
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(buffer) and read_more():
+                continue
+            yield item
+            pos = end
+            expect = ", or ]"
+
+
+def project(value: typing.Any, fields: typing.Iterable[str]) -> typing.Any:
+    """Reduce ``value`` to the given dotted ``fields``
+
+    >>> project({"a": 1, "b": {"c": 2, "d": 3}, "e": 4}, ["a", "b.c", "f"])
+    {'a': 1, 'b': {'c': 2}}
+    >>> project({"b": None}, ["b.c"])
+    {'b': None}
+    """
+    result = {}
+    for field in fields:
+        path = field.split(".")
+        source, depth = value, 0
+        while depth < len(path) and isinstance(source, dict) and path[depth] in source:
+            source = source[path[depth]]
+            depth += 1
+        if depth == 0 or (depth < len(path) and isinstance(source, dict)):
+            # field does not exist (but parents that are null are kept)
+            continue
+        target = result
+        for name in path[: depth - 1]:
+            target = target.setdefault(name, {})
+        target[path[depth - 1]] = source
+    return result
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Case-insensitive prefix search over maintainer logins
+
+A :py:class:`PrefixIndex` keeps the logins sorted by their case-folded form, so
+all logins starting with a prefix are one contiguous slice of that list. The
+slice is found by bisection, so a search costs O(log n) plus the size of the
+requested page, independent of the number of matches.
+"""
+
+import bisect
+import sys
+import typing
+
+
+class PrefixIndex:
+    __slots__ = ("keys", "logins")
+
+    def __init__(self, logins: typing.Iterable[str] = ()):
+        entries = sorted((login.casefold(), login) for login in set(logins))
+        self.keys = [key for key, _ in entries]
+        self.logins = [login for _, login in entries]
+
+    def __len__(self) -> int:
+        return len(self.logins)
+
+    def __contains__(self, login: str) -> bool:
+        return self.get(login) is not None
+
+    def get(self, login: str, default: str = None) -> typing.Optional[str]:
+        """The indexed login that equals ``login`` ignoring case, like the
+        search does
+
+        >>> PrefixIndex(["huey", "Louie"]).get("LOUIE")
+        'Louie'
+        """
+        key = login.casefold()
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.logins[index]
+        return default
+
+    def range(self, prefix: str = "") -> tuple[int, int]:
+        """Start and end of the logins starting with ``prefix``
+
+        >>> index = PrefixIndex(["huey", "dewey", "Louie", "dewdrop"])
+        >>> index.range("DEW"), index.range("l"), index.range("x")
+        ((0, 2), (3, 4), (4, 4))
+        """
+        if not prefix:
+            return 0, len(self.keys)
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self.keys, prefix)
+        # the first key that sorts after all keys starting with prefix has the
+        # last character below the highest code point incremented, without
+        # one, all keys from start on start with prefix
+        upper = prefix.rstrip(chr(sys.maxunicode))
+        if not upper:
+            return start, len(self.keys)
+        upper = upper[:-1] + chr(ord(upper[-1]) + 1)
+        return start, bisect.bisect_left(self.keys, upper, lo=start)
+
+    def search(
+        self, prefix: str = "", offset: int = 0, limit: int = None
+    ) -> tuple[int, list[str]]:
+        """Number of logins starting with ``prefix`` and a page of them
+
+        >>> PrefixIndex(["huey", "dewey", "Louie", "dewdrop"]).search("d", 1)
+        (2, ['dewey'])
+        """
+        start, end = self.range(prefix)
+        first = min(start + offset, end)
+        last = end if limit is None else min(first + limit, end)
+        return end - start, self.logins[first:last]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+"""Weighted selection of the next release manager
+
+Instead of drawing uniformly from the least managing maintainers, every
+eligible maintainer may be drawn with a weight that decreases with the number of
+releases they managed and is lowered further if they managed a release
+recently. Draws use an :py:class:`AliasTable`, so after setting it up in O(n)
+every draw costs O(1).
+"""
+
+import datetime
+import random
+import typing
+
+# every release managed more than the least managing maintainer halves the weight
+COUNT_BASE = 2.0
+# years after which the penalty for having managed a release recently is halved
+RECENCY_HALF_LIFE = 2.0
+
+
+class AliasTable:
+    """Walker's alias method (in Vose's variant) for weighted draws"""
+
+    __slots__ = ("items", "weights", "total", "probabilities", "aliases")
+
+    def __init__(self, items: typing.Sequence, weights: typing.Sequence[float]):
+        if not items:
+            raise IndexError("Cannot draw from an empty sequence")
+        if len(items) != len(weights):
+            raise ValueError("There must be exactly one weight per item")
+        self.items = list(items)
+        self.weights = list(weights)
+        self.total = sum(self.weights)
+        if self.total <= 0 or min(self.weights) < 0:
+            raise ValueError("Weights must not be negative and not all zero")
+        n = len(self.items)
+        scaled = [w * n / self.total for w in self.weights]
+        self.probabilities = [1.0] * n
+        self.aliases = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # whatever is left over is 1 up to rounding errors
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def probability(self, index: int) -> float:
+        return self.weights[index] / self.total
+
+    def draw(self, rng: random.Random = random) -> typing.Any:
+        index = rng.randrange(len(self.items))
+        if rng.random() >= self.probabilities[index]:
+            index = self.aliases[index]
+        return self.items[index]
+
+
+def recency_factor(
+    years_since_last: typing.Optional[float], half_life: float = RECENCY_HALF_LIFE
+) -> float:
+    """Factor from 0 (just managed a release) to 1 (never managed one)
+
+    >>> recency_factor(None), recency_factor(0), recency_factor(2), recency_factor(4)
+    (1.0, 0.0, 0.5, 0.75)
+    """
+    if years_since_last is None:
+        return 1.0
+    return 1.0 - 0.5 ** (max(years_since_last, 0) / half_life)
+
+
+def selection_weights(
+    pool: typing.Sequence[tuple[int, str]],
+    last_releases: typing.Mapping[str, datetime.datetime] = None,
+    now: datetime.datetime = None,
+    count_base: float = COUNT_BASE,
+    half_life: float = RECENCY_HALF_LIFE,
+) -> list[float]:
+    """Weights of the ``(count, login)`` tuples in ``pool``
+
+    ``last_releases`` maps logins to the date of the last release they managed.
+    """
+    if not pool:
+        return []
+    last_releases = last_releases or {}
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    least = min(count for count, _ in pool)
+    weights = []
+    for count, login in pool:
+        last_release = last_releases.get(login)
+        years = None
+        if last_release is not None:
+            years = (now - last_release) / datetime.timedelta(days=365.25)
+        weights.append(count_base ** (least - count) * recency_factor(years, half_life))
+    if not any(weights):
+        # everyone just managed a release, so fall back to the release counts
+        return [count_base ** (least - count) for count, _ in pool]
+    return weights
+
+
+def weighted_sampler(
+    pool: typing.Sequence[tuple[int, str]],
+    last_releases: typing.Mapping[str, datetime.datetime] = None,
+    now: datetime.datetime = None,
+    next_release_managers: typing.Iterable[str] = (),
+) -> AliasTable:
+    """Alias table drawing logins from the ``(count, login)`` tuples in ``pool``
+
+    The ``next_release_managers`` are counted in ``pool`` for the upcoming
+    release, so for the recency that release is their last one, i.e., now.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    last_releases = {
+        **(last_releases or {}),
+        **dict.fromkeys(next_release_managers, now),
+    }
+    return AliasTable(
+        [login for _, login in pool], selection_weights(pool, last_releases, now)
+    )
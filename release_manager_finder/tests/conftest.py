@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import contextlib
+import os
+import pathlib
+import random
+import re
+import socketserver
+import subprocess
+import sys
+import threading
+import typing
+
+import pytest
+
+from .. import get_results
+
+REPO_ROOT = pathlib.Path(__file__).parents[2]
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+# secrets web.make_app() reads from the environment
+WEB_ENV = {
+    "CLIENT_ID": "dGVzdHRlc3R0ZXN0Cg",
+    "CLIENT_SECRET": "746573747465737474657374210a",
+    "COOKIE_SECRET": "a4a8fbb3-80ac-434c-b7ac-9c897d9e75df",
+}
+
+
+def measure_import_time(module: str, env: dict[str, str] = None) -> dict[str, int]:
+    """Cold-start import of ``module`` in a fresh interpreter.
+
+    Returns the cumulative import time in microseconds for every module
+    imported along the way, as reported by ``python -X importtime``.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=REPO_ROOT,
+        env=env if env is not None else os.environ.copy(),
+        text=True,
+    )
+    report = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            report[match[4]] = int(match[2])
+    return report
+
+
+@contextlib.contextmanager
+def serving(server: socketserver.BaseServer) -> typing.Iterator[None]:
+    """Run the stand-in ``server`` in a thread until the context is left"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def import_time(record_testsuite_property):
+    def _import_time(module: str, env: dict[str, str] = None) -> dict[str, int]:
+        report = measure_import_time(module, env)
+        # ends up in test-report.xml so cold-start cost can be tracked over time
+        record_testsuite_property(f"import_time_us[{module}]", report[module])
+        return report
+
+    return _import_time
+
+
+def _random_scenario(rng: random.Random, size: int) -> dict:
+    logins = [f"user{i}" for i in range(size)]
+    current_maintainers = {m: 0 for m in logins if rng.random() < 0.7}
+    past_release_managers = {m: rng.randrange(5) for m in logins if rng.random() < 0.5}
+    next_release_managers = rng.sample(
+        sorted(current_maintainers), k=min(1, len(current_maintainers))
+    )
+    return {
+        "current_maintainers": current_maintainers,
+        "past_release_managers": past_release_managers,
+        "next_release_managers": next_release_managers,
+        "opt_out_list": [m for m in logins if rng.random() < 0.2],
+        "attendees_list": [m for m in logins if rng.random() < 0.6],
+    }
+
+
+@pytest.fixture
+def get_results_cases():
+    """Random get_results() arguments for a roster of ``size`` logins together
+    with the results of the reference implementation"""
+
+    def _get_results_cases(size: int, count: int = 200) -> list[tuple[dict, tuple]]:
+        rng = random.Random(size)
+        cases = []
+        for _ in range(count):
+            scenario = _random_scenario(rng, size)
+            try:
+                cases.append((scenario, get_results(**scenario)))
+            except ValueError:
+                # least_managing() runs out of levels for some pools of size 1
+                continue
+        assert len(cases) > count // 2
+        return cases
+
+    return _get_results_cases
+
+
+@pytest.fixture
+def example_scenario():
+    return (
+        {
+            "current_maintainers": {
+                "foobar": 0,
+                "huey": 0,
+                "test": 0,
+                "dewey": 0,
+                "louie": 0,
+                "donald": 0,
+            },
+            "past_release_managers": {
+                "foobar": 1,
+                "huey": 2,
+                "test": 2,
+                "louie": 3,
+                "snafu": 5,
+                "donald": 2,
+            },
+            "next_release_managers": ["foobar"],
+            "opt_out_list": ["huey", "dewey", "louie", "dewey"],
+            "attendees_list": ["louie", "dewey", "foobar", "donald", "unknown"],
+        },
+        (
+            [
+                (0, "dewey"),
+                (2, "donald"),
+                (2, "foobar"),
+                (2, "huey"),
+                (2, "test"),
+                (3, "louie"),
+                (5, "snafu"),
+            ],
+            [(2, "donald"), (2, "foobar")],
+        ),
+    )
+
+
+@pytest.fixture
+def web_env(monkeypatch):
+    """Set the secrets :py:func:`release_manager_finder.web.make_app` reads
+    from the environment"""
+    for name, value in WEB_ENV.items():
+        monkeypatch.setenv(name, value)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+
+import argparse
+import datetime
+import urllib.parse
+
+import agithub.GitHub
+import pytest
+
+from .. import GitHubError, activity, exclude_inactive
+
+SINCE = datetime.datetime(2024, 7, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+
+def fake_request(commits: dict[str, list], reviews: dict[str, int]):
+    def request(self, method, url, body, headers):
+        # pylint: disable=unused-argument
+        path, _, query = url.partition("?")
+        params = dict(urllib.parse.parse_qsl(query))
+        assert params["per_page"] == "1"
+        if path == "/repos/RIOT-OS/RIOT/commits":
+            assert params["since"] == "2024-07-01T12:30:00Z"
+            return 200, commits.get(params["author"], [])
+        if path == "/search/issues":
+            login = params["q"].split("reviewed-by:")[1].split()[0]
+            assert "updated:>=2024-07-01" in params["q"]
+            if login == "scrooge":
+                return 403, {"message": "API rate limit exceeded"}
+            return 200, {"total_count": reviews.get(login, 0)}
+        raise AssertionError(url)  # pragma: no cover
+
+    return request
+
+
+@pytest.fixture
+def mocked_request(mocker):
+    yield mocker.patch(
+        "agithub.GitHub.GitHubClient.request",
+        autospec=True,
+        side_effect=fake_request({"huey": [{"sha": "abc"}]}, {"dewey": 3}),
+    )
+
+
+def test_get_activity(mocked_request):
+    github = agithub.GitHub.GitHub()
+    assert activity.get_activity(
+        github, ["huey", "dewey", "louie", "huey"], SINCE, max_concurrent=2
+    ) == {"dewey": True, "huey": True, "louie": False}
+    # huey's commit spared the search for reviews
+    assert mocked_request.call_count == 5
+    assert not activity.get_activity(github, [], SINCE)
+    # a rate limited search leaves the activity unknown
+    assert activity.get_activity(github, ["scrooge"], SINCE) == {"scrooge": None}
+
+
+def test_get_activity_error(mocker):
+    mocker.patch(
+        "agithub.GitHub.GitHubClient.request",
+        autospec=True,
+        return_value=(502, "Bad gateway"),
+    )
+    with pytest.raises(GitHubError, match="Bad gateway"):
+        activity.get_activity(agithub.GitHub.GitHub(), ["huey"], SINCE)
+
+
+def test_get_activity_throttled(mocker, mocked_request):
+    mocker.patch.dict(
+        activity._search_throttles,  # pylint: disable=protected-access
+        {False: activity.SearchThrottle(1)},
+    )
+    github = agithub.GitHub.GitHub()
+    github.client.sleep_on_ratelimit = False
+    assert activity.get_activity(github, ["dewey", "louie"], SINCE, 1) == {
+        "dewey": True,
+        "louie": None,
+    }
+    # louie's search was not sent
+    assert mocked_request.call_count == 3
+
+
+def test_search_throttle_rate():
+    assert activity.search_throttle(agithub.GitHub.GitHub().client).rate == 10
+    github = agithub.GitHub.GitHub(token="foobar")
+    assert activity.search_throttle(github.client).rate == 30
+
+
+def test_search_throttle(mocker):
+    monotonic = mocker.patch("time.monotonic", return_value=100.0)
+    sleep = mocker.patch("time.sleep")
+    throttle = activity.SearchThrottle(2, period=60.0)
+    assert throttle.acquire()
+    monotonic.return_value = 110.0
+    assert throttle.acquire()
+    assert not throttle.acquire()
+    assert throttle.acquire(wait=True)
+    sleep.assert_called_once_with(50.0)
+    monotonic.return_value = 161.0
+    assert not throttle.acquire()
+    monotonic.return_value = 171.0
+    assert throttle.acquire()
+
+
+@pytest.mark.usefixtures("mocked_request")
+def test_exclude_inactive(mocker):
+    mocker.patch.object(activity, "activity_since", return_value=SINCE)
+    github = agithub.GitHub.GitHub()
+    args = argparse.Namespace(active_months=None)
+    maintainers = dict.fromkeys(["huey", "dewey", "louie", "donald"], 0)
+    assert exclude_inactive(args, github, maintainers, ["dewey"], ["huey"]) == ["dewey"]
+    args.active_months = 12
+    assert exclude_inactive(
+        args, github, maintainers, ["dewey"], ["huey", "dewey", "louie", "daisy"]
+    ) == ["dewey", "louie"]
+    # the activity of scrooge is unknown, so they are not left out
+    maintainers["scrooge"] = 0
+    assert exclude_inactive(args, github, maintainers, [], ["scrooge"]) == []
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import random
+
+import pytest
+
+from .. import least_managing, sort_by_release_management
+from .. import arrays
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("size", [2, 5, 30, 200])
+def test_get_results_equivalence(get_results_cases, size):
+    for scenario, exp in get_results_cases(size):
+        assert arrays.get_results(**scenario) == exp
+
+
+def test_get_results(example_scenario):
+    scenario, exp = example_scenario
+    rm_tally, pool = arrays.get_results(**scenario)
+    assert (rm_tally, pool) == exp
+    assert all(isinstance(c, int) and isinstance(m, str) for c, m in rm_tally)
+
+
+def test_get_results_empty():
+    assert arrays.get_results({}, {}, [], [], []) == ([], [])
+
+
+def test_get_results_unknown_next_release_manager():
+    with pytest.raises(KeyError):
+        arrays.get_results({"huey": 0}, {}, ["dewey"], [], [])
+    with pytest.raises(KeyError):
+        arrays.get_results({"huey": 0}, {}, ["zzz"], [], [])
+
+
+def test_selection_pool_mask_matches_least_managing():
+    rng = random.Random(4223)
+    maintainers = [f"m{i}" for i in range(8)]
+    for _ in range(500):
+        tally = {m: rng.randrange(4) for m in maintainers}
+        eligible = [rng.random() < 0.6 for _ in maintainers]
+        current = {m for m, e in zip(maintainers, eligible) if e}
+        # least_managing assumes the tally to be filtered for attendees already
+        rm_tally = [m for m in sort_by_release_management(tally) if m[1] in current]
+        exp = {m[1] for m in least_managing(rm_tally, current)}
+        mask = arrays.selection_pool_mask(
+            np.array([tally[m] for m in maintainers]), np.array(eligible)
+        )
+        assert {m for m, in_pool in zip(maintainers, mask) if in_pool} == exp
+
+
+def test_selection_pool_mask_batched():
+    counts = np.array([[0, 1, 2], [3, 3, 3], [2, 0, 5]])
+    eligible = np.array([[True, False, True], [True, True, True], [False, False, True]])
+    assert arrays.selection_pool_mask(counts, eligible).tolist() == [
+        [True, False, True],
+        [True, True, True],
+        [False, False, True],
+    ]
+    assert arrays.selection_pool_mask(np.array([[1]]), np.array([[True]])).tolist() == [
+        [True]
+    ]
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+
+import io
+import json
+
+import pytest
+
+from .. import batch, get_results, main
+
+
+@pytest.fixture
+def scenario_dir(tmp_path):
+    for name, files in {
+        "b-no-opt-out": {"attendees": "huey\ndewey\nlouie\n"},
+        "a-with-opt-out": {"attendees": "huey\ndewey\nlouie\n", "opt-out": "huey\n"},
+        "c-next-rm": {"attendees": "huey\ndewey\n", "next-rm": "dewey\n"},
+    }.items():
+        (tmp_path / name).mkdir()
+        for filename, content in files.items():
+            (tmp_path / name / filename).write_text(content, encoding="utf-8")
+    (tmp_path / "not-a-scenario").write_text("huey\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    (tmp_path / "attendees").write_text("huey\n# dewey\nlouie\n", encoding="utf-8")
+    output = tmp_path / "manifest.jsonl"
+    output.write_text(
+        "# scenarios\n"
+        '{"name": "from-file", "attendees": "attendees", "opt_out": ["louie"]}\n'
+        "\n"
+        '{"attendees": ["huey", "dewey"], "next_release_managers": ["huey"]}\n',
+        encoding="utf-8",
+    )
+    return output
+
+
+def test_load_scenarios_directory(scenario_dir):
+    assert list(batch.load_scenarios(str(scenario_dir))) == [
+        batch.Scenario("a-with-opt-out", ["huey", "dewey", "louie"], ["huey"]),
+        batch.Scenario("b-no-opt-out", ["huey", "dewey", "louie"]),
+        batch.Scenario("c-next-rm", ["huey", "dewey"], [], ["dewey"]),
+    ]
+
+
+def test_load_scenarios_manifest(manifest):
+    assert list(batch.load_scenarios(str(manifest))) == [
+        batch.Scenario("from-file", ["huey", "louie"], ["louie"]),
+        batch.Scenario("4", ["huey", "dewey"], [], ["huey"]),
+    ]
+
+
+def test_evaluate_scenarios(mocker, get_results_cases):
+    mocker.patch("random.choice", lambda seq: seq[0])
+    cases = get_results_cases(30, 50)
+    # all cases share the same maintainers and tally in batch mode
+    base = cases[0][0]
+    scenarios = [
+        batch.Scenario(
+            str(i), s["attendees_list"], s["opt_out_list"], s["next_release_managers"]
+        )
+        for i, (s, _) in enumerate(cases)
+        if set(s["next_release_managers"]) <= set(base["current_maintainers"])
+    ]
+    results = list(
+        batch.evaluate_scenarios(
+            base["current_maintainers"],
+            base["past_release_managers"],
+            base["next_release_managers"],
+            scenarios,
+        )
+    )
+    assert len(results) == len(scenarios)
+    for scenario, result in zip(scenarios, results):
+        try:
+            _, pool = get_results(
+                base["current_maintainers"],
+                base["past_release_managers"],
+                base["next_release_managers"] + scenario.next_release_managers,
+                scenario.opt_out,
+                scenario.attendees,
+            )
+        except ValueError:
+            continue
+        assert result["scenario"] == scenario.name
+        assert result["selection_pool"] == pool
+        assert result["next_release_manager"] == (pool[0][1] if pool else None)
+
+
+def test_writers():
+    results = [
+        {
+            "scenario": "a",
+            "selection_pool": [(1, "huey"), (2, "dewey")],
+            "next_release_manager": "dewey",
+        },
+        {"scenario": "b", "selection_pool": [], "next_release_manager": None},
+    ]
+    output = io.StringIO()
+    batch.write_jsonl(results, output)
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+        {
+            "scenario": "a",
+            "selection_pool": [[1, "huey"], [2, "dewey"]],
+            "next_release_manager": "dewey",
+        },
+        {"scenario": "b", "selection_pool": [], "next_release_manager": None},
+    ]
+    output = io.StringIO()
+    batch.write_csv(results, output)
+    assert output.getvalue().splitlines() == [
+        "scenario,releases,selection_pool,next_release_manager",
+        "a,1 2,huey dewey,dewey",
+        "b,,,",
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_main_batch(mocker, capsys, scenario_dir, fmt):
+    mocker.patch("random.choice", lambda seq: seq[0])
+    get_maintainers = mocker.patch(
+        "release_manager_finder.get_maintainers",
+        return_value={"huey": 0, "dewey": 0, "louie": 0},
+    )
+    get_past_release_managers = mocker.patch(
+        "release_manager_finder.get_past_release_managers",
+        return_value={"huey": 1, "dewey": 2, "louie": 2, "OlegHahm": 4},
+    )
+    mocker.patch(
+        "sys.argv", ["command", "-b", str(scenario_dir), "-f", fmt, "-n", "louie"]
+    )
+    main()
+    get_maintainers.assert_called_once()
+    get_past_release_managers.assert_called_once()
+    out = capsys.readouterr().out
+    if fmt == "jsonl":
+        assert [json.loads(line) for line in out.splitlines()] == [
+            {
+                "scenario": "a-with-opt-out",
+                "selection_pool": [[2, "dewey"], [3, "louie"]],
+                "next_release_manager": "dewey",
+            },
+            {
+                "scenario": "b-no-opt-out",
+                "selection_pool": [[1, "huey"], [2, "dewey"]],
+                "next_release_manager": "huey",
+            },
+            {
+                "scenario": "c-next-rm",
+                "selection_pool": [[1, "huey"], [3, "dewey"]],
+                "next_release_manager": "huey",
+            },
+        ]
+    else:
+        assert out.splitlines() == [
+            "scenario,releases,selection_pool,next_release_manager",
+            "a-with-opt-out,2 3,dewey louie,dewey",
+            "b-no-opt-out,1 2,huey dewey,huey",
+            "c-next-rm,1 3,huey dewey,huey",
+        ]
+
+
+def test_main_batch_opt_out(mocker, capsys, scenario_dir):
+    mocker.patch("random.choice", lambda seq: seq[0])
+    mocker.patch(
+        "release_manager_finder.get_maintainers",
+        return_value={"huey": 0, "dewey": 0, "louie": 0},
+    )
+    mocker.patch(
+        "release_manager_finder.get_past_release_managers",
+        return_value={"huey": 1, "dewey": 2, "louie": 2},
+    )
+    forum_opt_out = mocker.patch(
+        "release_manager_finder.forum.OptOutThread", autospec=True
+    ).return_value
+    forum_opt_out.opt_out = ["dewey"]
+    opt_out = scenario_dir / "opt-out"
+    opt_out.write_text("louie\n", encoding="utf-8")
+    mocker.patch(
+        "sys.argv",
+        ["command", str(opt_out), "-O", "http://forum/t/1", "-b", str(scenario_dir)],
+    )
+    main()
+    # the opt-outs of the file and the forum apply to all scenarios
+    assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+        {"scenario": scenario, "selection_pool": [], "next_release_manager": None}
+        for scenario in ["a-with-opt-out"]
+    ] + [
+        {
+            "scenario": scenario,
+            "selection_pool": [[1, "huey"]],
+            "next_release_manager": "huey",
+        }
+        for scenario in ["b-no-opt-out", "c-next-rm"]
+    ]
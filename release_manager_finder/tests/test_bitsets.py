@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from .. import bitsets, interned
+
+
+@pytest.mark.parametrize("size", [2, 5, 30, 200])
+def test_get_results_equivalence(get_results_cases, size):
+    for scenario, exp in get_results_cases(size):
+        assert bitsets.get_results(**scenario) == exp
+
+
+def test_get_results(example_scenario):
+    scenario, exp = example_scenario
+    assert bitsets.get_results(**scenario) == exp
+
+
+def test_bitset_tally():
+    tally = interned.Tally(
+        {"huey": 0, "dewey": 0, "louie": 0, "donald": 0},
+        {"huey": 1, "dewey": 1, "louie": 2, "scrooge": 0},
+    )
+    bits = bitsets.BitsetTally(tally)
+    assert not hasattr(bits, "__dict__")
+    assert bits.logins == ["donald", "scrooge", "dewey", "huey", "louie"]
+    assert bits.mask(["dewey", "nobody", "donald"]) == 0b00101
+    # scrooge is no maintainer anymore
+    assert bits.current == 0b11101
+    assert bits.levels == [0b00011, 0b00011, 0b01111, 0b01111, 0b11111]
+    everyone = bits.mask(bits.logins)
+    assert bits.as_tuples(bits.selection_pool(0, everyone)) == [
+        (0, "donald"),
+        (1, "dewey"),
+        (1, "huey"),
+    ]
+    assert bits.as_tuples(bits.selection_pool(bits.mask(["huey"]), everyone)) == [
+        (0, "donald"),
+        (1, "dewey"),
+    ]
+    assert bits.selection_pool(everyone, everyone) == 0
+    assert bits.as_tuples(bits.selection_pool(0, bits.mask(["louie"]))) == [
+        (2, "louie")
+    ]
+
+
+def test_bitset_tally_empty():
+    bits = bitsets.BitsetTally(interned.Tally({}, {}))
+    assert len(bits) == 0
+    assert bits.selection_pool(0, bits.mask(["huey"])) == 0
+    assert not bits.as_tuples(0)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import random
+
+import pytest
+
+from .. import draws, get_results
+
+
+def test_buckets():
+    buckets = draws.Buckets([(2, "louie"), (1, "huey"), (3, "donald"), (1, "dewey")])
+    assert buckets.selection_pool() == [(1, "dewey"), (1, "huey")]
+    buckets.add_release("dewey", 1)
+    # only one least managing maintainer, so the next level is added
+    assert buckets.selection_pool() == [(1, "huey"), (2, "dewey"), (2, "louie")]
+    buckets.add_release("huey", 1)
+    assert buckets.levels == [2, 3]
+    assert buckets.selection_pool() == [(2, "dewey"), (2, "huey"), (2, "louie")]
+    assert not draws.Buckets([]).selection_pool()
+    assert draws.Buckets([(4, "huey")]).selection_pool() == [(4, "huey")]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_draw_release_managers(seed, get_results_cases):
+    # same as drawing one release manager after the other and passing them on
+    for scenario, (rm_tally, _) in get_results_cases(30, count=20):
+        eligible = [
+            m
+            for m in rm_tally
+            if m[1] in scenario["current_maintainers"]
+            and m[1] in scenario["attendees_list"]
+            and m[1] not in scenario["opt_out_list"]
+        ]
+        rng = random.Random(seed)
+        upcoming = draws.draw_release_managers(eligible, 4, rng)
+        rng = random.Random(seed)
+        scenario = dict(scenario)
+        for draw in upcoming:
+            _, pool = get_results(**scenario)
+            assert draw.selection_pool == pool
+            if not pool:
+                assert draw.release_manager is None
+                continue
+            assert draw.release_manager == rng.choice(pool)[1]
+            scenario["next_release_managers"] = scenario["next_release_managers"] + [
+                draw.release_manager
+            ]
+        assert [draw.release for draw in upcoming] == [1, 2, 3, 4]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from .. import forecast
+
+np = pytest.importorskip("numpy")
+
+
+def test_simulate():
+    tally = {"huey": 3, "dewey": 3, "louie": 3, "scrooge": 10}
+    attendance = {"huey": 1.0, "dewey": 1.0, "louie": 0.0}
+    result = forecast.simulate(
+        tally,
+        attendance,
+        {"dewey": 0.0},
+        forecast.ForecastConfig(cycles=4, runs=20_000, seed=1, chunk_size=7_000),
+    )
+    load = dict(zip(result.maintainers, result.expected_load))
+    assert result.maintainers == ["dewey", "huey", "louie"]
+    # someone gets picked every release and louie never attends
+    assert sum(load.values()) == pytest.approx(4)
+    assert load["louie"] == 0
+    assert load["huey"] == pytest.approx(2, abs=0.05)
+    assert load["dewey"] == pytest.approx(2, abs=0.05)
+    assert result.empty_pool_rate == 0
+    assert 0 <= result.gini <= 1
+
+
+def test_simulate_empty_pool():
+    result = forecast.simulate(
+        {},
+        {"huey": 1.0},
+        {"huey": 1.0},
+        forecast.ForecastConfig(cycles=2, runs=10, seed=1),
+    )
+    assert result.expected_load == [0]
+    assert result.at_least_once == [0]
+    assert result.empty_pool_rate == 1
+    assert result.gini == 0
+
+
+def test_simulate_processes():
+    tally = {"huey": 1, "dewey": 0, "louie": 2}
+    attendance = {"huey": 0.8, "dewey": 0.5, "louie": 0.9}
+    opt_out = {"louie": 0.3}
+    config = forecast.ForecastConfig(cycles=5, runs=3_000, seed=42, chunk_size=1_000)
+    sequential = forecast.simulate(tally, attendance, opt_out, config)
+    config.processes = 2
+    assert forecast.simulate(tally, attendance, opt_out, config) == sequential
+
+
+def test_print_forecast(capsys):
+    forecast.print_forecast(
+        forecast.Forecast(
+            maintainers=["dewey", "huey"],
+            cycles=4,
+            runs=10,
+            expected_load=[1.5, 2.5],
+            load_stddev=[0.5, 0.5],
+            at_least_once=[0.9, 1.0],
+            empty_pool_rate=0.0,
+            gini=0.25,
+        )
+    )
+    assert capsys.readouterr().out.splitlines() == [
+        "Forecast over 4 releases (10 simulated runs)",
+        "=" * 79,
+        " Expected  Std.dev.  P(>=1)\tMaintainer",
+        "    2.500     0.500  100.0%\thuey",
+        "    1.500     0.500   90.0%\tdewey",
+        "",
+        "",
+        "Mean Gini coefficient of the load: 0.250",
+        "Releases without selection pool: 0.0%",
+    ]
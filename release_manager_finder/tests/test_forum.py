@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+
+import http.server
+import json
+import urllib.parse
+
+import pytest
+
+from .. import forum, get_opt_out_list
+from .conftest import serving
+
+
+class ForumStandIn(http.server.ThreadingHTTPServer):
+    """Serves the posts of one thread like Discourse, two posts per page"""
+
+    page_size = 2
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ForumHandler)
+        self.posts = []
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/t/opt-out/3354"
+
+    def post(self, username, cooked, **kwargs):
+        self.posts.append(
+            {
+                "post_number": len(self.posts) + 1,
+                "username": username,
+                "cooked": cooked,
+                "post_type": 1,
+                **kwargs,
+            }
+        )
+
+
+class ForumHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        self.server.requests.append((url.path, query))
+        if url.path != "/t/3354/posts.json":
+            self.send_error(404)
+            return
+        after = int(query.get("post_number", 0))
+        posts = [p for p in self.server.posts if p["post_number"] > after]
+        body = json.dumps(
+            {"post_stream": {"posts": posts[: self.server.page_size]}, "id": 3354}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = ForumStandIn()
+    server.post("admin", "<p>Post here if you want to opt out.</p>")
+    server.post("huey", "<p>I opt out.</p>")
+    server.post("dewey", "<p>Please opt me out for the next releases.</p>")
+    server.post("louie", "<p>Same here, opting out!</p>", user_deleted=True)
+    server.post("donald", '<aside class="quote"><p>I opt out.</p></aside><p>ok</p>')
+    with serving(server):
+        yield server
+
+
+def test_posts_url():
+    assert forum.posts_url("http://localhost:8000/t/3354") == (
+        "http://localhost:8000/t/3354/posts.json"
+    )
+    for url in ["https://forum.riot-os.org/", "ftp://forum/t/1", "https://x/u/12"]:
+        with pytest.raises(ValueError):
+            forum.posts_url(url)
+
+
+def test_opt_out_thread(stand_in):
+    thread = forum.OptOutThread(stand_in.url)
+    assert thread.refresh(timeout=5)
+    assert thread.opt_out == ["dewey", "huey"]
+    assert thread.last_post_number == 5
+    # 3 pages and an empty one
+    assert [q["post_number"] for _, q in stand_in.requests] == ["0", "2", "4", "5"]
+    stand_in.requests.clear()
+    assert not thread.refresh(timeout=5)
+    assert stand_in.requests == [
+        ("/t/3354/posts.json", {"post_number": "5", "asc": "true"})
+    ]
+    stand_in.requests.clear()
+    stand_in.post("huey", "<p>I&#39;d like to opt back in.</p>")
+    stand_in.post("scrooge", "<p>Opt-out, please.</p>")
+    assert thread.refresh(timeout=5)
+    assert thread.opt_out == ["dewey", "scrooge"]
+    # only the new posts were fetched
+    assert [q["post_number"] for _, q in stand_in.requests] == ["5", "7"]
+
+
+def test_opt_out_thread_full_read(mocker, stand_in):
+    mocker.patch.object(forum, "FORUM_FULL_READ", 2)
+    thread = forum.OptOutThread(stand_in.url)
+    assert thread.refresh(timeout=5)
+    assert thread.opt_out == ["dewey", "huey"]
+    # huey changed their mind by editing the old post
+    stand_in.posts[1]["cooked"] = "<p>Never mind, I opt back in.</p>"
+    assert not thread.refresh(timeout=5)
+    assert thread.full_read_due
+    stand_in.requests.clear()
+    assert thread.refresh(timeout=5)
+    assert thread.opt_out == ["dewey"]
+    assert thread.last_post_number == 5
+    assert stand_in.requests[0][1]["post_number"] == "0"
+    assert not thread.full_read_due
+
+
+def test_opt_out_thread_apply():
+    thread = forum.OptOutThread()
+    assert thread.apply([{"post_number": 2, "username": "huey", "cooked": "opt out"}])
+    # already processed posts are skipped
+    assert not thread.apply(
+        [{"post_number": 2, "username": "huey", "cooked": "opt back in"}]
+    )
+    assert not thread.apply(
+        [
+            {
+                "post_number": 3,
+                "username": "dewey",
+                "cooked": "opt out",
+                "post_type": 4,
+            },
+            {"post_number": 4, "username": "huey", "cooked": "optimal input"},
+        ]
+    )
+    assert thread.opt_out == ["huey"]
+    assert thread.last_post_number == 4
+
+
+def test_get_opt_out_list_forum(stand_in, tmp_path):
+    opt_out = tmp_path / "opt-out"
+    opt_out.write_text("louie\nhuey\n", encoding="utf-8")
+    assert get_opt_out_list(str(opt_out), stand_in.url) == ["louie", "huey", "dewey"]
+    assert get_opt_out_list(opt_out_forum=stand_in.url) == ["dewey", "huey"]
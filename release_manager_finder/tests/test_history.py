@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=redefined-outer-name
+
+import datetime
+
+import pytest
+
+import release_manager_finder
+from .. import get_release_tally, history
+
+RELEASES = [
+    {"tag_name": tag, "author": {"login": login}, "published_at": published_at}
+    for tag, login, published_at in [
+        ("2015.09", "OlegHahm", "2015-09-25T10:00:00Z"),
+        ("2016.07", "miri64", "2016-07-29T10:00:00Z"),
+        ("2016.10", "miri64", "2016-10-28T10:00:00Z"),
+        ("2020.01", "huey", "2020-01-31T10:00:00Z"),
+        ("2020.07", "miri64", "2020-07-17T10:00:00Z"),
+        ("2020.07.1", "miri64", "2020-08-03T10:00:00Z"),
+        ("2021.01", "huey", None),
+        ("2021.07", "dewey", "2021-07-30T10:00:00Z"),
+    ]
+]
+
+
+@pytest.fixture
+def index():
+    yield history.HistoryIndex.from_github(RELEASES)
+
+
+def test_history_index(index):
+    # point release is skipped, unlisted releases are added
+    assert len(index) == 11
+    assert index.tally() == {
+        "OlegHahm": 5,
+        "kYc0o": 1,
+        "miri64": 2,
+        "huey": 2,
+        "dewey": 1,
+    }
+    assert [r.tag for r in index.window(since="2020-01-01")] == [
+        "2020.01",
+        "2020.07",
+        "2021.01",
+        "2021.07",
+    ]
+    # since is inclusive, until exclusive
+    assert index.tally(
+        datetime.date(2020, 1, 31), datetime.datetime(2021, 7, 30, 10)
+    ) == {"huey": 2, "miri64": 1}
+    assert index.tally(until=datetime.date(2014, 1, 1)) == {"OlegHahm": 1}
+    assert not index.tally(since="2022-01-01")
+    assert not index.tally(since="2021-01-01", until="2020-01-01")
+    assert index.count("huey", since="2020-02-01") == 1
+    assert index.count("scrooge") == 0
+    assert index.last_releases()["miri64"].year == 2020
+    assert index.last_releases(until="2020-01-01")["miri64"].year == 2016
+    assert index.last_releases(since="2021-01-01").keys() == {"huey", "dewey"}
+
+
+def test_history_index_get_results(index):
+    rm_tally, pool = index.get_results(
+        {"huey": 0, "dewey": 0, "louie": 0},
+        ["louie"],
+        [],
+        ["huey", "dewey", "louie"],
+        since="2021-01-01",
+    )
+    assert rm_tally == [(1, "dewey"), (1, "huey"), (1, "louie")]
+    assert pool == [(1, "dewey"), (1, "huey"), (1, "louie")]
+
+
+def test_get_release_tally(mocker, index):
+    mocker.patch.object(
+        release_manager_finder, "get_past_releases", return_value=RELEASES
+    )
+    mocker.patch.object(
+        release_manager_finder,
+        "get_past_release_managers",
+        return_value=index.tally(),
+    )
+    assert get_release_tally(None) == index.tally()
+    assert get_release_tally(None, since=datetime.date(2021, 1, 1)) == {
+        "huey": 1,
+        "dewey": 1,
+    }
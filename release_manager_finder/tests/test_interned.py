@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import sys
+
+import pytest
+
+from .. import interned
+
+
+def test_roster():
+    roster = interned.Roster(["huey", "dewey", "huey"])
+    assert len(roster) == 2
+    assert roster.intern("dewey") == 1
+    assert roster.intern("louie") == 2
+    assert roster.logins == ["huey", "dewey", "louie"]
+    assert roster.id_set(["louie", "donald", "huey"]) == {0, 2}
+    # unknown logins are not interned by lookups
+    assert "donald" not in roster.ids
+    with pytest.raises(AttributeError):
+        roster.foobar = 1  # pylint: disable=assigning-non-slot
+
+
+def test_tally_is_compact():
+    roster = interned.Roster()
+    tally = interned.Tally({"huey": 0}, {"dewey": 3}, roster)
+    assert not hasattr(tally, "__dict__")
+    assert tally.counts.typecode == "l"
+    assert sys.getsizeof(tally.counts) < sys.getsizeof([0] * len(roster)) + 64
+
+
+@pytest.mark.parametrize("size", [2, 5, 30, 200])
+def test_get_results_equivalence(get_results_cases, size):
+    roster = interned.Roster()
+    for scenario, exp in get_results_cases(size):
+        assert interned.get_results(**scenario) == exp
+        # a shared roster gives the same results
+        assert interned.get_results(**scenario, roster=roster) == exp
+    assert len(roster) <= size
+
+
+def test_get_results(example_scenario):
+    scenario, exp = example_scenario
+    rm_tally, pool = interned.get_results(**scenario)
+    assert (rm_tally, pool) == exp
+    assert all(isinstance(c, int) and isinstance(m, str) for c, m in rm_tally)
+
+
+def test_get_results_unknown_next_release_manager():
+    roster = interned.Roster(["dewey"])
+    with pytest.raises(KeyError):
+        interned.get_results({"huey": 0}, {}, ["dewey"], [], [], roster=roster)
+    with pytest.raises(KeyError):
+        interned.get_results({"huey": 0}, {}, ["louie"], [], [], roster=roster)
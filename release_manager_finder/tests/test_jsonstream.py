@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import json
+
+import pytest
+
+from .. import jsonstream
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 4096])
+def test_iter_array(size):
+    array = [
+        {"tag_name": "2023.01", "author": {"login": "huey"}, "body": "ü" * 100},
+        [1, 2.5, -3e2],
+        'string with ] and , and " escapes',
+        12345,
+        None,
+        True,
+        {},
+    ]
+    data = json.dumps(array, indent=2, ensure_ascii=False).encode()
+    assert list(jsonstream.iter_array(chunked(data, size))) == array
+
+
+@pytest.mark.parametrize("data", [b"[]", b"  [ ]  ", b"[\n]"])
+def test_iter_array_empty(data):
+    assert not list(jsonstream.iter_array([data]))
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"{}", b"[1,", b"[1 2]", b"[1,]", b"[,1]", b'["abc', b"[1"]
+)
+def test_iter_array_invalid(data):
+    with pytest.raises(json.JSONDecodeError):
+        list(jsonstream.iter_array(chunked(data, 2)))
+
+
+def test_project():
+    release = {
+        "tag_name": "2023.01",
+        "author": {"login": "huey", "id": 1, "type": "User"},
+        "assets": [{"name": "riot.tar.gz"}],
+        "body": "Release notes",
+    }
+    assert jsonstream.project(release, ["tag_name", "author.login"]) == {
+        "tag_name": "2023.01",
+        "author": {"login": "huey"},
+    }
+    assert not jsonstream.project(release, ["author.name.first", "foobar"])
+    assert jsonstream.project(release, ["author"]) == {"author": release["author"]}
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+
+from .. import prefix
+
+LOGINS = ["huey", "dewey", "Louie", "dewdrop", "DonaldDuck", "donald", "dewey"]
+
+
+@pytest.mark.parametrize(
+    "query, exp",
+    [
+        ("", ["dewdrop", "dewey", "donald", "DonaldDuck", "huey", "Louie"]),
+        ("d", ["dewdrop", "dewey", "donald", "DonaldDuck"]),
+        ("DONALD", ["donald", "DonaldDuck"]),
+        ("dewey", ["dewey"]),
+        ("deweys", []),
+        ("z", []),
+    ],
+)
+def test_prefix_index_search(query, exp):
+    index = prefix.PrefixIndex(LOGINS)
+    assert len(index) == 6
+    assert index.search(query) == (len(exp), exp)
+    assert index.search(query, offset=1, limit=2) == (len(exp), exp[1:3])
+
+
+def test_prefix_index_contains():
+    index = prefix.PrefixIndex(LOGINS)
+    # like the search, ignoring case
+    assert "Louie" in index
+    assert "louie" in index
+    assert index.get("LOUIE") == "Louie"
+    assert "scrooge" not in index
+    assert index.get("scrooge", "scrooge") == "scrooge"
+    assert "lou" not in index
+    assert "" not in prefix.PrefixIndex()
+
+
+def test_prefix_index_max_unicode():
+    top = chr(0x10FFFF)
+    index = prefix.PrefixIndex(["a", f"a{top}", f"a{top}{top}b", "b", top, top * 2])
+    assert index.search(f"a{top}") == (2, [f"a{top}", f"a{top}{top}b"])
+    assert index.search(f"a{top}{top}") == (1, [f"a{top}{top}b"])
+    assert index.search(top) == (2, [top, top * 2])
+    assert index.search(top * 3) == (0, [])
@@ -9,26 +9,32 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
 
-import argparse
+import datetime
+import io
+import json
 import os
 import re
 
 import agithub.GitHub
 import pytest
 
+import release_manager_finder
 from .. import (
     GITHUB_ORGA,
     GITHUB_REPO,
     GitHubError,
     get_maintainers,
     get_past_release_managers,
+    get_all_pages,
     get_attendees_list,
     get_opt_out_list,
+    github_client,
     filter_out_opt_out,
     sort_by_release_management,
     least_managing,
     parse_args,
     print_results,
+    read_roster_file,
     update_next_release_managers,
     main,
 )
@@ -63,37 +69,119 @@ def test_get_maintainers(mocker):
     assert maintainers == {"foobar": 0, "owner": 0, "snafu": 0}
 
 
+def test_github_client():
+    github = github_client("foobar", timeout=2.5, sleep_on_ratelimit=False)
+    assert github.client.paginate
+    assert not github.client.sleep_on_ratelimit
+    assert github.client.get_connection().timeout == 2.5
+    github = github_client(timeout=None)
+    assert "get_connection" not in vars(github.client)
+
+
+def mock_connection(mocker, status, body, headers=()):
+    response = mocker.MagicMock(status=status)
+    response.read = io.BytesIO(body.encode()).read
+    response.getheaders.return_value = [
+        ("Content-Type", "application/json; charset=utf-8"),
+        *headers,
+    ]
+    response.getheader.return_value = "application/json; charset=utf-8"
+    connection = mocker.patch("agithub.GitHub.GitHubClient.get_connection")
+    connection.return_value.getresponse.return_value = response
+    return connection.return_value
+
+
 def test_get_past_release_managers_success(mocker, github):
-    mocked_request = mocker.patch(
-        "agithub.GitHub.GitHubClient.request",
-        return_value=(
-            200,
-            [
-                {"tag_name": "2015.09", "author": {"login": "OlegHahm"}},
-                {"tag_name": "2016.07", "author": {"login": "miri64"}},
-                {"tag_name": "2016.10", "author": {"login": "miri64"}},
-                {"tag_name": "2020.07", "author": {"login": "miri64"}},
-                {"tag_name": "2020.07.1", "author": {"login": "miri64"}},
-            ],
-        ),
-    )
+    releases = [
+        {"tag_name": "2015.09", "author": {"login": "OlegHahm"}},
+        {"tag_name": "2016.07", "author": {"login": "miri64"}},
+        {"tag_name": "2016.10", "author": {"login": "miri64"}},
+        {"tag_name": "2020.07", "author": {"login": "miri64"}},
+        {"tag_name": "2020.07.1", "author": {"login": "miri64"}},
+    ]
+    for release in releases:
+        release["body"] = "Release notes " * 10000
+        release["assets"] = [{"name": "riot.tar.gz", "size": 12345}]
+    mocker.patch.object(release_manager_finder, "STREAM_CHUNK_SIZE", 4096)
+    connection = mock_connection(mocker, 200, json.dumps(releases))
     maintainers = get_past_release_managers(github)
     assert maintainers == {"kYc0o": 1, "miri64": 2, "OlegHahm": 5}
-    mocked_request.assert_called_once_with(
-        "GET", f"/repos/{GITHUB_ORGA}/{GITHUB_REPO}/releases", None, {}
+    connection.request.assert_called_once_with(
+        "GET",
+        f"/repos/{GITHUB_ORGA}/{GITHUB_REPO}/releases",
+        None,
+        github.client.default_headers,
     )
 
 
 def test_get_past_release_managers_error(mocker, github):
-    mocked_request = mocker.patch(
-        "agithub.GitHub.GitHubClient.request", return_value=(400, "Error snafu")
-    )
+    connection = mock_connection(mocker, 400, '"Error snafu"')
     with pytest.raises(GitHubError) as exc:
         get_past_release_managers(github)
     assert str(exc.value) == "Error snafu"
-    mocked_request.assert_called_once_with(
-        "GET", f"/repos/{GITHUB_ORGA}/{GITHUB_REPO}/releases", None, {}
+    connection.request.assert_called_once()
+    connection.close.assert_called_once()
+
+
+def test_get_past_release_managers_ratelimit(mocker, github):
+    limited = mocker.MagicMock(status=403)
+    limited.read.return_value = b'{"message": "API rate limit exceeded"}'
+    limited.getheaders.return_value = [("X-RateLimit-Remaining", "0")]
+    limited.getheader.return_value = "application/json; charset=utf-8"
+    connection = mock_connection(
+        mocker,
+        200,
+        json.dumps([{"tag_name": "2015.09", "author": {"login": "OlegHahm"}}]),
+    )
+    ok = connection.getresponse.return_value
+    connection.getresponse.side_effect = [limited, ok]
+    sleep = mocker.patch("agithub.GitHub.GitHubClient.sleep_until_more_ratelimit")
+    assert get_past_release_managers(github) == {"OlegHahm": 5}
+    sleep.assert_called_once_with()
+    assert connection.request.call_count == 2
+
+    github.client.sleep_on_ratelimit = False
+    github.client.headers = None
+    connection.getresponse.side_effect = [limited]
+    with pytest.raises(GitHubError, match="API rate limit exceeded"):
+        get_past_release_managers(github)
+    sleep.assert_called_once_with()
+
+
+def test_get_all_pages(mocker, github):
+    url = "https://api.github.com/repositories/1/releases"
+
+    def request(self, method, page_url, body, headers):
+        # pylint: disable=unused-argument
+        page = int(page_url.rpartition("page=")[2]) if "page=" in page_url else 1
+        self.headers = [
+            ("Link", f'<{url}?page=2>; rel="next", <{url}?page=4>; rel="last"')
+        ]
+        return 200, [f"release {page}.{i}" for i in range(2)]
+
+    mocked_request = mocker.patch(
+        "agithub.GitHub.GitHubClient.request", autospec=True, side_effect=request
     )
+    assert get_all_pages(github, "/releases", max_concurrent_pages=2) == [
+        f"release {page}.{i}" for page in range(1, 5) for i in range(2)
+    ]
+    assert sorted(call.args[2] for call in mocked_request.call_args_list) == [
+        "/releases",
+        f"{url}?page=2",
+        f"{url}?page=3",
+        f"{url}?page=4",
+    ]
+    # headers of the concurrent requests are not mixed up in the shared client
+    assert github.client.headers is None
+
+    def request_error(self, method, page_url, body, headers):
+        if "page=3" in page_url:
+            return 502, "Bad gateway"
+        return request(self, method, page_url, body, headers)
+
+    mocked_request.side_effect = request_error
+    with pytest.raises(GitHubError, match="Bad gateway"):
+        get_all_pages(github, "/releases")
 
 
 def test_update_next_release_managers():
@@ -132,17 +220,34 @@ def test_get_attendees_list(mocker):
         "release_manager_finder.open",
         mocker.mock_open(read_data="huey\n   dewey\n louie  "),
     )
-    attendees_list = get_attendees_list(argparse.Namespace(attendees_list="test"))
+    attendees_list = get_attendees_list(attendees_filename="test")
     assert attendees_list == ["huey", "dewey", "louie"]
 
     mocker.patch(
         "release_manager_finder.open",
         mocker.mock_open(read_data="huey\n  \n   # donald  \n  dewey\n louie  "),
     )
-    attendees_list = get_attendees_list(argparse.Namespace(attendees_list="test"))
+    attendees_list = get_attendees_list(attendees_filename="test")
     assert attendees_list == ["huey", "dewey", "louie"]
 
 
+def test_read_roster_file(mocker, tmp_path):
+    roster_file = tmp_path / "roster"
+    roster_file.write_text("huey\n# donald\ndewey\n", encoding="utf-8")
+    parse = mocker.spy(release_manager_finder, "_parse_roster_file")
+    assert read_roster_file(str(roster_file)) == ["huey", "dewey"]
+    assert read_roster_file(str(roster_file)) == ["huey", "dewey"]
+    # unchanged file is only parsed once
+    assert parse.call_count == 1
+
+    roster_file.write_text("huey\ndewey\nlouie\n", encoding="utf-8")
+    assert read_roster_file(str(roster_file)) == ["huey", "dewey", "louie"]
+    assert parse.call_count == 2
+    assert get_opt_out_list(str(roster_file)) == ["huey", "dewey", "louie"]
+    assert get_attendees_list(str(roster_file)) == ["huey", "dewey", "louie"]
+    assert parse.call_count == 2
+
+
 def test_filter_out_opt_out():
     maintainers = [(0, "foobar"), (0, "huey"), (0, "test"), (0, "louie")]
     opt_out_list = ["huey", "dewey", "louie"]
@@ -173,7 +278,7 @@ def test_least_managing():
     assert least_managing(maintainers, current_maintainers) == [(1, "foobar")]
 
 
-def test_parse_args(mocker):
+def test_parse_args(mocker, capsys):
     mocker.patch("sys.argv", ["command", "-t", "test_token", "test_attendees_list"])
     args = parse_args()
     assert args.gh_token == "test_token"
@@ -188,6 +293,51 @@ def test_parse_args(mocker):
     assert args.gh_token == "test_token"
     assert args.opt_out_list == "test_opt_out_list"
     assert args.attendees_list == "test_attendees_list"
+    assert args.batch is None
+    assert args.since is None
+    assert args.until is None
+
+    mocker.patch(
+        "sys.argv",
+        ["command", "--since", "2020-01-01", "--until", "2021-07-01", "attendees"],
+    )
+    args = parse_args()
+    assert args.since == datetime.date(2020, 1, 1)
+    assert args.until == datetime.date(2021, 7, 1)
+
+    mocker.patch("sys.argv", ["command", "-b", "scenarios", "-f", "csv"])
+    args = parse_args()
+    assert args.opt_out_list is None
+    assert args.attendees_list is None
+    assert args.batch == "scenarios"
+    assert args.format == "csv"
+
+    mocker.patch("sys.argv", ["command", "opt-out", "-b", "scenarios"])
+    args = parse_args()
+    assert args.opt_out_list == "opt-out"
+    assert args.attendees_list is None
+
+    mocker.patch("sys.argv", ["command", "-t", "test_token"])
+    with pytest.raises(SystemExit):
+        parse_args()
+    assert "required: attendees_list" in capsys.readouterr().err
+
+    mocker.patch("sys.argv", ["command", "-k", "3", "attendees"])
+    assert parse_args().releases == 3
+    mocker.patch("sys.argv", ["command", "-a", "6", "attendees"])
+    assert parse_args().active_months == 6
+    for argv in (
+        ["-k", "0"],
+        ["-k", "2", "-w"],
+        ["-k", "2", "-b", "scenarios"],
+        ["-a", "0"],
+        ["-a", "6", "-b", "scenarios"],
+        ["-w", "-b", "scenarios"],
+        ["-b", "scenarios", "opt-out"],
+    ):
+        mocker.patch("sys.argv", ["command", *argv, "attendees"])
+        with pytest.raises(SystemExit):
+            parse_args()
 
 
 def test_print_results(mocker, capsys):
@@ -264,6 +414,111 @@ def opt_out_list(tmp_path):
     return str(output)
 
 
+def test_print_results_weighted(mocker, capsys):
+    sampler = mocker.Mock(probability=[0.25, 0.75].__getitem__)
+    sampler.draw.return_value = "dewey"
+    print_results(
+        [(1, "huey"), (2, "dewey")], [], [], [(1, "huey"), (2, "dewey")], sampler
+    )
+    captured = capsys.readouterr()
+    assert captured.out.endswith(
+        """Selection pool
+==============
+  1	 25.0%	huey
+  2	 75.0%	dewey
+
+
+The next release manager is: dewey
+"""
+    )
+
+
+def test_weighted_main(mocker, capsys):
+    mocker.patch(
+        "sys.argv",
+        ["command", "-w", "--since", "2020-01-01", "-n", "huey", "attendees"],
+    )
+    mocker.patch(
+        "release_manager_finder.open",
+        mocker.mock_open(read_data="huey\ndewey\nlouie"),
+    )
+    mocker.patch.object(
+        release_manager_finder,
+        "get_maintainers",
+        return_value={"huey": 0, "dewey": 0, "louie": 0},
+    )
+    mocker.patch.object(
+        release_manager_finder,
+        "get_past_releases",
+        return_value=[
+            {
+                "tag_name": "2020.07",
+                "author": {"login": "dewey"},
+                "published_at": "2020-07-17T10:00:00Z",
+            },
+        ],
+    )
+    main()
+    captured = capsys.readouterr()
+    lines = captured.out[captured.out.index("Selection pool") :].splitlines()
+    pool = [line.split("\t") for line in lines[2:5]]
+    assert [(count.strip(), login) for count, _, login in pool] == [
+        ("0", "louie"),
+        ("1", "dewey"),
+        ("1", "huey"),
+    ]
+    probabilities = [float(p.strip(" %")) for _, p, _ in pool]
+    assert sum(probabilities) == pytest.approx(100, abs=0.2)
+    # louie never managed a release, dewey managed one in 2020, and huey manages
+    # the upcoming one
+    assert probabilities[0] > probabilities[1] > probabilities[2] == 0
+    assert lines[-1].startswith("The next release manager is: ")
+
+
+def test_multi_release_main(mocker, capsys):
+    mocker.patch("sys.argv", ["command", "-k", "3", "attendees"])
+    mocker.patch("random.choice", lambda seq: seq[0])
+    mocker.patch(
+        "release_manager_finder.open",
+        mocker.mock_open(read_data="huey\ndewey"),
+    )
+    mocker.patch.object(
+        release_manager_finder,
+        "get_maintainers",
+        return_value={"huey": 0, "dewey": 0, "louie": 0},
+    )
+    mocker.patch.object(
+        release_manager_finder, "get_release_tally", return_value={"dewey": 1}
+    )
+    main()
+    captured = capsys.readouterr()
+    assert captured.out.endswith(
+        """Selection pool for release 1
+============================
+  0\thuey
+  1\tdewey
+
+The release manager of release 1 is: huey
+
+
+Selection pool for release 2
+============================
+  1\tdewey
+  1\thuey
+
+The release manager of release 2 is: dewey
+
+
+Selection pool for release 3
+============================
+  1\thuey
+  2\tdewey
+
+The release manager of release 3 is: huey
+"""
+    )
+
+
 def test_main(mocker, opt_out_list, attendees_list, capsys):
     mocker.patch(
         "sys.argv",
@@ -321,3 +576,11 @@ def test_no_selection_pool(mocker, opt_out_list, attendees_list, capsys):
             if "Selection pool is empty!" == line.strip():
                 found_line = True
     assert found_line
+
+
+def test_import_time(import_time):
+    report = import_time("release_manager_finder")
+    assert "release_manager_finder" in report
+    # heavy dependencies are only imported once they are needed
+    assert not any(m.startswith("bs4") for m in report)
+    assert not any(m.startswith("agithub") for m in report)
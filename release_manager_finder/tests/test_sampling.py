@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import collections
+import datetime
+import random
+
+import pytest
+
+from .. import sampling
+
+
+@pytest.mark.parametrize(
+    "weights", [[1, 1, 1, 1], [1, 2, 3, 4], [0, 5, 0.5, 0.25], [1e-9, 1, 1e9, 3]]
+)
+def test_alias_table(weights):
+    table = sampling.AliasTable("abcd", weights)
+    assert len(table) == 4
+    assert sum(table.probability(i) for i in range(4)) == pytest.approx(1)
+    # the probability of every item summed over all columns of the table
+    columns = [0.0] * 4
+    for i, (probability, alias) in enumerate(zip(table.probabilities, table.aliases)):
+        columns[i] += probability / 4
+        columns[alias] += (1 - probability) / 4
+    for i in range(4):
+        assert columns[i] == pytest.approx(table.probability(i))
+
+
+def test_alias_table_draw():
+    table = sampling.AliasTable(["huey", "dewey", "louie"], [1, 2, 0])
+    rng = random.Random(42)
+    draws = collections.Counter(table.draw(rng) for _ in range(30_000))
+    assert draws["louie"] == 0
+    assert draws["dewey"] / draws["huey"] == pytest.approx(2, rel=0.05)
+
+
+@pytest.mark.parametrize(
+    "items, weights, exception",
+    [
+        ([], [], IndexError),
+        (["huey"], [1, 2], ValueError),
+        (["huey", "dewey"], [0, 0], ValueError),
+        (["huey", "dewey"], [-1, 2], ValueError),
+    ],
+)
+def test_alias_table_invalid(items, weights, exception):
+    with pytest.raises(exception):
+        sampling.AliasTable(items, weights)
+
+
+def test_selection_weights():
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    pool = [(1, "huey"), (1, "dewey"), (2, "louie"), (3, "donald")]
+    last_releases = {
+        "huey": now - datetime.timedelta(days=2 * 365.25),
+        "louie": now - datetime.timedelta(days=10 * 365.25),
+        "donald": now,
+    }
+    weights = sampling.selection_weights(pool, last_releases, now)
+    assert weights[0] == pytest.approx(0.5)
+    assert weights[1] == 1
+    assert weights[2] == pytest.approx(0.5 * (1 - 0.5**5))
+    assert weights[3] == 0
+    assert not sampling.selection_weights([])
+    # everyone just managed a release
+    assert sampling.selection_weights(pool[2:], last_releases, now)[1] == 0
+    assert sampling.selection_weights(pool[3:], last_releases, now) == pytest.approx(
+        [1]
+    )
+
+
+def test_weighted_sampler():
+    sampler = sampling.weighted_sampler([(0, "huey"), (1, "dewey")])
+    assert sampler.items == ["huey", "dewey"]
+    assert sampler.probability(0) == pytest.approx(2 / 3)
+
+
+def test_weighted_sampler_next_release_managers():
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    pool = [(1, "huey"), (1, "dewey"), (1, "louie")]
+    last_releases = {"huey": now - datetime.timedelta(days=730)}
+    sampler = sampling.weighted_sampler(pool, last_releases, now, ["dewey"])
+    # dewey manages the upcoming release, so they are not drawn for the next
+    assert sampler.probability(1) == 0
+    assert sampler.probability(2) > sampler.probability(0) > 0
@@ -11,6 +11,7 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
 
+import asyncio
 import http.cookies
 import json
 import os
@@ -31,7 +32,18 @@ from .. import web  # noqa: E402 pylint: disable=wrong-import-position
 __author__ = "Martine S. Lenders <martine.lenders@tu-dresden.de>"
 
 
-def test_base_handler_no_cookie(mocker):
+def releases_of(tally):
+    """Releases as returned by the GitHub API that add up to ``tally``"""
+    tags = (f"{year}.01" for year in range(2000, 3000))
+    return [
+        {"tag_name": next(tags), "author": {"login": login}}
+        for login, count in tally.items()
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_base_handler_no_cookie(mocker):
     called = {"redirect": False}
 
     def redirect(self, url):
@@ -42,7 +54,8 @@ def test_base_handler_no_cookie(mocker):
     mocker.patch.object(web.BaseHandler, "get_signed_cookie", lambda self, x: None)
 
     handler = web.BaseHandler(web.make_app([]), mocker.Mock())
-    assert not handler.get_current_user()
+    await handler.prepare()
+    assert not handler.current_user
     assert not called["redirect"]
 
 
@@ -56,7 +69,7 @@ def teams_mock(mocker):
                         "owners": mocker.MagicMock(
                             members={
                                 "huey": mocker.MagicMock(
-                                    get=mocker.MagicMock(return_value=(200, "x"))
+                                    get=mocker.MagicMock(return_value=(204, ""))
                                 ),
                                 "dewey": mocker.MagicMock(
                                     get=mocker.MagicMock(return_value=(404, "x"))
@@ -80,7 +93,8 @@ def teams_mock(mocker):
     )
 
 
-def test_base_handler_user_is_maintainer(mocker, teams_mock):
+@pytest.mark.asyncio
+async def test_base_handler_user_is_maintainer(mocker, teams_mock):
     called = {"redirect": False}
 
     def redirect(self, url):
@@ -95,13 +109,22 @@ def test_base_handler_user_is_maintainer(mocker, teams_mock):
         lambda self, x: '{"access_token":"foobar","login":"huey"}',
     )
 
-    handler = web.BaseHandler(web.make_app([]), mocker.Mock())
-    user = handler.get_current_user()
-    assert user["login"] == "huey"
+    app = web.make_app([])
+    handler = web.BaseHandler(app, mocker.Mock())
+    await handler.prepare()
+    assert handler.current_user["login"] == "huey"
     assert not called["redirect"]
+    # the membership is cached and not checked again
+    teams_mock.reset_mock()
+    handler = web.BaseHandler(app, mocker.Mock())
+    await handler.prepare()
+    assert handler.current_user["login"] == "huey"
+    teams_mock.assert_not_called()
+    assert "huey" in handler.settings["memberships"]
 
 
-def test_base_handler_user_is_not_maintainer(mocker, teams_mock):
+@pytest.mark.asyncio
+async def test_base_handler_user_is_not_maintainer(mocker, teams_mock):
     called = {"redirect": False}
 
     def redirect(self, url):
@@ -118,9 +141,15 @@ def test_base_handler_user_is_not_maintainer(mocker, teams_mock):
         "get_signed_cookie",
         lambda self, x: '{"access_token":"foobar","login":"dewey"}',
     )
-    user = handler.get_current_user()
-    assert user["login"] == "dewey"
+    await handler.prepare()
+    assert handler.current_user["login"] == "dewey"
     assert called["redirect"] == "not-a-maintainer?user=dewey"
+    # handlers that do not require a maintainer do not check
+    called["redirect"] = False
+    handler = web.LogoutHandler(web.make_app([]), mocker.Mock())
+    await handler.prepare()
+    assert handler.current_user["login"] == "dewey"
+    assert not called["redirect"]
 
 
 def test_base_handler_data_received(mocker):
@@ -217,10 +246,15 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
         assert response.headers["Location"] == "/"
         clear_all_cookies.assert_not_called()
 
+    def test_templates_precompiled(self):
+        loader = self._app.settings["template_loader"]
+        for template in web.TEMPLATE_PATH.glob("*.html"):
+            assert template.name in loader.templates
+
     @unittest.mock.patch.object(web.MainHandler, "current_user", True)
     @unittest.mock.patch(
         "release_manager_finder.web.get_maintainers",
-        lambda: ["huey", "dewey", "louie"],
+        lambda timeout=None: ["huey", "dewey", "louie"],
     )
     def test_root_get_default(self):
         response = self.fetch("/")
@@ -247,7 +281,7 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
     @unittest.mock.patch.object(web.MainHandler, "current_user", True)
     @unittest.mock.patch(
         "release_manager_finder.web.get_maintainers",
-        lambda: {
+        lambda timeout=None: {
             "huey": 0,
             "dewey": 0,
             "louie": 0,
@@ -256,10 +290,18 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
     def test_root_get_preselected_opt_out(self):
         opt_out = ["huey"]
 
-        def initialize_mock(self, initial_opt_out_list, gh_token=None):
+        def initialize_mock(
+            self,
+            initial_opt_out_list,
+            gh_token=None,
+            opt_out_file=None,
+            opt_out_forum=None,
+        ):
             # pylint: disable=unused-argument
             self.initial_opt_out_list = opt_out
             self.gh_token = gh_token
+            self.opt_out_file = opt_out_file
+            self.opt_out_forum = opt_out_forum
 
         with unittest.mock.patch.object(web.MainHandler, "initialize", initialize_mock):
             response = self.fetch("/")
@@ -286,6 +328,29 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
                 f'id="next-rm-{maintainer}" value="{maintainer}" />' in body
             )
 
+    @unittest.mock.patch.object(web.MainHandler, "current_user", True)
+    @unittest.mock.patch(
+        "release_manager_finder.web.get_maintainers",
+        lambda timeout: {"huey": 0, "dewey": 0},
+    )
+    def test_root_get_opt_out_file(self):
+        opt_out_file = unittest.mock.MagicMock(roster=["dewey"])
+
+        with unittest.mock.patch.dict(
+            self._app.wildcard_router.rules[0].target_kwargs,
+            {"opt_out_file": opt_out_file},
+        ):
+            response = self.fetch("/")
+            assert 'id="opt-out-dewey" value="dewey" checked />' in (
+                response.body.decode()
+            )
+            # changes to the file are picked up without restart
+            opt_out_file.roster = ["huey"]
+            response = self.fetch("/")
+        body = response.body.decode()
+        assert 'id="opt-out-huey" value="huey" checked />' in body
+        assert 'id="opt-out-dewey" value="dewey" />' in body
+
     @unittest.mock.patch.object(
         web.MainHandler, "current_user", {"access_token": "blafoo", "user": "louie"}
     )
@@ -294,7 +359,7 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
     )
     @unittest.mock.patch(
         "release_manager_finder.web.get_maintainers",
-        lambda: {
+        lambda timeout: {
             "foobar": 0,
             "huey": 0,
             "test": 0,
@@ -303,17 +368,20 @@ class TestBaseWebApp(tornado.testing.AsyncHTTPTestCase):
             "donald": 0,
         },
     )
+    @unittest.mock.patch("release_manager_finder.history.UNLISTED_RELEASES", ())
     @unittest.mock.patch(
-        "release_manager_finder.web.get_past_release_managers",
-        lambda _: {
-            "foobar": 1,
-            "huey": 2,
-            "test": 2,
-            "louie": 3,
-            "snafu": 5,
-            "scrooge": 2,
-            "donald": 2,
-        },
+        "release_manager_finder.web.get_past_releases",
+        lambda _: releases_of(
+            {
+                "foobar": 1,
+                "huey": 2,
+                "test": 2,
+                "louie": 3,
+                "snafu": 5,
+                "scrooge": 2,
+                "donald": 2,
+            }
+        ),
     )
     @unittest.mock.patch(
         "random.choice",
@@ -479,7 +547,7 @@ Only <span class="text-success">green</span> rows are considered for the list ab
     )
     @unittest.mock.patch(
         "release_manager_finder.web.get_maintainers",
-        lambda: {
+        lambda timeout: {
             "foobar": 0,
             "huey": 0,
             "test": 0,
@@ -488,17 +556,20 @@ Only <span class="text-success">green</span> rows are considered for the list ab
             "donald": 0,
         },
     )
+    @unittest.mock.patch("release_manager_finder.history.UNLISTED_RELEASES", ())
     @unittest.mock.patch(
-        "release_manager_finder.web.get_past_release_managers",
-        lambda _: {
-            "foobar": 1,
-            "huey": 2,
-            "test": 2,
-            "louie": 3,
-            "snafu": 5,
-            "scrooge": 2,
-            "donald": 2,
-        },
+        "release_manager_finder.web.get_past_releases",
+        lambda _: releases_of(
+            {
+                "foobar": 1,
+                "huey": 2,
+                "test": 2,
+                "louie": 3,
+                "snafu": 5,
+                "scrooge": 2,
+                "donald": 2,
+            }
+        ),
     )
     def test_root_post_no_selection_pool(self):
         response = self.fetch(
@@ -519,18 +590,60 @@ Only <span class="text-success">green</span> rows are considered for the list ab
         body = response.body.decode()
         assert "<h2>There is no suitable candidate 😱!</h2>" in body
 
+    @unittest.mock.patch(
+        "release_manager_finder.web.get_maintainers",
+        lambda timeout: {"huey": 0},
+    )
+    def test_ready(self):
+        response = self.fetch("/ready")
+        assert response.code == 503
+        status = json.loads(response.body)
+        assert not status["ready"]
+        assert not status["caches"]["maintainers"]["warm"]
+        assert status["caches"]["maintainers"]["age"] is None
+
+        upstream = self._app.settings["upstream"]
+        assert upstream.get("maintainers") == {"huey": 0}
+        upstream.set(
+            "release_history",
+            web.history.HistoryIndex.from_github(releases_of({"huey": 1})),
+        )
+        # the tally is derived from the history
+        assert upstream.get("past_release_managers") == {"huey": 1, "OlegHahm": 4}
+        response = self.fetch("/ready")
+        assert response.code == 200
+        status = json.loads(response.body)
+        assert status["ready"]
+        assert status["version"] == 3
+        assert status["caches"]["maintainers"]["warm"]
+        assert 0 <= status["caches"]["maintainers"]["age"] < 10
+
     def test_favicon(self):
         response = self.fetch("/favicon.svg")
         assert response.code == 200
         assert "<svg" in response.body.decode()
 
 
+def test_import_time(import_time):
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in ("CLIENT_ID", "CLIENT_SECRET", "COOKIE_SECRET")
+    }
+    # importing must neither require the secrets nor pull in the heavy
+    # dependencies only needed when handling requests
+    report = import_time("release_manager_finder.web", env=env)
+    assert "release_manager_finder.web" in report
+    assert not any(m.startswith("bs4") for m in report)
+    assert not any(m.startswith("agithub") for m in report)
+
+
 @pytest.mark.parametrize(
     "argv, exp",
     [
         pytest.param(
             ["command"],
-            {"port": 8888, "opt-out-list": [], "token": None},
+            {"port": 8888, "opt-out-list": [], "token": "the-env-token"},
             id="defaults",
         ),
         pytest.param(
@@ -538,7 +651,7 @@ Only <span class="text-success">green</span> rows are considered for the list ab
             {
                 "port": 8888,
                 "opt-out-list": ["huey", "dewey", "louie"],
-                "token": None,
+                "token": "the-env-token",
             },
             id="w/ --opt-out-list",
         ),
@@ -556,7 +669,7 @@ Only <span class="text-success">green</span> rows are considered for the list ab
             {
                 "port": 12623,
                 "opt-out-list": [],
-                "token": None,
+                "token": "the-env-token",
             },
             id="w/ --port",
         ),
@@ -564,6 +677,12 @@ Only <span class="text-success">green</span> rows are considered for the list ab
 )
 def test_main(mocker, argv, exp):
     mocker.patch("asyncio.Event.wait", mocker.AsyncMock())
+    mocker.patch.dict("os.environ", {}, clear=False)
+    os.environ.pop("SNAPSHOT_FILE", None)
+    os.environ.pop("LOOP_LAG_THRESHOLD", None)
+    os.environ.pop("CACHE_URL", None)
+    os.environ.pop("OPT_OUT_FORUM_URL", None)
+    os.environ["GITHUB_TOKEN"] = "the-env-token"
     mocker.patch("sys.argv", argv)
     make_app = mocker.MagicMock()
     mocker.patch("release_manager_finder.web.make_app", make_app)
@@ -572,10 +691,123 @@ def test_main(mocker, argv, exp):
         mocker.MagicMock(return_value=["huey", "dewey", "louie"]),
     )
     web.main()
-    make_app.assert_called_once_with(exp["opt-out-list"], exp["token"])
+    make_app.assert_called_once_with(
+        exp["opt-out-list"],
+        exp["token"],
+        opt_out_file=unittest.mock.ANY,
+        opt_out_forum=None,
+        upstream=unittest.mock.ANY,
+        memberships={},
+        loop_monitor=None,
+        shared_cache=unittest.mock.ANY,
+    )
     make_app.return_value.listen.assert_called_once_with(exp["port"])
 
 
+def test_main_no_token(mocker, capsys):
+    mocker.patch.dict("os.environ", {}, clear=False)
+    os.environ.pop("GITHUB_TOKEN", None)
+    mocker.patch("sys.argv", ["command"])
+    make_app = mocker.patch("release_manager_finder.web.make_app")
+    with pytest.raises(SystemExit):
+        web.main()
+    assert "a GitHub token is required" in capsys.readouterr().err
+    make_app.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_refresh(mocker):
+    fetch = mocker.MagicMock(side_effect=[{"huey": 0}, OSError("timeout"), {}])
+    upstream = web.prefetch.UpstreamData({"maintainers": fetch})
+    await upstream.refresh("maintainers")
+    assert upstream.get("maintainers") == {"huey": 0}
+    assert upstream.version == 1
+    with pytest.raises(OSError):
+        await upstream.refresh("maintainers")
+    # last known value is kept on failure
+    assert upstream.get("maintainers") == {"huey": 0}
+    assert upstream.status()["caches"]["maintainers"]["failures"] == 1
+    assert "timeout" in upstream.status()["caches"]["maintainers"]["error"]
+    await upstream.refresh("maintainers")
+    assert upstream.status()["caches"]["maintainers"]["failures"] == 0
+    assert upstream.version == 2
+    assert fetch.call_count == 3
+
+
+def test_prefetcher_next_delay():
+    upstream = web.prefetch.UpstreamData({"maintainers": dict})
+    prefetcher = web.prefetch.Prefetcher(
+        upstream, interval=100, retry_interval=5, jitter=0.1
+    )
+    assert 90 <= prefetcher.next_delay("maintainers") <= 110
+    for failures, backoff in [(1, 5), (2, 10), (3, 20), (6, 100), (10, 100)]:
+        upstream.entries["maintainers"].failures = failures
+        assert 0.9 * backoff <= prefetcher.next_delay("maintainers") <= 1.1 * backoff
+
+
+@pytest.mark.asyncio
+async def test_prefetcher(mocker):
+    fetched = asyncio.Event()
+    fetch = mocker.MagicMock(side_effect=[OSError("timeout"), {"huey": 0}])
+
+    def fetch_and_notify(timeout):
+        try:
+            return fetch(timeout)
+        finally:
+            if fetch.call_count == 2:
+                fetched.set()
+
+    upstream = web.prefetch.UpstreamData({"maintainers": fetch_and_notify})
+    prefetcher = web.prefetch.Prefetcher(upstream, interval=60, retry_interval=0.01)
+    prefetcher.start()
+    try:
+        await asyncio.wait_for(fetched.wait(), 5)
+        for _ in range(100):
+            if upstream.ready:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        prefetcher.stop()
+    assert upstream.ready
+    assert upstream.get("maintainers") == {"huey": 0}
+
+
+async def _wait_for_roster(roster_file, roster):
+    for _ in range(200):
+        if roster_file.roster == roster:
+            break
+        await asyncio.sleep(0.01)
+    return roster_file.roster
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("inotify", [True, False], ids=["inotify", "polling"])
+async def test_roster_file(mocker, tmp_path, inotify):
+    if not inotify:
+        mocker.patch("release_manager_finder.web.watch.inotify_init", return_value=None)
+    filename = tmp_path / "opt-out"
+    filename.write_text("huey\n", encoding="utf-8")
+    roster_file = web.watch.RosterFile(
+        str(filename), web.get_opt_out_list, poll_interval=0.01
+    )
+    assert roster_file.roster == ["huey"]
+    roster_file.start()
+    try:
+        filename.write_text("huey\ndewey\n", encoding="utf-8")
+        assert await _wait_for_roster(roster_file, ["huey", "dewey"]) == [
+            "huey",
+            "dewey",
+        ]
+        # file is temporarily gone, e.g., while an editor replaces it
+        filename.unlink()
+        roster_file.refresh()
+        assert roster_file.roster == ["huey", "dewey"]
+        filename.write_text("louie\n", encoding="utf-8")
+        assert await _wait_for_roster(roster_file, ["louie"]) == ["louie"]
+    finally:
+        roster_file.stop()
+
+
 @pytest.mark.asyncio
 async def test_github_oauth2_mixin_get_authenticated_user(mocker):
     # test default
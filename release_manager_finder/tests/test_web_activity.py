@@ -0,0 +1,94 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import unittest.mock
+import urllib.parse
+
+from .. import GitHubError, web
+from .webapp import WebAppTestCase
+
+INPUTS = urllib.parse.urlencode(
+    [("attendees", "huey"), ("attendees", "dewey"), ("attendees", "louie")]
+)
+
+
+@unittest.mock.patch.object(web.MainHandler, "current_user", True)
+@unittest.mock.patch.object(
+    web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+)
+class TestActivity(WebAppTestCase):
+    def get_app(self):
+        return self.web_app(
+            {
+                "maintainers": dict.fromkeys(["huey", "dewey", "louie"], 0),
+                "past_release_managers": {"huey": 1},
+            }
+        )
+
+    def test_root_get_active_checkbox(self):
+        body = self.fetch("/").body.decode()
+        assert 'name="active" type="checkbox"' in body
+        assert "in the last 12 months" in body
+
+    def test_root_post_active(self):
+        with unittest.mock.patch.object(
+            web.activity,
+            "get_activity",
+            side_effect=lambda github, logins, since: {
+                login: login != "dewey" for login in logins
+            },
+        ) as get_activity:
+            response = self.fetch("/", method="POST", body=INPUTS + "&active=1")
+            assert response.code == 200
+            body = response.body.decode()
+            # dewey would be the only one in the pool if active
+            assert "Congratulation" in body
+            assert "<tt>@dewey</tt>" not in body.split("Total Release")[0]
+            assert "count as opted out: <tt>@dewey</tt>" in body
+            ((_, logins, _),) = [c.args for c in get_activity.call_args_list]
+            assert logins == ["dewey", "huey", "louie"]
+            # the activity is cached per login
+            response = self.fetch("/", method="POST", body=INPUTS + "&active=1")
+            assert response.code == 200
+            get_activity.assert_called_once()
+            assert self.fetch("/", method="POST", body=INPUTS).code == 200
+            get_activity.assert_called_once()
+
+    def test_root_post_active_unknown(self):
+        with unittest.mock.patch.object(
+            web.activity,
+            "get_activity",
+            side_effect=lambda github, logins, since: dict.fromkeys(logins),
+        ) as get_activity:
+            response = self.fetch("/", method="POST", body=INPUTS + "&active=1")
+            assert response.code == 200
+            assert "count as opted out" not in response.body.decode()
+            # unknown activity is not cached
+            self.fetch("/", method="POST", body=INPUTS + "&active=1")
+            assert get_activity.call_count == 2
+
+    def test_token(self):
+        handler = web.MainHandler(
+            self._app, unittest.mock.Mock(), initial_opt_out_list=[], gh_token="srv"
+        )
+        assert handler.token == "srv"
+        handler.gh_token = None
+        with unittest.mock.patch.object(
+            web.MainHandler, "current_user", {"login": "huey", "access_token": "usr"}
+        ):
+            # without a token of the server, the one of the user is used
+            assert handler.token == "usr"
+
+    def test_root_post_active_unavailable(self):
+        with unittest.mock.patch.object(
+            web.activity, "get_activity", side_effect=GitHubError("rate limit")
+        ):
+            response = self.fetch("/", method="POST", body=INPUTS + "&active=1")
+        assert response.code == 503
@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+import unittest.mock
+
+import pytest
+
+from .. import web
+from ..web import admission
+from .webapp import WebAppTestCase
+
+
+@pytest.mark.asyncio
+async def test_admission_control():
+    control = admission.AdmissionControl(limit=2, queue_size=1)
+    await control.acquire()
+    await control.acquire()
+    assert control.active == 2
+    queued = asyncio.create_task(control.acquire())
+    await asyncio.sleep(0)
+    assert control.queued == 1
+    with pytest.raises(admission.Overloaded):
+        await control.acquire()
+    control.release()
+    await queued
+    # the slot was handed over to the queued request
+    assert control.active == 2
+    assert control.queued == 0
+    control.release()
+    control.release()
+    assert control.active == 0
+    stats = control.stats()
+    assert stats["admitted"] == 3
+    assert stats["rejected"] == 1
+    assert stats["queue_time"]["max"] > 0
+
+
+@pytest.mark.asyncio
+async def test_admission_control_timeout():
+    control = admission.AdmissionControl(limit=1, queue_size=2, queue_timeout=0.01)
+    await control.acquire()
+    with pytest.raises(admission.Overloaded):
+        await control.acquire()
+    assert control.queued == 0
+    assert control.stats()["timed_out"] == 1
+    # cancelled waiters leave the queue as well
+    cancelled = asyncio.create_task(control.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert control.queued == 0
+    control.release()
+    assert control.active == 0
+
+
+class TestAdmission(WebAppTestCase):
+    def get_app(self):
+        return self.web_app({"maintainers": {}, "past_release_managers": {}})
+
+    @unittest.mock.patch.object(web.MainHandler, "current_user", True)
+    @unittest.mock.patch.object(
+        web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+    )
+    def test_root_post_overloaded(self):
+        control = self._app.settings["admission"]["main"]
+        control.limit = 0
+        control.queue_size = 0
+        response = self.fetch("/", method="POST", body="")
+        assert response.code == 503
+        assert response.headers["Retry-After"] == str(control.retry_after)
+        response = self.fetch("/metrics")
+        assert response.code == 200
+        stats = json.loads(response.body)["admission"]["main"]
+        assert stats["rejected"] == 1
+        assert stats["admitted"] == 0
@@ -0,0 +1,288 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import json
+import unittest.mock
+import urllib.parse
+
+from .. import web
+from .webapp import WebAppTestCase
+
+INPUTS = (
+    [("next-rm", "foobar")]
+    + [("opt-out", m) for m in ["huey", "dewey", "louie", "dewey"]]
+    + [("attendees", m) for m in ["louie", "dewey", "foobar", "donald"]]
+)
+
+
+@unittest.mock.patch.object(web.api.ResultsHandler, "current_user", True)
+class TestAPI(WebAppTestCase):
+    def get_app(self):
+        return self.web_app(
+            {
+                "maintainers": dict.fromkeys(
+                    ["foobar", "huey", "test", "dewey", "louie", "donald"], 0
+                ),
+                "past_release_managers": {
+                    **dict.fromkeys(["huey", "test", "scrooge", "donald"], 2),
+                    **{"foobar": 1, "louie": 3, "snafu": 5},
+                },
+            }
+        )
+
+    def get_json(self, path, inputs=None, etag=None):
+        response = self.fetch(
+            f"{path}?{urllib.parse.urlencode(inputs or INPUTS)}",
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        return response, json.loads(response.body) if response.body else None
+
+    def test_tally(self):
+        response, data = self.get_json("/api/tally")
+        assert response.code == 200
+        assert response.headers["Content-Type"].startswith("application/json")
+        assert data == {
+            "tally": [
+                [0, "dewey"],
+                [2, "donald"],
+                [2, "foobar"],
+                [2, "huey"],
+                [2, "scrooge"],
+                [2, "test"],
+                [3, "louie"],
+                [5, "snafu"],
+            ],
+            "maintainers": ["dewey", "donald", "foobar", "huey", "louie", "test"],
+            "opt_out": ["dewey", "huey", "louie"],
+            "attendees": ["dewey", "donald", "foobar", "louie"],
+        }
+
+    def test_selection(self):
+        response, data = self.get_json("/api/selection")
+        assert response.code == 200
+        assert data == {"selection_pool": [[2, "donald"], [2, "foobar"]]}
+        response, data = self.get_json("/api/selection", [("next-rm", "nobody")])
+        assert response.code == 400
+        assert data == {"error": "Unknown next release manager 'nobody'"}
+
+    def test_etag(self):
+        response, _ = self.get_json("/api/selection")
+        etag = response.headers["Etag"]
+        response, data = self.get_json("/api/selection", etag=etag)
+        assert response.code == 304
+        assert data is None
+        # same inputs in a different order
+        response, _ = self.get_json("/api/selection", INPUTS[::-1][:-1], etag=etag)
+        assert response.code == 200
+        response, _ = self.get_json("/api/selection", INPUTS[1:] + INPUTS[:1], etag)
+        assert response.code == 304
+        # other endpoint
+        response, _ = self.get_json("/api/tally", etag=etag)
+        assert response.code == 200
+
+        upstream = self._app.settings["upstream"]
+        # unchanged data does not invalidate
+        upstream.set("maintainers", dict(upstream.get("maintainers")))
+        response, _ = self.get_json("/api/selection", etag=etag)
+        assert response.code == 304
+        upstream.update("past_release_managers", lambda t: {**t, "donald": 3})
+        response, data = self.get_json("/api/selection", etag=etag)
+        assert response.code == 200
+        assert response.headers["Etag"] != etag
+        assert data == {"selection_pool": [[2, "foobar"], [3, "donald"]]}
+
+    def test_etag_across_instances(self):
+        response, _ = self.get_json("/api/selection")
+        etag = response.headers["Etag"]
+        # e.g. after a restart or on another instance behind a load balancer
+        upstream = self._app.settings["upstream"]
+        restarted = web.prefetch.UpstreamData(
+            {name: entry.fetch for name, entry in upstream.entries.items()}
+        )
+        restarted.version = upstream.version + 3
+        self._app.settings["upstream"] = restarted
+        response, _ = self.get_json("/api/selection", etag=etag)
+        assert response.code == 304
+        restarted.update("maintainers", lambda m: {**m, "scrooge": 0})
+        response, _ = self.get_json("/api/selection", etag=etag)
+        assert response.code == 200
+
+    def test_upstream_unavailable(self):
+        upstream = self._app.settings["upstream"]
+        upstream.entries["maintainers"].fetch = unittest.mock.Mock(
+            side_effect=OSError("timeout")
+        )
+        response, data = self.get_json("/api/selection")
+        assert response.code == 503
+        assert "maintainers" in data["error"]
+
+    def test_results_login(self):
+        with unittest.mock.patch.object(web.api.ResultsHandler, "current_user", None):
+            for path in ["/api/tally", "/api/selection"]:
+                response = self.fetch(path, follow_redirects=False)
+                assert response.code == 302
+                assert response.headers["Location"].startswith("/login?next=")
+
+    def test_results_overloaded(self):
+        self._app.settings["admission"]["main"] = web.admission.AdmissionControl(
+            limit=0, queue_size=0
+        )
+        response = self.fetch("/api/tally")
+        assert response.code == 503
+        assert response.headers["Retry-After"] == "5"
+
+    def test_results_offloaded(self):
+        with unittest.mock.patch.object(
+            web.api.offload, "run", wraps=web.api.offload.run
+        ) as run:
+            response, _ = self.get_json("/api/selection")
+        assert response.code == 200
+        run.assert_called_once()
+        assert run.call_args.args[:2] == (
+            self._app.settings["executor"],
+            web.interned.get_results,
+        )
+
+    def test_maintainer_search(self):
+        response, data = self.get_json("/api/maintainers", [("q", "@D")])
+        assert response.code == 200
+        assert data == {"total": 2, "offset": 0, "maintainers": ["dewey", "donald"]}
+        etag = response.headers["Etag"]
+        response, _ = self.get_json("/api/maintainers", [("q", "d")], etag=etag)
+        assert response.code == 200
+        response, _ = self.get_json("/api/maintainers", [("q", "@D")], etag=etag)
+        assert response.code == 304
+        _, data = self.get_json("/api/maintainers", [("offset", 1), ("limit", 2)])
+        assert data == {"total": 6, "offset": 1, "maintainers": ["donald", "foobar"]}
+        _, data = self.get_json("/api/maintainers", [("offset", 10)])
+        assert data == {"total": 6, "offset": 10, "maintainers": []}
+        response, data = self.get_json("/api/maintainers", [("limit", "all")])
+        assert response.code == 400
+        assert data == {"error": "limit must be an integer"}
+        response, data = self.get_json("/api/maintainers", [("offset", -1)])
+        assert response.code == 400
+
+    @unittest.mock.patch.object(web.MainHandler, "current_user", True)
+    @unittest.mock.patch.object(web.api, "PAGE_SIZE", 2)
+    def test_form_first_page(self):
+        with unittest.mock.patch.dict(
+            self._app.wildcard_router.rules[0].target_kwargs,
+            {"initial_opt_out_list": ["Test", "nobody"]},
+        ):
+            response = self.fetch("/")
+        body = response.body.decode()
+        assert response.code == 200
+        assert body.count(' name="attendees"') == 2
+        assert 'id="attending-dewey"' in body
+        assert 'id="attending-donald"' in body
+        # opted out maintainers are always rendered, spelled as on GitHub
+        assert body.count(' name="opt-out"') == 3
+        assert 'id="opt-out-test" value="test" checked />' in body
+        assert "nobody" not in body
+        assert body.count('class="form-control mb-2 picker-search"') == 3
+
+    def post_scenarios(self, payload):
+        response = self.fetch(
+            "/api/scenarios",
+            method="POST",
+            body=payload if isinstance(payload, str) else json.dumps(payload),
+        )
+        return response, json.loads(response.body)
+
+    @unittest.mock.patch("random.choice", lambda seq: seq[0])
+    @unittest.mock.patch.object(web.api.ScenariosHandler, "current_user", True)
+    @unittest.mock.patch.object(
+        web.api.ScenariosHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+    )
+    def test_scenarios(self):
+        response, data = self.post_scenarios(
+            {
+                "next_release_managers": ["dewey"],
+                "scenarios": [
+                    {"name": "all", "attendees": ["dewey", "donald", "foobar"]},
+                    {"attendees": ["donald", "foobar"], "opt_out": ["donald"]},
+                    {"attendees": ["huey"], "next_release_managers": ["huey"]},
+                    {"attendees": ["nobody"]},
+                ],
+            }
+        )
+        assert response.code == 200
+        assert data == {
+            "scenarios": [
+                {
+                    "scenario": "all",
+                    "selection_pool": [[1, "dewey"], [1, "foobar"]],
+                    "next_release_manager": "dewey",
+                },
+                {
+                    "scenario": "2",
+                    "selection_pool": [[1, "foobar"]],
+                    "next_release_manager": "foobar",
+                },
+                {
+                    "scenario": "3",
+                    "selection_pool": [[3, "huey"]],
+                    "next_release_manager": "huey",
+                },
+                {"scenario": "4", "selection_pool": [], "next_release_manager": None},
+            ]
+        }
+
+    def test_scenarios_login(self):
+        response, data = self.post_scenarios({"scenarios": []})
+        # the XSRF token is checked first
+        assert response.code == 403
+        assert "_xsrf" in data["error"]
+        with unittest.mock.patch.object(
+            web.api.ScenariosHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+        ):
+            response, data = self.post_scenarios({"scenarios": []})
+        assert response.code == 403
+
+    @unittest.mock.patch.object(web.api.ScenariosHandler, "current_user", True)
+    @unittest.mock.patch.object(
+        web.api.ScenariosHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+    )
+    def test_scenarios_overloaded(self):
+        self._app.settings["admission"]["main"] = web.admission.AdmissionControl(
+            limit=0, queue_size=0
+        )
+        response = self.fetch(
+            "/api/scenarios", method="POST", body=json.dumps({"scenarios": []})
+        )
+        assert response.code == 503
+        assert response.headers["Retry-After"] == "5"
+
+    @unittest.mock.patch.object(web.api.ScenariosHandler, "current_user", True)
+    @unittest.mock.patch.object(
+        web.api.ScenariosHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+    )
+    def test_scenarios_invalid(self):
+        for payload, error in [
+            ("attendees=huey", "Body must be a JSON object"),
+            ({"attendees": ["huey"]}, "scenarios must be a list"),
+            ({"scenarios": ["huey"]}, "Scenario 1 is no object"),
+            ({"scenarios": [{"attendees": "huey"}]}, "attendees must be a list"),
+            (
+                {
+                    "scenarios": [
+                        {"attendees": ["huey"], "next_release_managers": ["x"]}
+                    ]
+                },
+                "Unknown next release manager 'x'",
+            ),
+            (
+                {"scenarios": [{}] * (web.api.MAX_SCENARIOS + 1)},
+                "At most 1000 scenarios can be evaluated at once",
+            ),
+        ]:
+            response, data = self.post_scenarios(payload)
+            assert response.code == 400
+            assert data["error"].startswith(error)
@@ -0,0 +1,61 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import pytest
+import tornado.web
+
+from .. import web
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("web_env")
+@pytest.mark.parametrize(
+    "statuses, member",
+    [
+        ({"owners": 204, "maintainers": 404}, True),
+        ({"owners": 404, "maintainers": 204}, True),
+        ({"owners": 204, "maintainers": 502}, True),
+        ({"owners": 404, "maintainers": 404}, False),
+        ({"owners": 200, "maintainers": 404}, None),
+        ({"owners": 404, "maintainers": 401}, None),
+        ({"owners": 502, "maintainers": 502}, None),
+    ],
+)
+async def test_check_membership(mocker, statuses, member):
+    teams = {team: mocker.MagicMock() for team in statuses}
+    for team, status in statuses.items():
+        teams[team].members["huey"].get.return_value = (status, "")
+    github = mocker.patch("agithub.GitHub.GitHub").return_value
+    github.orgs[web.GITHUB_ORGA].teams.__getitem__.side_effect = teams.__getitem__
+    redirect = mocker.patch.object(web.BaseHandler, "redirect")
+    mocker.patch.object(
+        web.BaseHandler,
+        "get_signed_cookie",
+        lambda self, x: '{"access_token":"foobar","login":"huey"}',
+    )
+    handler = web.BaseHandler(web.make_app([]), mocker.Mock())
+    shared_cache = handler.settings["cache"]
+    if member is None:
+        # says nothing about the membership, so nothing is remembered
+        with pytest.raises(tornado.web.HTTPError) as exc_info:
+            await handler.prepare()
+        assert exc_info.value.status_code == 502
+        redirect.assert_not_called()
+        assert "huey" not in handler.settings["memberships"]
+        assert shared_cache.get("membership:huey") is None
+    elif member:
+        await handler.prepare()
+        redirect.assert_not_called()
+        assert "huey" in handler.settings["memberships"]
+        assert shared_cache.get("membership:huey") is not None
+    else:
+        await handler.prepare()
+        redirect.assert_called_once_with("not-a-maintainer?user=huey")
+        assert shared_cache.get("membership:huey") is None
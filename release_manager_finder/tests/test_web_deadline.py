@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ..web import deadline, prefetch
+
+
+def test_deadline():
+    budget = deadline.Deadline(10)
+    assert not budget.expired
+    assert 9 < budget.remaining() <= 10
+    assert budget.timeout(1) == 1
+    assert 9 < budget.timeout() <= 10
+    budget.end = time.monotonic() - 1
+    assert budget.expired
+    assert budget.remaining() == 0
+    with pytest.raises(deadline.DeadlineExceeded):
+        budget.timeout(1)
+
+
+def test_latency_tracker():
+    tracker = deadline.LatencyTracker(window=20, min_samples=5)
+    for latency in range(4):
+        tracker.record(latency)
+    assert tracker.percentile(0.95) is None
+    for latency in range(4, 40):
+        tracker.record(latency)
+    # only the last 20 samples are kept
+    assert tracker.percentile(0) == 20
+    assert tracker.percentile(0.95) == 39
+
+
+@pytest.mark.asyncio
+async def test_hedged():
+    calls = []
+    first_call_done = threading.Event()
+
+    def fetch(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            # the first call hangs until its socket would time out
+            first_call_done.wait(timeout)
+            return "slow"
+        return "fast"
+
+    try:
+        assert await deadline.hedged(fetch, 5, hedge_after=0.01) == "fast"
+    finally:
+        first_call_done.set()
+    assert len(calls) == 2
+    assert calls[0] == 5
+    assert calls[1] < 5
+
+
+@pytest.mark.asyncio
+async def test_hedged_failure(mocker):
+    fetch = mocker.MagicMock(side_effect=[OSError("reset"), "result"])
+    assert await deadline.hedged(fetch, 5, hedge_after=1) == "result"
+    assert fetch.call_count == 2
+    fetch = mocker.MagicMock(side_effect=[OSError("reset"), OSError("again")])
+    with pytest.raises(OSError, match="again"):
+        await deadline.hedged(fetch, 5, hedge_after=1)
+    fetch = mocker.MagicMock(side_effect=[OSError("reset")])
+    with pytest.raises(OSError, match="reset"):
+        await deadline.hedged(fetch, 5)
+
+
+@pytest.mark.asyncio
+async def test_hedged_timeout():
+    release = threading.Event()
+    try:
+        with pytest.raises(deadline.DeadlineExceeded):
+            # both calls ignore their timeout
+            await deadline.hedged(lambda _: release.wait(), 0.05, hedge_after=0.01)
+    finally:
+        release.set()
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_fetch(mocker):
+    fetch = mocker.MagicMock(side_effect=[OSError("timeout"), {"huey": 0}, {}])
+    upstream = prefetch.UpstreamData({"maintainers": fetch}, timeout=1)
+    with pytest.raises(prefetch.UpstreamUnavailable):
+        await upstream.fetch("maintainers")
+    assert await upstream.fetch("maintainers", deadline.Deadline(5)) == {"huey": 0}
+    assert fetch.call_args.args[0] == 1
+    # cached values are served without asking upstream
+    assert await upstream.fetch("maintainers") == {"huey": 0}
+    assert fetch.call_count == 2
+    upstream.entries["maintainers"].updated -= 60
+    assert await upstream.fetch("maintainers", max_age=30) == {}
+    assert fetch.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_fetch_stale(mocker):
+    fetch = mocker.MagicMock(side_effect=[OSError("timeout")])
+    upstream = prefetch.UpstreamData({"maintainers": fetch})
+    upstream.set("maintainers", {"huey": 0}, updated=time.time() - 60)
+    # refreshing fails, so the stale value is served
+    assert await upstream.fetch("maintainers", max_age=30) == {"huey": 0}
+    assert upstream.entries["maintainers"].failures == 1
+    # exhausted budget does not even try
+    budget = deadline.Deadline(0)
+    assert await upstream.fetch("maintainers", budget, max_age=30) == {"huey": 0}
+    assert fetch.call_count == 1
+    assert await upstream.fetch_all(["maintainers"], budget) == [{"huey": 0}]
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_single_flight():
+    release = threading.Event()
+    calls = []
+
+    def fetch(timeout):
+        calls.append(timeout)
+        release.wait(5)
+        return {"huey": len(calls)}
+
+    upstream = prefetch.UpstreamData({"maintainers": fetch}, timeout=5)
+    waiting = [
+        asyncio.ensure_future(upstream.fetch("maintainers")) for _ in range(5)
+    ] + [asyncio.ensure_future(upstream.refresh("maintainers"))]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*waiting)
+    # all requests and the prefetcher waited for the same fetch
+    assert calls == [5]
+    assert results == [{"huey": 1}] * 5 + [None]
+    assert upstream.entries["maintainers"].refreshing is None
+    await upstream.refresh("maintainers")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_single_flight_deadline():
+    release = threading.Event()
+    upstream = prefetch.UpstreamData(
+        {"maintainers": lambda timeout: release.wait(5) and {"huey": 0}}, timeout=5
+    )
+    first = asyncio.ensure_future(upstream.fetch("maintainers"))
+    await asyncio.sleep(0.01)
+    try:
+        # joining the running fetch still respects the own budget
+        with pytest.raises(prefetch.UpstreamUnavailable):
+            await upstream.fetch("maintainers", deadline.Deadline(0.05))
+    finally:
+        release.set()
+    assert await first == {"huey": 0}
+
+
+@pytest.mark.asyncio
+async def test_upstream_data_derived(mocker):
+    fetch = mocker.MagicMock(side_effect=[[1, 2], [1, 2, 3]])
+    upstream = prefetch.UpstreamData(
+        {"releases": fetch}, derived={"count": ("releases", len)}
+    )
+    # derived values refresh their source
+    assert await upstream.fetch("count") == 2
+    assert upstream.get("releases") == [1, 2]
+    await upstream.refresh("count")
+    assert upstream.get("count") == 3
+    assert fetch.call_count == 2
+    upstream.update("releases", lambda releases: releases + [4])
+    assert upstream.get("count") == 4
+    assert upstream.entries["count"].updated == upstream.entries["releases"].updated
@@ -0,0 +1,116 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=abstract-method
+
+import unittest.mock
+import urllib.parse
+
+from .. import history, web
+from .webapp import WebAppTestCase
+
+
+class PostTestCase(WebAppTestCase):
+    def post(self, inputs):
+        return self.fetch("/", method="POST", body=urllib.parse.urlencode(inputs))
+
+
+@unittest.mock.patch.object(web.MainHandler, "current_user", True)
+@unittest.mock.patch.object(
+    web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+)
+class TestWeighted(PostTestCase):
+    def get_app(self):
+        releases = [
+            {
+                "tag_name": "2024.10",
+                "author": {"login": "huey"},
+                "published_at": "2024-10-30T10:00:00Z",
+            }
+        ]
+        return self.web_app(
+            {
+                "maintainers": dict.fromkeys(["huey", "dewey"], 0),
+                "past_release_managers": {"huey": 1, "louie": 3},
+                "release_history": history.HistoryIndex.from_github(releases),
+            },
+            optional=["release_history"],
+        )
+
+    def test_root_post_weighted(self):
+        inputs = [("attendees", "huey"), ("attendees", "dewey"), ("weighted", "1")]
+        response = self.post(inputs)
+        assert response.code == 200
+        body = response.body.decode()
+        assert '<th scope="col">Probability</th>' in body
+        # huey managed a release and is in the pool nevertheless
+        assert "<tt>@huey</tt>" in body.split("Total Release Manager Tally")[0]
+        samplers = self._app.settings["samplers"]
+        assert len(samplers) == 1
+        ((pool, sampler),) = samplers.values()
+        assert pool == [(0, "dewey"), (1, "huey")]
+        assert sampler.probability(0) > sampler.probability(1)
+        # drawing again reuses the alias table
+        with unittest.mock.patch.object(web.sampling, "weighted_sampler") as build:
+            assert self.post(inputs).code == 200
+            build.assert_not_called()
+        assert len(samplers) == 1
+
+    def test_root_post_weighted_empty(self):
+        response = self.post([("attendees", "louie"), ("weighted", "1")])
+        assert response.code == 200
+        assert "There is no suitable candidate" in response.body.decode()
+
+    def test_root_post_unweighted(self):
+        response = self.post([("attendees", "huey"), ("attendees", "dewey")])
+        assert response.code == 200
+        assert "Probability" not in response.body.decode()
+        assert not self._app.settings["samplers"]
+
+
+@unittest.mock.patch.object(web.MainHandler, "current_user", True)
+@unittest.mock.patch.object(
+    web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+)
+class TestMultiReleaseDraw(PostTestCase):
+    def get_app(self):
+        return self.web_app(
+            {
+                "maintainers": dict.fromkeys(["huey", "dewey"], 0),
+                "past_release_managers": {"dewey": 1},
+            }
+        )
+
+    @unittest.mock.patch("random.choice", lambda seq: seq[0])
+    def test_root_post_releases(self):
+        response = self.post(
+            [("attendees", "huey"), ("attendees", "dewey"), ("releases", "3")]
+        )
+        assert response.code == 200
+        body = response.body.decode()
+        assert "<h1>Release managers of the next 3 releases</h1>" in body
+        rows = body.split("<tbody>")[1].split("</tbody>")[0].split("</tr>")
+        assert [row.count("<tt>@huey</tt>") for row in rows[:3]] == [2, 1, 2]
+        assert "<tt>@dewey</tt> (1) <tt>@huey</tt> (1)" in rows[1]
+        # details are shown for the first of the releases
+        assert '<a href="https://github.com/huey"><tt>@huey</tt></a> 🎉' in body
+
+    def test_root_post_releases_default(self):
+        response = self.post([("attendees", "huey")])
+        assert response.code == 200
+        assert "Release managers of the next" not in response.body.decode()
+
+    def test_root_post_releases_invalid(self):
+        for releases in ("0", "foobar", str(web.MAX_RELEASES + 1)):
+            response = self.post([("attendees", "huey"), ("releases", releases)])
+            assert response.code == 400
+        response = self.post(
+            [("attendees", "huey"), ("releases", "2"), ("weighted", "1")]
+        )
+        assert response.code == 400
@@ -0,0 +1,97 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import http.client
+import threading
+import unittest.mock
+
+import pytest
+
+from .. import forum, web
+from .webapp import WebAppTestCase
+
+
+def opt_out_post(post_number, username):
+    return {"post_number": post_number, "username": username, "cooked": "opt out"}
+
+
+@pytest.mark.asyncio
+async def test_forum_roster_refresh():
+    thread = forum.OptOutThread()
+    released = threading.Event()
+
+    def fetch_posts(timeout, full):
+        # pylint: disable=unused-argument
+        released.wait(5)
+        return [opt_out_post(thread.last_post_number + 2, "huey")]
+
+    thread.fetch_posts = unittest.mock.MagicMock(side_effect=fetch_posts)
+    roster = web.watch.ForumRoster(thread, min_interval=60)
+    refreshes = [asyncio.ensure_future(roster.refresh()) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    released.set()
+    await asyncio.gather(*refreshes)
+    # concurrent refreshes share one fetch
+    thread.fetch_posts.assert_called_once_with(5.0, False)
+    assert roster.roster == ["huey"]
+    # and the next page load does not fetch again
+    await roster.refresh()
+    thread.fetch_posts.assert_called_once()
+    roster.min_interval = 0
+    await roster.refresh()
+    assert thread.fetch_posts.call_count == 2
+    assert thread.last_post_number == 4
+    # the whole thread is read again once in a while
+    thread.reads_since_full = forum.FORUM_FULL_READ
+    await roster.refresh()
+    thread.fetch_posts.assert_called_with(5.0, True)
+    assert thread.last_post_number == 6
+    assert not thread.reads_since_full
+
+
+@pytest.mark.asyncio
+async def test_forum_roster_unavailable():
+    thread = forum.OptOutThread()
+    thread.apply([opt_out_post(2, "huey")])
+    thread.fetch_posts = unittest.mock.MagicMock(side_effect=OSError("timeout"))
+    roster = web.watch.ForumRoster(thread)
+    await roster.refresh()
+    # the last known roster is kept
+    assert roster.roster == ["huey"]
+    thread.fetch_posts.side_effect = http.client.IncompleteRead(b"{")
+    roster.min_interval = 0
+    await roster.refresh()
+    assert roster.roster == ["huey"]
+
+
+@unittest.mock.patch.object(web.MainHandler, "current_user", True)
+class TestOptOutForum(WebAppTestCase):
+    def get_app(self):
+        self.thread = forum.OptOutThread()
+        self.thread.fetch_posts = unittest.mock.MagicMock(return_value=[])
+        return self.web_app(
+            {"maintainers": dict.fromkeys(["huey", "dewey", "louie"], 0)},
+            ["louie"],
+            opt_out_forum=web.watch.ForumRoster(self.thread, min_interval=0),
+        )
+
+    def test_root_get(self):
+        body = self.fetch("/").body.decode()
+        assert 'id="opt-out-louie" value="louie" checked />' in body
+        assert 'id="opt-out-huey" value="huey" />' in body
+        self.thread.fetch_posts.return_value = [
+            opt_out_post(2, "huey"),
+            opt_out_post(3, "louie"),
+        ]
+        body = self.fetch("/").body.decode()
+        assert 'id="opt-out-louie" value="louie" checked />' in body
+        assert 'id="opt-out-huey" value="huey" checked />' in body
+        assert self.thread.fetch_posts.call_count == 2
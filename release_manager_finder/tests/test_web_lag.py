@@ -0,0 +1,88 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from ..web import lag
+from .webapp import WebAppTestCase
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_blocked(caplog):
+    monitor = lag.LagMonitor(threshold=0.1, interval=0.01)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert monitor.ticks > 0
+        assert not monitor.blocked
+        blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+    stats = monitor.stats()
+    assert stats["blocked"] == 1
+    assert stats["lag"]["max"] >= 0.2
+    assert stats["histogram"]["0.5"] == 1
+    assert sum(stats["histogram"].values()) == stats["ticks"]
+    (block,) = stats["recent_blocks"]
+    assert block["lag"] >= 0.2
+    # the logged stack shows where the loop was blocked, but is not served
+    assert "blocking_call" in caplog.text
+    assert "stack" not in block
+
+
+def test_lag_monitor_record(caplog):
+    monitor = lag.LagMonitor(threshold=0.1)
+    for lag_ in (0.0, 0.002, 0.2, 5.0):
+        monitor.record(lag_)
+    stats = monitor.stats()
+    assert stats["ticks"] == 4
+    assert stats["blocked"] == 2
+    assert stats["histogram"] == {
+        "0.001": 1,
+        "0.005": 1,
+        "0.01": 0,
+        "0.05": 0,
+        "0.1": 0,
+        "0.5": 1,
+        "1.0": 0,
+        "inf": 1,
+    }
+    assert [block["lag"] for block in stats["recent_blocks"]] == [0.2, 5.0]
+    # no stack was captured without the watchdog
+    assert caplog.messages == [
+        "Event loop was blocked for 0.200s",
+        "Event loop was blocked for 5.000s",
+    ]
+
+
+class TestLagMetrics(WebAppTestCase):
+    def get_app(self):
+        return self.web_app(
+            {"maintainers": {}}, loop_monitor=lag.LagMonitor(threshold=0.1)
+        )
+
+    def test_metrics(self):
+        self._app.settings["loop_monitor"].record(0.5)
+        response = self.fetch("/metrics")
+        assert response.code == 200
+        stats = json.loads(response.body)["event_loop"]
+        assert stats["blocked"] == 1
+        assert stats["histogram"]["0.5"] == 1
+        self._app.settings["loop_monitor"] = None
+        assert "event_loop" not in json.loads(self.fetch("/metrics").body)
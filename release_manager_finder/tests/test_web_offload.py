@@ -0,0 +1,88 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import concurrent.futures
+import unittest.mock
+import urllib.parse
+
+import pytest
+
+from .. import interned, web
+from ..web import offload
+from .webapp import WebAppTestCase
+
+
+def test_make_executor():
+    executor = offload.make_executor(workers=2)
+    assert isinstance(executor, concurrent.futures.ThreadPoolExecutor)
+    assert offload.thread_executor(executor) is executor
+    executor.shutdown()
+    executor = offload.make_executor("process", 1)
+    assert isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+    assert offload.thread_executor(executor) is None
+    executor.shutdown()
+    with pytest.raises(ValueError):
+        offload.make_executor("fiber")
+
+
+@pytest.mark.asyncio
+async def test_compute_selection_in_process():
+    roster = interned.Roster(["huey"])
+    with offload.make_executor("process", 1) as executor:
+        rm_tally, pool, upcoming = await offload.run(
+            executor,
+            web.compute_selection,
+            {"huey": 0, "dewey": 0, "louie": 0},
+            {"huey": 1},
+            [],
+            ["louie"],
+            ["huey", "dewey", "louie"],
+            releases=2,
+            roster=roster,
+        )
+    assert rm_tally == [(0, "dewey"), (0, "louie"), (1, "huey")]
+    assert pool == [(0, "dewey"), (1, "huey")]
+    assert len(upcoming) == 2
+    assert {draw.release_manager for draw in upcoming} <= {"dewey", "huey"}
+    # the roster was only changed in the worker process
+    assert len(roster) == 1
+
+
+class TestExecutor(WebAppTestCase):
+    def get_app(self):
+        return self.web_app(
+            {
+                "maintainers": dict.fromkeys(["huey", "dewey"], 0),
+                "past_release_managers": {"huey": 1},
+            },
+            executor=offload.make_executor("process", 1),
+        )
+
+    def tearDown(self):
+        self._app.settings["executor"].shutdown()
+        super().tearDown()
+
+    @unittest.mock.patch.object(web.MainHandler, "current_user", True)
+    @unittest.mock.patch.object(
+        web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+    )
+    def test_root_post_process_executor(self):
+        response = self.fetch(
+            "/",
+            method="POST",
+            body=urllib.parse.urlencode(
+                [("attendees", "huey"), ("attendees", "dewey"), ("releases", "2")]
+            ),
+        )
+        assert response.code == 200
+        body = response.body.decode()
+        assert "<tt>@dewey</tt>" in body
+        # the shared roster knows all logins before computing in another process
+        assert set(self._app.settings["roster"].ids) == {"huey", "dewey"}
@@ -0,0 +1,85 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import gzip
+import pickle
+
+import pytest
+
+from .. import history
+from ..web import prefetch, snapshot
+
+
+def make_upstream():
+    return prefetch.UpstreamData(
+        {
+            "maintainers": lambda timeout: {"huey": 0},
+            "past_release_managers": lambda timeout: {"dewey": 2},
+            "release_history": lambda timeout: history.HistoryIndex([]),
+        }
+    )
+
+
+def test_snapshot_roundtrip(tmp_path):
+    upstream = make_upstream()
+    upstream.set("maintainers", {"huey": 0, "dewey": 2}, updated=1000.0)
+    upstream.set("release_history", history.HistoryIndex.from_github([]), 1001.0)
+    snapshotter = snapshot.Snapshotter(
+        tmp_path / "snapshot", upstream, {"huey": 1002.0}
+    )
+    snapshotter.save()
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    restored = make_upstream()
+    memberships = {}
+    assert snapshot.load(tmp_path / "snapshot", restored, memberships)
+    assert memberships == {"huey": 1002.0}
+    assert restored.entries["maintainers"].value == {"huey": 0, "dewey": 2}
+    # values keep their age, so they are revalidated
+    assert restored.entries["maintainers"].updated == 1000.0
+    assert restored.entries["release_history"].value == (
+        history.HistoryIndex.from_github([])
+    )
+    # values that were never fetched are not restored
+    assert not restored.entries["past_release_managers"].warm
+    assert restored.version > 0
+
+
+def test_snapshot_load_invalid(tmp_path):
+    upstream = make_upstream()
+    memberships = {}
+    assert not snapshot.load(tmp_path / "missing", upstream, memberships)
+    (tmp_path / "corrupt").write_bytes(b"not a snapshot")
+    assert not snapshot.load(tmp_path / "corrupt", upstream, memberships)
+    (tmp_path / "old").write_bytes(
+        gzip.compress(pickle.dumps({"version": 0, "upstream": {}}))
+    )
+    assert not snapshot.load(tmp_path / "old", upstream, memberships)
+    assert not any(entry.warm for entry in upstream.entries.values())
+
+
+@pytest.mark.asyncio
+async def test_snapshotter_interval(tmp_path):
+    upstream = make_upstream()
+    upstream.set("maintainers", {"huey": 0})
+    snapshotter = snapshot.Snapshotter(
+        tmp_path / "snapshot", upstream, {}, interval=0.01
+    )
+    snapshotter.start()
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if (tmp_path / "snapshot").exists():
+            break
+    snapshotter.stop()
+    restored = make_upstream()
+    assert snapshotter.load() is True
+    assert snapshot.load(tmp_path / "snapshot", restored, {})
+    assert restored.entries["maintainers"].value == {"huey": 0}
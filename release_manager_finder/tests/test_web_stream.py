@@ -0,0 +1,132 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import os
+import threading
+import unittest.mock
+import urllib.parse
+
+import pytest
+
+from .. import GitHubError, web
+from .webapp import WebAppTestCase
+
+INPUTS = urllib.parse.urlencode(
+    [("opt-out", "louie"), ("attendees", "huey"), ("attendees", "dewey")]
+)
+
+
+@pytest.mark.parametrize(
+    "value, stream_results",
+    [("1", True), ("True", True), ("yes", True), ("0", False), ("false", False)],
+)
+@pytest.mark.usefixtures("web_env")
+def test_stream_results_setting(value, stream_results):
+    with unittest.mock.patch.dict(os.environ, {"STREAM_RESULTS": value}):
+        app = web.make_app([], upstream=web.prefetch.UpstreamData({}))
+    assert app.settings["stream_results"] is stream_results
+
+
+@unittest.mock.patch.object(web.MainHandler, "current_user", True)
+@unittest.mock.patch.object(
+    web.MainHandler, "check_xsrf_cookie", unittest.mock.MagicMock()
+)
+class TestStreamedResults(WebAppTestCase):
+    def setUp(self):
+        self.released = threading.Event()
+        self.past_release_managers = unittest.mock.MagicMock(
+            side_effect=lambda timeout: {"huey": 1, "louie": 2}
+        )
+        super().setUp()
+
+    def get_app(self):
+        def fetch_past_release_managers(timeout):
+            # only answer once the client got the first chunk
+            self.released.wait(5)
+            return self.past_release_managers(timeout)
+
+        with unittest.mock.patch.dict(os.environ, {"STREAM_RESULTS": "1"}):
+            return self.web_app(
+                {
+                    "maintainers": dict.fromkeys(["huey", "dewey", "louie"], 0),
+                    "past_release_managers": fetch_past_release_managers,
+                }
+            )
+
+    def fetch_chunks(self, body: str) -> tuple[int, list[str]]:
+        chunks = []
+
+        def streaming_callback(chunk):
+            chunks.append(chunk.decode())
+            self.released.set()
+
+        response = self.fetch(
+            "/", method="POST", body=body, streaming_callback=streaming_callback
+        )
+        return response.code, chunks
+
+    def test_root_post_streamed(self):
+        code, chunks = self.fetch_chunks(INPUTS)
+        assert code == 200
+        # the inputs were sent before the upstream data was there
+        assert "<h2>Inputs</h2>" in chunks[0]
+        assert "Opted out</a>: <tt>@louie</tt>" in chunks[0]
+        assert "Tally" not in chunks[0]
+        body = "".join(chunks)
+        assert body.startswith("<!DOCTYPE html>")
+        assert body.rstrip().endswith("</html>")
+        assert (
+            body.index("<h2>Inputs</h2>")
+            < body.index("Total Release Manager Tally")
+            < body.index("Congratulation")
+        )
+        assert "considered for the list below." in body
+
+    def test_root_post_not_streamed(self):
+        self.released.set()
+        self._app.settings["stream_results"] = False
+        response = self.fetch("/", method="POST", body=INPUTS)
+        assert response.code == 200
+        body = response.body.decode()
+        assert "<h2>Inputs</h2>" not in body
+        assert "considered for the list above." in body
+        assert body.index("Congratulation") < body.index("Total Release")
+
+    def test_root_post_streamed_unavailable(self):
+        self.past_release_managers.side_effect = GitHubError("rate limit")
+        code, chunks = self.fetch_chunks(INPUTS)
+        # the status was sent with the inputs already
+        assert code == 200
+        body = "".join(chunks)
+        assert 'class="alert alert-danger"' in body
+        assert "Unable to finish the selection" in body
+        assert "Total Release Manager Tally" not in body
+        assert body.rstrip().endswith("</html>")
+
+    def test_root_post_streamed_error(self):
+        with unittest.mock.patch.object(
+            web.MainHandler, "draw_stage", side_effect=RuntimeError("bug")
+        ), self.assertLogs(level="ERROR") as logs:
+            code, chunks = self.fetch_chunks(INPUTS)
+        assert code == 200
+        body = "".join(chunks)
+        assert "Unable to finish the selection: Internal server error" in body
+        assert body.rstrip().endswith("</html>")
+        # logged once, and not again by tornado
+        assert len(logs.output) == 1
+        assert logs.records[0].name == "release_manager_finder.web"
+        assert "RuntimeError: bug" in logs.output[0]
+
+    def test_root_post_streamed_invalid(self):
+        self.released.set()
+        code, chunks = self.fetch_chunks(INPUTS + "&releases=0")
+        # the request is validated before the first chunk
+        assert code == 400
+        assert "<h2>Inputs</h2>" not in "".join(chunks)
@@ -0,0 +1,195 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+import unittest.mock
+
+import pytest
+import tornado.testing
+
+from .. import web
+
+
+@pytest.mark.usefixtures("web_env")
+class TestWebhook(tornado.testing.AsyncHTTPTestCase):
+    secret = "It's a secret to everybody"
+
+    def get_app(self):
+        with unittest.mock.patch.dict(
+            os.environ, {"GITHUB_WEBHOOK_SECRET": self.secret}
+        ):
+            app = web.make_app([])
+        app.settings["upstream"].set("past_release_managers", {"huey": 2})
+        return app
+
+    def post_event(self, payload, event="release", delivery="1", secret=None):
+        body = json.dumps(payload).encode()
+        return self.fetch(
+            "/webhook/github",
+            method="POST",
+            body=body,
+            headers={
+                "X-GitHub-Event": event,
+                "X-GitHub-Delivery": delivery,
+                "X-Hub-Signature-256": web.webhook.signature(
+                    secret or self.secret, body
+                ),
+            },
+        )
+
+    @staticmethod
+    def release_event(tag_name, login="huey", action="published"):
+        return {
+            "action": action,
+            "release": {"tag_name": tag_name, "author": {"login": login}},
+            "repository": {"full_name": f"{web.GITHUB_ORGA}/RIOT"},
+        }
+
+    @property
+    def tally(self):
+        return self._app.settings["upstream"].get("past_release_managers")
+
+    def test_invalid_signature(self):
+        response = self.post_event(self.release_event("2025.01"), secret="wrong")
+        assert response.code == 403
+        response = self.fetch(
+            "/webhook/github",
+            method="POST",
+            body=b"{}",
+            headers={"X-GitHub-Event": "ping"},
+        )
+        assert response.code == 403
+        assert self.tally == {"huey": 2}
+
+    def test_no_secret(self):
+        self._app.settings["webhook_secret"] = None
+        response = self.post_event({}, event="ping")
+        assert response.code == 403
+
+    def test_ping(self):
+        response = self.post_event({"zen": "Keep it logically awesome."}, "ping")
+        assert response.code == 200
+        assert response.body == b"pong"
+
+    def test_other_event(self):
+        response = self.post_event({}, event="push")
+        assert response.code == 204
+
+    def test_other_repository(self):
+        payload = self.release_event("2025.01")
+        payload["repository"]["full_name"] = "RIOT-OS/riotdocker"
+        response = self.post_event(payload)
+        assert response.code == 400
+        assert self.tally == {"huey": 2}
+
+    def test_release_published(self):
+        version = self._app.settings["upstream"].version
+        response = self.post_event(self.release_event("2025.01", "dewey"))
+        assert response.code == 202
+        assert self.tally == {"huey": 2, "dewey": 1}
+        assert self._app.settings["upstream"].version == version + 1
+        # redelivery is ignored
+        response = self.post_event(self.release_event("2025.01", "dewey"))
+        assert response.code == 204
+        assert self.tally == {"huey": 2, "dewey": 1}
+        response = self.post_event(self.release_event("2025.04"), delivery="2")
+        assert response.code == 202
+        assert self.tally == {"huey": 3, "dewey": 1}
+        response = self.post_event(
+            self.release_event("2025.04", action="deleted"), delivery="3"
+        )
+        assert response.code == 202
+        assert self.tally == {"huey": 2, "dewey": 1}
+
+    def test_release_unpublished(self):
+        response = self.post_event(self.release_event("2025.01"))
+        assert response.code == 202
+        assert self.tally == {"huey": 3}
+        response = self.post_event(
+            self.release_event("2025.01", action="unpublished"), delivery="2"
+        )
+        assert response.code == 202
+        assert self.tally == {"huey": 2}
+        # unpublished releases are drafts, so deleting them changes nothing
+        payload = self.release_event("2025.01", action="deleted")
+        payload["release"]["draft"] = True
+        response = self.post_event(payload, delivery="3")
+        assert response.code == 204
+        assert self.tally == {"huey": 2}
+
+    def test_invalid_payload(self):
+        for body in [
+            b"not json",
+            json.dumps(["release"]).encode(),
+            json.dumps({"action": "published"}).encode(),
+            json.dumps({"repository": {"full_name": "RIOT-OS/RIOT"}}).encode(),
+            json.dumps(
+                {"repository": {"full_name": "RIOT-OS/RIOT"}, "release": {}}
+            ).encode(),
+        ]:
+            response = self.fetch(
+                "/webhook/github",
+                method="POST",
+                body=body,
+                headers={
+                    "X-GitHub-Event": "release",
+                    "X-Hub-Signature-256": web.webhook.signature(self.secret, body),
+                },
+            )
+            assert response.code == 400
+        assert self.tally == {"huey": 2}
+
+    def test_release_filtered(self):
+        draft = self.release_event("2025.01")
+        draft["release"]["draft"] = True
+        for delivery, payload in enumerate(
+            [
+                draft,
+                self.release_event("2025.01-RC1"),
+                self.release_event("2025.01.1"),
+                self.release_event("2025.01", action="edited"),
+            ]
+        ):
+            response = self.post_event(payload, delivery=str(delivery))
+            assert response.code == 204
+        assert self.tally == {"huey": 2}
+        response = self.post_event(self.release_event("2016.07", "miri64"), "release")
+        assert response.code == 202
+        assert self.tally == {"huey": 2, "kYc0o": 1}
+
+    def test_release_cold_cache(self):
+        upstream = self._app.settings["upstream"]
+        upstream.entries["past_release_managers"].updated = None
+        response = self.post_event(self.release_event("2025.01"))
+        assert response.code == 202
+        assert not upstream.entries["past_release_managers"].warm
+
+    def test_release_history(self):
+        upstream = self._app.settings["upstream"]
+        upstream.set(
+            "release_history",
+            web.history.HistoryIndex.from_github(
+                [self.release_event("2024.10")["release"]]
+            ),
+        )
+        assert self.tally == {"huey": 1, "OlegHahm": 4}
+        response = self.post_event(self.release_event("2025.01", "dewey"))
+        assert response.code == 202
+        history = upstream.get("release_history")
+        assert history.last_releases()["dewey"].year == 2025
+        # the tally follows the history
+        assert self.tally == {"huey": 1, "OlegHahm": 4, "dewey": 1}
+        response = self.post_event(
+            self.release_event("2025.01", "dewey", "deleted"), delivery="2"
+        )
+        assert response.code == 202
+        assert "dewey" not in upstream.get("release_history").last_releases()
+        assert self.tally == {"huey": 1, "OlegHahm": 4}
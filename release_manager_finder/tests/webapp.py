@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-module-docstring
+
+import pytest
+import tornado.testing
+import tornado.web
+
+from .. import web
+
+
+@pytest.mark.usefixtures("web_env")
+class WebAppTestCase(  # pylint: disable=abstract-method
+    tornado.testing.AsyncHTTPTestCase
+):
+    """Test case of the web app, with its secrets in the environment"""
+
+    def web_app(
+        self, data: dict = None, opt_out_list=(), optional=(), **kwargs
+    ) -> tornado.web.Application:
+        """Web app with the upstream data in ``data``, e.g., for ``get_app()``
+
+        Values of ``data`` that are callable are used as fetchers. Further
+        keyword arguments are passed to
+        :py:func:`release_manager_finder.web.make_app`.
+        """
+        upstream = web.prefetch.UpstreamData(
+            {
+                name: value if callable(value) else lambda timeout, v=value: v
+                for name, value in (data or {}).items()
+            },
+            optional=list(optional),
+        )
+        return web.make_app(list(opt_out_list), upstream=upstream, **kwargs)
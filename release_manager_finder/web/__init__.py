@@ -12,50 +12,145 @@ __author__ = "Martine S. Lenders <martine.lenders@tu-dresden.de>"
 
 import argparse
 import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import itertools
 import json
+import logging
 import os
 import pathlib
 import random
+import signal
+import typing
 import urllib.parse
 
-import agithub
 import tornado
+import tornado.template
 
 from release_manager_finder import (
     GITHUB_ORGA,
     OPT_OUT_FORUM,
+    GitHubError,
+    activity,
+    draws,
+    eligible_maintainers,
+    forum,
     get_maintainers,
     get_opt_out_list,
-    get_past_release_managers,
-    get_results,
+    get_past_releases,
+    github_client,
+    history,
+    interned,
+    sampling,
 )
-from release_manager_finder.web import auth
-
-
-CLIENT_ID = os.environ["CLIENT_ID"]
-CLIENT_SECRET = os.environ["CLIENT_SECRET"]
-DEBUG = bool(os.environ.get("DEBUG", False))
-HOSTNAME_URL = os.environ.get("HOSTNAME_URL", "http://localhost:8888")
-COOKIE_SECRET = os.environ["COOKIE_SECRET"]
-
-
-class BaseHandler(tornado.web.RequestHandler):
-    def get_current_user(self):
-        cookie = self.get_signed_cookie("user")
-        if cookie:
-            user = json.loads(cookie)
-            github = agithub.GitHub.GitHub(token=user["access_token"], paginate=True)
-            no_maintainer = True
-            for team in auth.GITHUB_TEAMS:
-                status, _ = (
-                    github.orgs[GITHUB_ORGA].teams[team].members[user["login"]].get()
-                )
-                if status != 404:
-                    no_maintainer = False
-            if no_maintainer:
-                self.redirect(f"not-a-maintainer?user={user['login']}")
-            return user
-        return cookie
+from release_manager_finder.web import (
+    admission,
+    api,
+    auth,
+    cache,
+    lag,
+    offload,
+    prefetch,
+    snapshot,
+    watch,
+    webhook,
+)
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_PATH = pathlib.Path(__file__).parent / "templates"
+# alias tables kept for repeated weighted draws with the same inputs
+SAMPLER_CACHE_SIZE = 64
+# upcoming releases release managers can be drawn for at once
+MAX_RELEASES = 12
+# seconds computed selection pools are kept in the cache
+SELECTION_TTL = 3600
+# seconds the recent activity of a maintainer is kept in the cache
+ACTIVITY_TTL = 7 * 24 * 3600
+
+
+def make_upstream_data(
+    gh_token: str = None, shared_cache: cache.CacheBackend = None
+) -> prefetch.UpstreamData:
+    def fetch_maintainers(timeout):
+        return get_maintainers(timeout=timeout)
+
+    def fetch_release_history(timeout):
+        # waiting for the rate limit to reset would blow any deadline
+        github = github_client(gh_token, timeout=timeout, sleep_on_ratelimit=False)
+        return history.HistoryIndex.from_github(get_past_releases(github))
+
+    return prefetch.UpstreamData(
+        {
+            "maintainers": fetch_maintainers,
+            "release_history": fetch_release_history,
+        },
+        cache=shared_cache,
+        # the tally is counted from the history, so the releases are only
+        # walked once
+        derived={
+            "past_release_managers": ("release_history", history.HistoryIndex.tally)
+        },
+    )
+
+
+def compute_selection(  # pylint: disable=too-many-arguments
+    current_maintainers: dict[str, int],
+    past_release_managers: dict[str, int],
+    next_release_managers: list[str],
+    opt_out_list: list[str],
+    attendees_list: list[str],
+    *,
+    releases: int = 1,
+    roster: interned.Roster = None,
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]], list[draws.Draw]]:
+    """Tally, selection pool, and, for more than one release, the draws
+
+    Module-level, so it can be run in a process pool.
+    """
+    rm_tally, pool = interned.get_results(
+        current_maintainers,
+        past_release_managers,
+        next_release_managers,
+        opt_out_list,
+        attendees_list,
+        roster=roster,
+    )
+    upcoming = None
+    if releases > 1:
+        upcoming = draws.draw_release_managers(
+            eligible_maintainers(
+                rm_tally, opt_out_list, attendees_list, current_maintainers
+            ),
+            releases,
+        )
+    return rm_tally, pool, upcoming
+
+
+def load_templates(
+    template_path: pathlib.Path = TEMPLATE_PATH,
+) -> tornado.template.Loader:
+    # compile all templates up front so the first request does not pay for it
+    loader = tornado.template.Loader(str(template_path))
+    for template in sorted(template_path.glob("*.html")):
+        loader.load(template.name)
+    return loader
+
+
+class BaseHandler(auth.MaintainerMixin, tornado.web.RequestHandler):
+    async def render_string_offloaded(self, template_name: str, **kwargs) -> bytes:
+        """Like :py:meth:`render_string`, but renders the template in a thread"""
+        return await offload.run(
+            offload.thread_executor(self.settings["executor"]),
+            self.render_string,
+            template_name,
+            **kwargs,
+        )
+
+    async def render_offloaded(self, template_name: str, **kwargs) -> None:
+        """Like :py:meth:`render`, but renders the template in a thread"""
+        await self.finish(await self.render_string_offloaded(template_name, **kwargs))
 
     def data_received(self, chunk):
         # implemented to make pylint happy
@@ -63,15 +158,17 @@ class BaseHandler(tornado.web.RequestHandler):
 
 
 class LoginHandler(BaseHandler, auth.GitHubTeamOAuth2Mixin):
+    maintainer_required = False
+
     async def get(self):
         redirect_uri = urllib.parse.urljoin(
-            HOSTNAME_URL, self.reverse_url("github-login")
+            self.settings["hostname_url"], self.reverse_url("github-login")
         )
         if self.get_argument("code", False):
             user = await self.get_authenticated_user(
                 redirect_uri=redirect_uri,
-                client_id=CLIENT_ID,
-                client_secret=CLIENT_SECRET,
+                client_id=self.settings["client_id"],
+                client_secret=self.settings["client_secret"],
                 code=self.get_argument("code"),
             )
             if not user:
@@ -85,13 +182,15 @@ class LoginHandler(BaseHandler, auth.GitHubTeamOAuth2Mixin):
         else:
             self.authorize_redirect(
                 redirect_uri=redirect_uri,
-                client_id=CLIENT_ID,
+                client_id=self.settings["client_id"],
                 response_type="code",
                 **self.SCOPE,
             )
 
 
 class NotMaintainerHandler(BaseHandler):
+    maintainer_required = False
+
     def get(self):
         self.send_error(401)
 
@@ -104,6 +203,8 @@ class NotMaintainerHandler(BaseHandler):
 
 
 class LogoutHandler(BaseHandler, auth.GitHubTeamOAuth2Mixin):
+    maintainer_required = False
+
     def get(self):
         if self.current_user:
             self.clear_all_cookies()
@@ -111,56 +212,394 @@ class LogoutHandler(BaseHandler, auth.GitHubTeamOAuth2Mixin):
 
 
 class MainHandler(BaseHandler):
-    def initialize(self, initial_opt_out_list: list[str], gh_token: str = None):
+    def initialize(
+        self,
+        initial_opt_out_list: list[str],
+        gh_token: str = None,
+        opt_out_file: watch.RosterFile = None,
+        opt_out_forum: watch.ForumRoster = None,
+    ):
         # pylint: disable=attribute-defined-outside-init
         self.initial_opt_out_list = initial_opt_out_list
         self.gh_token = gh_token
+        self.opt_out_file = opt_out_file
+        self.opt_out_forum = opt_out_forum
+
+    @property
+    def token(self) -> typing.Optional[str]:
+        """The GitHub token of the server, else the one of the logged-in user"""
+        if self.gh_token:
+            return self.gh_token
+        if isinstance(self.current_user, dict):
+            return self.current_user.get("access_token")
+        return None
 
     @tornado.web.authenticated
-    def get(self):
-        maintainers = get_maintainers()
-        self.render(
+    async def get(self):
+        (maintainers,) = await prefetch.fetch_upstream(self, "maintainers")
+        if self.opt_out_file is not None:
+            opt_out_list = self.opt_out_file.roster
+        else:
+            opt_out_list = self.initial_opt_out_list
+        if self.opt_out_forum is not None:
+            await self.opt_out_forum.refresh()
+            opt_out_list = opt_out_list + [
+                login
+                for login in self.opt_out_forum.roster
+                if login not in opt_out_list
+            ]
+        # only render the first page of each picker, the rest is searched for
+        # via the API
+        index = api.maintainer_index(self.settings, maintainers)
+        _, first_page = index.search(limit=api.PAGE_SIZE)
+        # logins are case-insensitive, so show them as spelled on GitHub
+        opt_out_list = [index.get(login, login) for login in opt_out_list]
+        opted_out = {login for login in opt_out_list if login in index}
+        await self.render_offloaded(
             "form.html",
-            maintainers=maintainers,
+            maintainers=first_page,
+            maintainer_count=len(index),
+            opt_out_maintainers=sorted(opted_out, key=str.casefold)
+            + [login for login in first_page if login not in opted_out],
             opt_out_forum=OPT_OUT_FORUM,
-            opt_out_list=self.initial_opt_out_list,
+            opt_out_list=opt_out_list,
+            page_size=api.PAGE_SIZE,
+            max_releases=MAX_RELEASES,
+            active_months=activity.ACTIVITY_MONTHS,
         )
 
-    @tornado.web.authenticated
-    async def post(self):
-        token = self.gh_token
-        if self.current_user:  # pragma: no cover
-            token = self.current_user.get("access_token")
-        github = agithub.GitHub.GitHub(token=token, paginate=True)
+    async def weighted_selection(
+        self,
+        rm_tally: list[tuple[int, str]],
+        current_maintainers: dict[str, int],
+        next_release_managers: list[str],
+        opt_out_list: list[str],
+        attendees_list: list[str],
+    ) -> tuple[list[tuple[int, str]], typing.Optional[sampling.AliasTable]]:
+        (release_history,) = await prefetch.fetch_upstream(self, "release_history")
+        key = (
+            self.settings["upstream"].version,
+            tuple(sorted(next_release_managers)),
+            frozenset(opt_out_list),
+            frozenset(attendees_list),
+        )
+        samplers = self.settings["samplers"]
+        if key in samplers:
+            samplers.move_to_end(key)
+            return samplers[key]
+        pool = eligible_maintainers(
+            rm_tally, opt_out_list, attendees_list, current_maintainers
+        )
+        sampler = None
+        if pool:
+            sampler = sampling.weighted_sampler(
+                pool,
+                release_history.last_releases(),
+                next_release_managers=next_release_managers,
+            )
+        samplers[key] = pool, sampler
+        if len(samplers) > SAMPLER_CACHE_SIZE:
+            samplers.popitem(last=False)
+        return pool, sampler
+
+    def get_releases(self) -> int:
+        try:
+            releases = int(self.get_argument("releases", "1"))
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, "releases must be a number") from exc
+        if not 1 <= releases <= MAX_RELEASES:
+            raise tornado.web.HTTPError(
+                400, f"releases must be between 1 and {MAX_RELEASES}"
+            )
+        if releases > 1 and self.get_argument("weighted", None) is not None:
+            raise tornado.web.HTTPError(
+                400, "Weighted draws are only supported for a single release"
+            )
+        return releases
+
+    async def inactive_maintainers(
+        self,
+        current_maintainers: dict[str, int],
+        opt_out_list: list[str],
+        attendees_list: list[str],
+    ) -> list[str]:
+        """Candidates without commits or reviews in the last
+        :py:data:`~release_manager_finder.activity.ACTIVITY_MONTHS`
+
+        Lookups run concurrently and are cached per login for
+        :py:data:`ACTIVITY_TTL`. Candidates whose activity is unknown, as the
+        search for their reviews was rate limited, are kept.
+        """
+        shared_cache = self.settings["cache"]
+        candidates = sorted(
+            activity.activity_candidates(
+                current_maintainers, opt_out_list, attendees_list
+            )
+        )
+        keys = {
+            login: f"activity:{activity.ACTIVITY_MONTHS}:{login}"
+            for login in candidates
+        }
+        known = await offload.run(
+            None, lambda: {login: shared_cache.get(key) for login, key in keys.items()}
+        )
+        missing = [login for login, active in known.items() if active is None]
+        if missing:
+            github = github_client(
+                self.token,
+                timeout=self.settings["upstream_budget"],
+                sleep_on_ratelimit=False,
+            )
+            try:
+                fetched = await offload.run(
+                    None,
+                    activity.get_activity,
+                    github,
+                    missing,
+                    activity.activity_since(),
+                )
+            except (GitHubError, OSError) as exc:
+                raise tornado.web.HTTPError(
+                    503, f"Unable to look up recent activity: {exc!r}"
+                ) from exc
+
+            def store():
+                for login, active in fetched.items():
+                    # unknown activity (rate limited search) is looked up again
+                    if active is not None:
+                        shared_cache.set(keys[login], active, ttl=ACTIVITY_TTL)
+
+            await offload.run(None, store)
+            known.update(fetched)
+        return [login for login in candidates if known[login] is False]
+
+    def selection_key(
+        self,
+        next_release_managers: list[str],
+        opt_out_list: list[str],
+        attendees_list: list[str],
+    ) -> str:
+        # the digests are the same on all instances, unlike the data version
+        upstream = self.settings["upstream"]
+        inputs = [
+            upstream.digest("maintainers"),
+            upstream.digest("past_release_managers"),
+            sorted(next_release_managers),
+            sorted(set(opt_out_list)),
+            sorted(set(attendees_list)),
+        ]
+        return f"selection:{hashlib.sha1(json.dumps(inputs).encode()).hexdigest()}"
+
+    async def selection(  # pylint: disable=too-many-arguments
+        self,
+        current_maintainers: dict[str, int],
+        past_release_managers: dict[str, int],
+        next_release_managers: list[str],
+        opt_out_list: list[str],
+        attendees_list: list[str],
+        releases: int,
+    ) -> tuple[list[tuple[int, str]], list[tuple[int, str]], list[draws.Draw]]:
+        """:py:func:`compute_selection` in the executor, shared via the cache
+
+        Only results without draws are cached, as the draws are random.
+        """
+        key = None
+        if releases == 1:
+            key = self.selection_key(
+                next_release_managers, opt_out_list, attendees_list
+            )
+            cached = await offload.run(None, self.settings["cache"].get, key)
+            if cached is not None:
+                return cached
+        roster = self.settings["roster"]
+        # intern new logins here, so threads of the executor only read the roster
+        for login in itertools.chain(current_maintainers, past_release_managers):
+            roster.intern(login)
+        results = await offload.run(
+            self.settings["executor"],
+            compute_selection,
+            current_maintainers,
+            past_release_managers,
+            next_release_managers,
+            opt_out_list,
+            attendees_list,
+            releases=releases,
+            roster=roster,
+        )
+        if key is not None:
+            await offload.run(
+                None, self.settings["cache"].set, key, results, ttl=SELECTION_TTL
+            )
+        return results
+
+    async def tally_stage(self, releases: int) -> dict:
+        """Fetch the upstream data and tally the past release managers
 
-        current_maintainers = get_maintainers()
-        past_release_managers = get_past_release_managers(github)
+        Returns the namespace for the templates of the result page."""
+        current_maintainers, past_release_managers = await prefetch.fetch_upstream(
+            self, "maintainers", "past_release_managers"
+        )
         next_release_managers = self.get_arguments("next-rm")
         opt_out_list = self.get_arguments("opt-out")
         attendees_list = self.get_arguments("attendees")
-        rm_tally, least_managing_maintainers = get_results(
+        inactive = []
+        if self.get_argument("active", None) is not None:
+            # inactive maintainers are treated as if they opted out
+            inactive = await self.inactive_maintainers(
+                current_maintainers, opt_out_list, attendees_list
+            )
+            opt_out_list = opt_out_list + inactive
+        rm_tally, least_managing_maintainers, upcoming = await self.selection(
             current_maintainers,
             past_release_managers,
             next_release_managers,
             opt_out_list,
             attendees_list,
+            releases,
         )
-        if least_managing_maintainers:
+        return {
+            "rm_tally": rm_tally,
+            "current_maintainers": current_maintainers,
+            "next_release_managers": next_release_managers,
+            "opt_out": opt_out_list,
+            "attendees": attendees_list,
+            "inactive": inactive,
+            "selection_pool": least_managing_maintainers,
+            "draws": upcoming,
+        }
+
+    async def draw_stage(self, results: dict) -> dict:
+        """Draw the next release manager from the results of
+        :py:meth:`tally_stage`"""
+        least_managing_maintainers = results["selection_pool"]
+        upcoming = results["draws"]
+        selection_weights = None
+        if upcoming is not None:
+            least_managing_maintainers = upcoming[0].selection_pool
+            next_release_manager = upcoming[0].release_manager
+        elif self.get_argument("weighted", None) is not None:
+            least_managing_maintainers, sampler = await self.weighted_selection(
+                results["rm_tally"],
+                results["current_maintainers"],
+                results["next_release_managers"],
+                results["opt_out"],
+                results["attendees"],
+            )
+            if sampler is not None:
+                next_release_manager = sampler.draw()
+                selection_weights = [
+                    sampler.probability(i) for i in range(len(sampler))
+                ]
+            else:
+                next_release_manager = None
+        elif least_managing_maintainers:
             next_release_manager = random.choice(least_managing_maintainers)[1]
         else:
             next_release_manager = None
-        self.render(
+        return {
+            "next_release_manager": next_release_manager,
+            "selection_pool": least_managing_maintainers,
+            "selection_weights": selection_weights,
+        }
+
+    async def post_streamed(self, releases: int) -> None:
+        """Send the page with the inputs right away and every section of the
+        results once the stage computing it completed
+
+        The status is sent with the first chunk, so errors of later stages are
+        shown within the page.
+        """
+        namespace = {"opt_out_forum": OPT_OUT_FORUM, "streamed": True}
+        self.write(await self.render_string_offloaded("_page_start.html"))
+        self.write(
+            await self.render_string_offloaded(
+                "_inputs.html",
+                next_release_managers=self.get_arguments("next-rm"),
+                opt_out=self.get_arguments("opt-out"),
+                attendees=self.get_arguments("attendees"),
+                **namespace,
+            )
+        )
+        await self.flush()
+        try:
+            results = await self.tally_stage(releases)
+            self.write(
+                await self.render_string_offloaded(
+                    "_tally.html", **namespace, **results
+                )
+            )
+            await self.flush()
+            results.update(await self.draw_stage(results))
+            for template_name in ("_draws.html", "_selection_pool.html"):
+                self.write(
+                    await self.render_string_offloaded(
+                        template_name, **namespace, **results
+                    )
+                )
+        except tornado.web.HTTPError as exc:
+            await self.finish_streamed(exc.log_message or exc.reason)
+            return
+        except Exception:  # pylint: disable=broad-exception-caught
+            # the response is finished, so tornado must not handle it again
+            logger.exception("Unable to stream the results")
+            await self.finish_streamed("Internal server error")
+            return
+        await self.finish_streamed()
+
+    async def finish_streamed(self, error: str = None) -> None:
+        if error is not None:
+            self.write(
+                await self.render_string_offloaded("_stream_error.html", message=error)
+            )
+        self.write(await self.render_string_offloaded("_page_end.html"))
+        await self.finish()
+
+    @tornado.web.authenticated
+    @admission.admitted("main")
+    async def post(self):
+        releases = self.get_releases()
+        if self.settings["stream_results"]:
+            await self.post_streamed(releases)
+            return
+        results = await self.tally_stage(releases)
+        results.update(await self.draw_stage(results))
+        await self.render_offloaded(
             "release_manager.html",
-            next_release_manager=next_release_manager,
             opt_out_forum=OPT_OUT_FORUM,
-            selection_pool=least_managing_maintainers,
-            rm_tally=rm_tally,
-            current_maintainers=current_maintainers,
-            opt_out=opt_out_list,
-            attendees=attendees_list,
+            streamed=False,
+            **results,
         )
 
 
+class ReadyHandler(tornado.web.RequestHandler):
+    def get(self):
+        status = self.settings["upstream"].status()
+        if not status["ready"]:
+            self.set_status(503)
+        self.write(status)
+
+    def data_received(self, chunk):
+        # implemented to make pylint happy
+        return None
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        metrics = {
+            "admission": {
+                name: control.stats()
+                for name, control in self.settings["admission"].items()
+            }
+        }
+        if self.settings["loop_monitor"] is not None:
+            metrics["event_loop"] = self.settings["loop_monitor"].stats()
+        self.write(metrics)
+
+    def data_received(self, chunk):
+        # implemented to make pylint happy
+        return None
+
+
 class FaviconHandler(tornado.web.RequestHandler):
     def get(self):
         self.write(
@@ -174,39 +613,160 @@ class FaviconHandler(tornado.web.RequestHandler):
         return None
 
 
-def make_app(opt_out_list: list[str], gh_token: str = None) -> tornado.web.Application:
+def make_app(  # pylint: disable=too-many-arguments
+    opt_out_list: list[str],
+    gh_token: str = None,
+    *,
+    opt_out_file: watch.RosterFile = None,
+    opt_out_forum: watch.ForumRoster = None,
+    upstream: prefetch.UpstreamData = None,
+    memberships: dict[str, float] = None,
+    loop_monitor: lag.LagMonitor = None,
+    executor: concurrent.futures.Executor = None,
+    shared_cache: cache.CacheBackend = None,
+) -> tornado.web.Application:
+    debug = bool(os.environ.get("DEBUG", False))
+    if shared_cache is None:
+        shared_cache = cache.make_cache(os.environ.get("CACHE_URL", "memory"))
+    if upstream is None:
+        upstream = make_upstream_data(gh_token, shared_cache)
+    if executor is None:
+        executor = offload.make_executor(
+            os.environ.get("EXECUTOR", "thread"),
+            (
+                int(os.environ["EXECUTOR_WORKERS"])
+                if os.environ.get("EXECUTOR_WORKERS")
+                else None
+            ),
+        )
+    if memberships is None:
+        memberships = {}
     return tornado.web.Application(
         [
             (
                 r"/",
                 MainHandler,
-                {"initial_opt_out_list": opt_out_list, "gh_token": gh_token},
+                {
+                    "initial_opt_out_list": opt_out_list,
+                    "gh_token": gh_token,
+                    "opt_out_file": opt_out_file,
+                    "opt_out_forum": opt_out_forum,
+                },
                 "main",
             ),
             (r"/favicon.svg", FaviconHandler),
+            (r"/ready", ReadyHandler, [], "ready"),
+            (r"/metrics", MetricsHandler, [], "metrics"),
+            (r"/api/tally", api.TallyHandler, [], "api-tally"),
+            (r"/api/selection", api.SelectionHandler, [], "api-selection"),
+            (r"/api/maintainers", api.MaintainerSearchHandler, [], "api-maintainers"),
+            (r"/api/scenarios", api.ScenariosHandler, [], "api-scenarios"),
+            (
+                r"/webhook/github",
+                webhook.GitHubWebhookHandler,
+                {"deliveries": collections.OrderedDict()},
+                "github-webhook",
+            ),
             (r"/login", LoginHandler, [], "github-login"),
             (r"/logout", LogoutHandler, [], "github-logout"),
             (r"/not-a-maintainer", NotMaintainerHandler),
         ],
-        template_path=pathlib.Path(__file__).parent / "templates",
-        autoreload=DEBUG,
-        debug=DEBUG,
-        cookie_secret=COOKIE_SECRET,
+        template_path=TEMPLATE_PATH,
+        template_loader=load_templates(),
+        # logins interned once and shared by all evaluations
+        roster=interned.Roster(),
+        upstream=upstream,
+        memberships=memberships,
+        maintainer_index={},
+        loop_monitor=loop_monitor,
+        executor=executor,
+        cache=shared_cache,
+        samplers=collections.OrderedDict(),
+        # send the result page in chunks as the stages complete
+        stream_results=os.environ.get("STREAM_RESULTS", "").lower()
+        in ("1", "true", "yes"),
+        # seconds a request may wait for upstream data not cached yet
+        upstream_budget=float(os.environ.get("UPSTREAM_BUDGET", 20)),
+        admission={
+            "main": admission.AdmissionControl(
+                limit=int(os.environ.get("ADMISSION_LIMIT", 8)),
+                queue_size=int(os.environ.get("ADMISSION_QUEUE", 64)),
+                queue_timeout=float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 10)),
+            )
+        },
+        autoreload=debug,
+        debug=debug,
+        cookie_secret=os.environ["COOKIE_SECRET"],
+        client_id=os.environ["CLIENT_ID"],
+        client_secret=os.environ["CLIENT_SECRET"],
+        hostname_url=os.environ.get("HOSTNAME_URL", "http://localhost:8888"),
+        webhook_secret=os.environ.get("GITHUB_WEBHOOK_SECRET"),
         login_url="/login",
         xsrf_cookies=True,
     )
 
 
 async def async_main(
-    port: int = 8888, opt_out_filename: str = None, gh_token: str = None
+    port: int = 8888,
+    opt_out_filename: str = None,
+    gh_token: str = None,
+    snapshot_filename: str = None,
+    opt_out_forum_url: str = None,
 ):
+    # pylint: disable=too-many-locals
     if opt_out_filename:
-        opt_out_list = get_opt_out_list(opt_out_filename)
+        opt_out_file = watch.RosterFile(opt_out_filename, get_opt_out_list)
+        opt_out_file.start()
+        opt_out_list = opt_out_file.roster
     else:
+        opt_out_file = None
         opt_out_list = []
-    app = make_app(opt_out_list, gh_token)
+    opt_out_forum = None
+    if opt_out_forum_url:
+        opt_out_forum = watch.ForumRoster(forum.OptOutThread(opt_out_forum_url))
+        # the first refresh reads the whole thread, so start it before any page load
+        asyncio.ensure_future(opt_out_forum.refresh())
+    shared_cache = cache.make_cache(os.environ.get("CACHE_URL", "memory"))
+    upstream = make_upstream_data(gh_token, shared_cache)
+    memberships = {}
+    snapshotter = None
+    if snapshot_filename:
+        # start warm, the prefetcher revalidates the restored values right away
+        snapshotter = snapshot.Snapshotter(snapshot_filename, upstream, memberships)
+        snapshotter.load()
+        snapshotter.start()
+    loop_monitor = None
+    if os.environ.get("LOOP_LAG_THRESHOLD"):
+        loop_monitor = lag.LagMonitor(float(os.environ["LOOP_LAG_THRESHOLD"]))
+        loop_monitor.start()
+    prefetcher = prefetch.Prefetcher(upstream)
+    prefetcher.start()
+    app = make_app(
+        opt_out_list,
+        gh_token,
+        opt_out_file=opt_out_file,
+        opt_out_forum=opt_out_forum,
+        upstream=upstream,
+        memberships=memberships,
+        loop_monitor=loop_monitor,
+        shared_cache=shared_cache,
+    )
     app.listen(port)
-    await asyncio.Event().wait()
+    stopped = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    try:
+        await stopped.wait()
+    finally:
+        prefetcher.stop()
+        if loop_monitor is not None:
+            loop_monitor.stop()
+        if snapshotter is not None:
+            snapshotter.stop()
+            snapshotter.save()
+        if opt_out_file is not None:
+            opt_out_file.stop()
+        app.settings["executor"].shutdown(wait=False, cancel_futures=True)
+        shared_cache.close()
 
 
 def main():
@@ -229,8 +789,36 @@ def main():
     parser.add_argument(
         "-t",
         "--gh-token",
-        help="GitHub token (needed to not run into rate-limiting).",
+        help="GitHub token (needed to not run into rate-limiting, "
+        "default: GITHUB_TOKEN environment variable).",
+        default=os.environ.get("GITHUB_TOKEN"),
+    )
+    parser.add_argument(
+        "-s",
+        "--snapshot",
+        help="File to keep the cached upstream data in across restarts",
+        default=os.environ.get("SNAPSHOT_FILE"),
+    )
+    parser.add_argument(
+        "-O",
+        "--opt-out-forum",
+        help="Also treat maintainers as opting out who said so in the forum "
+        f"thread at this URL, i.e., {OPT_OUT_FORUM}",
+        metavar="URL",
+        default=os.environ.get("OPT_OUT_FORUM_URL"),
     )
     args = parser.parse_args()
-
-    asyncio.run(async_main(args.port, args.opt_out_list, args.gh_token))
+    if not args.gh_token:
+        # the prefetcher polls GitHub without any user, so it would run into
+        # the rate limit for unauthenticated requests right away
+        parser.error("a GitHub token is required, use -t or GITHUB_TOKEN")
+
+    asyncio.run(
+        async_main(
+            args.port,
+            args.opt_out_list,
+            args.gh_token,
+            args.snapshot,
+            args.opt_out_forum,
+        )
+    )
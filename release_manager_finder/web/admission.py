@@ -0,0 +1,133 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import collections
+import functools
+import time
+import typing
+
+import tornado.web
+
+from release_manager_finder.web.deadline import LatencyTracker
+
+
+class Overloaded(Exception):
+    pass
+
+
+class AdmissionControl:  # pylint: disable=too-many-instance-attributes
+    """Limits the number of requests a handler works on at the same time
+
+    Up to ``limit`` requests are admitted at once. Further requests wait in a
+    queue of at most ``queue_size`` requests for at most ``queue_timeout``
+    seconds. Requests that find the queue full or time out while waiting are
+    rejected with :py:class:`Overloaded`.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        queue_size: int,
+        queue_timeout: float = None,
+        retry_after: int = 5,
+    ):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: typing.Deque[asyncio.Future] = collections.deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_time = LatencyTracker(window=1000, min_samples=1)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            self.queue_time.record(0.0)
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise Overloaded(f"Queue of {self.queue_size} requests is full")
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot over, so active is not changed here
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done():
+                # got a slot just in time, so pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            raise Overloaded(f"Not admitted within {self.queue_timeout}s") from exc
+        self.admitted += 1
+        self.queue_time.record(time.monotonic() - start)
+
+    def release(self) -> None:
+        if self._waiters:
+            self._waiters.popleft().set_result(None)
+        else:
+            self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_time": {
+                "p50": self.queue_time.percentile(0.5),
+                "p95": self.queue_time.percentile(0.95),
+                "max": max(self.queue_time.samples, default=None),
+            },
+        }
+
+
+def admitted(name: str) -> typing.Callable:
+    """Run a handler method only once admitted by the admission control ``name``
+
+    Rejected requests are answered right away with status 503 and a
+    ``Retry-After`` header.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self: tornado.web.RequestHandler, *args, **kwargs):
+            control = self.settings["admission"][name]
+            try:
+                await control.acquire()
+            except Overloaded:
+                self.set_status(503)
+                self.set_header("Retry-After", str(control.retry_after))
+                self.finish("Too many requests, please try again in a few seconds.")
+                return None
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                control.release()
+
+        return wrapper
+
+    return decorator
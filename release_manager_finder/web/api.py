@@ -0,0 +1,259 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import hashlib
+import itertools
+import json
+import typing
+
+import tornado.web
+
+from .. import batch, interned, prefix
+from . import admission, auth, offload
+from .prefetch import fetch_upstream
+
+# maintainers rendered into or returned for one page of a maintainer picker
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# scenarios evaluated by one request to /api/scenarios
+MAX_SCENARIOS = 1000
+
+
+def maintainer_index(
+    settings: dict, maintainers: typing.Iterable[str]
+) -> prefix.PrefixIndex:
+    """Prefix index of ``maintainers``, rebuilt when the upstream data changes"""
+    version = settings["upstream"].version
+    cached = settings["maintainer_index"]
+    if cached.get("version") != version:
+        cached["index"] = prefix.PrefixIndex(maintainers)
+        cached["version"] = version
+    return cached["index"]
+
+
+def _logins(value: typing.Any, field: str) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise tornado.web.HTTPError(400, f"{field} must be a list of logins")
+    return value
+
+
+class APIHandler(tornado.web.RequestHandler):
+    """Base for the JSON endpoints
+
+    Responses carry an ETag derived from the inputs and the digests of the
+    upstream data, so clients revalidating with ``If-None-Match`` get a 304
+    without anything being computed as long as nothing changed. The digests,
+    unlike the data version, are the same after a restart and on all
+    instances.
+    """
+
+    def data_etag(
+        self,
+        inputs: dict[str, list[str]],
+        names: tuple[str, ...] = ("maintainers", "past_release_managers"),
+    ) -> str:
+        upstream = self.settings["upstream"]
+        key = json.dumps(
+            [self.request.path, [upstream.digest(name) for name in names], inputs],
+            separators=(",", ":"),
+        )
+        return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    async def load_data(self) -> None:
+        # pylint: disable=attribute-defined-outside-init
+        # fetch cold data first, so the ETag is based on the data used
+        self.maintainers, self.past_release_managers = await fetch_upstream(
+            self, "maintainers", "past_release_managers"
+        )
+
+    def write_json(self, data: typing.Any) -> None:
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.write(json.dumps(data, separators=(",", ":")))
+
+    def write_error(self, status_code, **kwargs):
+        message = self._reason
+        if "exc_info" in kwargs and isinstance(
+            kwargs["exc_info"][1], tornado.web.HTTPError
+        ):
+            message = kwargs["exc_info"][1].log_message or message
+        self.finish({"error": message})
+
+    def data_received(self, chunk):
+        # implemented to make pylint happy
+        return None
+
+
+class ResultsHandler(auth.MaintainerMixin, APIHandler):
+    """Base for the endpoints returning the results for the inputs of the web
+    form, subclasses pick what to return in ``results_json()``
+
+    Like the form, they need a logged-in maintainer and wait for admission,
+    and the results are computed in the executor.
+    """
+
+    results_json: typing.Callable[..., dict]
+
+    def get_inputs(self) -> dict[str, list[str]]:
+        return {
+            "next-rm": self.get_arguments("next-rm"),
+            "opt-out": sorted(set(self.get_arguments("opt-out"))),
+            "attendees": sorted(set(self.get_arguments("attendees"))),
+        }
+
+    async def compute_results(self, inputs: dict[str, list[str]]) -> tuple:
+        roster = self.settings["roster"]
+        # intern new logins here, so threads of the executor only read the roster
+        for login in itertools.chain(self.maintainers, self.past_release_managers):
+            roster.intern(login)
+        try:
+            return await offload.run(
+                self.settings["executor"],
+                interned.get_results,
+                self.maintainers,
+                self.past_release_managers,
+                inputs["next-rm"],
+                inputs["opt-out"],
+                inputs["attendees"],
+                roster=roster,
+            )
+        except KeyError as exc:
+            raise tornado.web.HTTPError(
+                400, f"Unknown next release manager {exc}"
+            ) from exc
+
+    @tornado.web.authenticated
+    @admission.admitted("main")
+    async def get(self):
+        inputs = self.get_inputs()
+        await self.load_data()
+        self.set_header("Etag", self.data_etag(inputs))
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        rm_tally, pool = await self.compute_results(inputs)
+        self.write_json(self.results_json(inputs, rm_tally, pool))
+
+
+class TallyHandler(ResultsHandler):
+    def results_json(self, inputs, rm_tally, pool):
+        # pylint: disable=unused-argument
+        return {
+            "tally": rm_tally,
+            "maintainers": sorted(self.maintainers),
+            "opt_out": inputs["opt-out"],
+            "attendees": inputs["attendees"],
+        }
+
+
+class SelectionHandler(ResultsHandler):
+    def results_json(self, inputs, rm_tally, pool):
+        # pylint: disable=unused-argument
+        return {"selection_pool": pool}
+
+
+class MaintainerSearchHandler(APIHandler):
+    """Page through the current maintainers whose login starts with ``q``"""
+
+    def get_int_argument(self, name: str, default: int, maximum: int = None) -> int:
+        try:
+            value = int(self.get_argument(name, str(default)))
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, f"{name} must be an integer") from exc
+        if value < 0:
+            raise tornado.web.HTTPError(400, f"{name} must not be negative")
+        return value if maximum is None else min(value, maximum)
+
+    async def get(self):
+        # logins are often typed as mentions
+        query = self.get_argument("q", "").strip().lstrip("@")
+        offset = self.get_int_argument("offset", 0)
+        limit = self.get_int_argument("limit", PAGE_SIZE, MAX_PAGE_SIZE)
+        (maintainers,) = await fetch_upstream(self, "maintainers")
+        self.set_header(
+            "Etag",
+            self.data_etag(
+                {"q": [query], "offset": [str(offset)], "limit": [str(limit)]},
+                ("maintainers",),
+            ),
+        )
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        total, page = maintainer_index(self.settings, maintainers).search(
+            query, offset, limit
+        )
+        self.write_json({"total": total, "offset": offset, "maintainers": page})
+
+
+class ScenariosHandler(auth.MaintainerMixin, APIHandler):
+    """Evaluate a batch of what-if scenarios against the current tally
+
+    Takes a JSON object with the ``next_release_managers`` for all scenarios
+    and a list of ``scenarios`` like the lines of a manifest of
+    :py:mod:`release_manager_finder.batch`, but with lists of logins only.
+    A batch costs as much as many form submissions, so like those it needs a
+    logged-in maintainer (and the XSRF token) and waits for admission.
+    """
+
+    def get_scenarios(self) -> tuple[list[str], list[batch.Scenario]]:
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, "Body must be a JSON object") from exc
+        if not isinstance(payload, dict) or not isinstance(
+            payload.get("scenarios"), list
+        ):
+            raise tornado.web.HTTPError(400, "scenarios must be a list")
+        if len(payload["scenarios"]) > MAX_SCENARIOS:
+            raise tornado.web.HTTPError(
+                400, f"At most {MAX_SCENARIOS} scenarios can be evaluated at once"
+            )
+        scenarios = []
+        for number, entry in enumerate(payload["scenarios"], start=1):
+            if not isinstance(entry, dict):
+                raise tornado.web.HTTPError(400, f"Scenario {number} is no object")
+            scenarios.append(
+                batch.Scenario(
+                    name=str(entry.get("name", number)),
+                    **{
+                        field: _logins(entry.get(field), field)
+                        for field in batch.SCENARIO_FILES
+                    },
+                )
+            )
+        return (
+            _logins(payload.get("next_release_managers"), "next_release_managers"),
+            scenarios,
+        )
+
+    @tornado.web.authenticated
+    @admission.admitted("main")
+    async def post(self):
+        next_release_managers, scenarios = self.get_scenarios()
+        await self.load_data()
+        try:
+            results = await offload.run(
+                offload.thread_executor(self.settings["executor"]),
+                lambda: list(
+                    batch.evaluate_scenarios(
+                        self.maintainers,
+                        self.past_release_managers,
+                        next_release_managers,
+                        scenarios,
+                    )
+                ),
+            )
+        except KeyError as exc:
+            raise tornado.web.HTTPError(
+                400, f"Unknown next release manager {exc}"
+            ) from exc
+        self.write_json({"scenarios": results})
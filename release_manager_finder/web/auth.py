@@ -8,17 +8,24 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 
+import json
+import time
+import typing
+
 import tornado.auth
 import tornado.escape
 import tornado.web
 import tornado
 
 from .. import GITHUB_ORGA
+from . import offload
 
 __author__ = "Martine S. Lenders <martine.lenders@tu-dresden.de>"
 
 
 GITHUB_TEAMS = ["maintainers", "owners"]
+# seconds a confirmed team membership is trusted before it is checked again
+MEMBERSHIP_TTL = 3600
 
 
 class GitHubOAuth2Mixin(tornado.auth.OAuth2Mixin):
@@ -117,3 +124,77 @@ class GitHubTeamOAuth2Mixin(GitHubOAuth2Mixin):
             self.redirect(f"/not-a-maintainer?user={user['login']}")
             return None
         return user
+
+
+class MaintainerMixin:
+    """The current user of a request handler is the maintainer logged in with
+    the signed ``user`` cookie
+
+    Team memberships are checked again after :py:data:`MEMBERSHIP_TTL`. The
+    check queries GitHub and the shared cache, which may block, so it runs in
+    the executor during :py:meth:`prepare` and not in
+    :py:meth:`get_current_user`. Handlers with ``maintainer_required`` unset
+    (e.g., to log out) skip the check, their current user is the one logged in.
+    """
+
+    maintainer_required = True
+
+    def check_membership(
+        self, user: dict, checked: typing.Optional[float]
+    ) -> typing.Optional[float]:
+        """Time the membership of ``user`` was confirmed at, ``None`` if the
+        user is not a maintainer
+
+        GitHub answers 204 for members of a team and 404 for everyone else.
+        """
+        import agithub.GitHub  # pylint: disable=import-outside-toplevel
+
+        shared_cache = self.settings["cache"]
+        key = f"membership:{user['login']}"
+        if checked is None:
+            # another instance may have checked already
+            checked = shared_cache.get(key)
+        if checked is not None and time.time() - checked < MEMBERSHIP_TTL:
+            return checked
+        github = agithub.GitHub.GitHub(token=user["access_token"], paginate=True)
+        statuses = [
+            github.orgs[GITHUB_ORGA].teams[team].members[user["login"]].get()[0]
+            for team in GITHUB_TEAMS
+        ]
+        if 204 not in statuses:
+            unknown = [status for status in statuses if status != 404]
+            if unknown:
+                # e.g. a revoked token or GitHub being down, which says nothing
+                # about the membership, so do not remember anything
+                raise tornado.web.HTTPError(
+                    502,
+                    f"Unable to check team membership, GitHub answered {unknown[0]}",
+                )
+            shared_cache.delete(key)
+            return None
+        checked = time.time()
+        shared_cache.set(key, checked, ttl=MEMBERSHIP_TTL)
+        return checked
+
+    async def prepare(self):
+        cookie = self.get_signed_cookie("user")
+        if not cookie or not self.maintainer_required:
+            return
+        user = json.loads(cookie)
+        memberships = self.settings["memberships"]
+        checked = memberships.get(user["login"])
+        if checked is None or time.time() - checked >= MEMBERSHIP_TTL:
+            checked = await offload.run(None, self.check_membership, user, checked)
+        if checked is None:
+            memberships.pop(user["login"], None)
+            self.redirect(f"not-a-maintainer?user={user['login']}")
+        else:
+            memberships[user["login"]] = checked
+        self.current_user = user
+
+    def get_current_user(self):
+        # only reached if prepare() did not check the user
+        cookie = self.get_signed_cookie("user")
+        if cookie and not self.maintainer_required:
+            return json.loads(cookie)
+        return None
@@ -0,0 +1,291 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import abc
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import typing
+import urllib.parse
+
+
+class CacheBackend(abc.ABC):
+    """Key-value store the web app caches upstream data and results in
+
+    Values are any picklable objects. Entries set with a ``ttl`` (in seconds)
+    are gone once it expired.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: str, value: typing.Any, ttl: float = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """Cache of a single process
+
+    If more than ``max_entries`` are set, expired entries and then the oldest
+    ones are removed. The cache is used from the worker threads of the web app
+    as well, so all access holds a lock.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: dict[str, tuple[typing.Any, typing.Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self.entries[key]
+            except KeyError:
+                return default
+            if expires is not None and expires <= time.time():
+                del self.entries[key]
+                return default
+            return value
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._lock:
+            # re-insert, so the dict stays ordered from oldest to newest
+            self.entries.pop(key, None)
+            self.entries[key] = (value, None if ttl is None else now + ttl)
+            if len(self.entries) > self.max_entries:
+                self.entries = {
+                    other: entry
+                    for other, entry in self.entries.items()
+                    if entry[1] is None or entry[1] > now
+                }
+                while len(self.entries) > self.max_entries:
+                    del self.entries[next(iter(self.entries))]
+
+    def delete(self, key):
+        with self._lock:
+            self.entries.pop(key, None)
+
+
+class SQLiteCache(CacheBackend):
+    """Cache in an SQLite database shared by the instances on one host
+
+    SQLite relies on file locks, which are not reliable on network file
+    systems, so the database has to be on a local file system.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM cache WHERE key = ? "
+                "AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, data, None if ttl is None else now + ttl),
+            )
+            # expired entries are removed by whoever writes next
+            self._db.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+    def delete(self, key):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RedisError(Exception):
+    """Error reply of a Redis server"""
+
+
+class RedisCache(CacheBackend):  # pylint: disable=too-many-instance-attributes
+    """Cache on a Redis server shared by the instances on several hosts
+
+    Speaks the Redis protocol (RESP) over one connection the worker threads
+    take turns on. It connects on first use and reconnects once if the
+    connection was lost, e.g., when the server closed it while idle. Values
+    are pickled, so the server must only be writable by the web app.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        *,
+        db: int = 0,
+        username: str = None,
+        password: str = None,
+        timeout: float = 5.0,
+    ):  # pylint: disable=too-many-arguments
+        self.host = host
+        self.port = port
+        self.db = db
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._reader = None
+
+    def _connect(self):
+        self._sock = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout
+        )
+        self._reader = self._sock.makefile("rb")
+        try:
+            if self.password is not None:
+                credentials = [self.username] if self.username else []
+                self._call("AUTH", *credentials, self.password)
+            if self.db:
+                self._call("SELECT", str(self.db))
+        except RedisError:
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def _call(self, *args):
+        request = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            request.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(request))
+        return self._reply()
+
+    def _reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection to Redis closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            if int(rest) < 0:
+                return None
+            data = self._reader.read(int(rest) + 2)
+            if len(data) != int(rest) + 2:
+                raise ConnectionError("Connection to Redis closed")
+            return data[:-2]
+        if kind == b"*":
+            return None if int(rest) < 0 else [self._reply() for _ in range(int(rest))]
+        raise ConnectionError(f"Unexpected reply {line!r} from Redis")
+
+    def _execute(self, args):
+        if self._sock is None:
+            self._connect()
+        try:
+            return self._call(*args)
+        except OSError:
+            self._disconnect()
+            raise
+
+    def execute(self, *args: typing.Union[str, bytes]) -> typing.Any:
+        """Send a command to the server and return its reply"""
+        with self._lock:
+            try:
+                return self._execute(args)
+            except OSError:
+                # the server may have closed the idle connection, sending the
+                # command again is fine as all commands of the cache are
+                # idempotent
+                return self._execute(args)
+
+    def get(self, key, default=None):
+        data = self.execute("GET", key)
+        if data is None:
+            return default
+        return pickle.loads(data)
+
+    def set(self, key, value, ttl=None):
+        if ttl is not None and ttl <= 0:
+            # Redis rejects expiry times that are not positive
+            self.execute("DEL", key)
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if ttl is None:
+            self.execute("SET", key, data)
+        else:
+            self.execute("SET", key, data, "PX", str(max(1, int(ttl * 1000))))
+
+    def delete(self, key):
+        self.execute("DEL", key)
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+def make_cache(url: str = "memory") -> CacheBackend:
+    """Cache backend for ``memory``, ``sqlite:///path/to/cache.db``, or
+    ``redis://[[user]:password@]host[:port][/db]``"""
+    parsed = urllib.parse.urlsplit(url)
+    if url == "memory":
+        return MemoryCache()
+    if parsed.scheme == "sqlite" and parsed.path:
+        return SQLiteCache(parsed.path)
+    if parsed.scheme == "redis" and parsed.hostname:
+        db = parsed.path.strip("/")
+        if db and not db.isdigit():
+            raise ValueError(f"Invalid Redis database {db!r} in {url!r}")
+        return RedisCache(
+            parsed.hostname,
+            parsed.port or 6379,
+            db=int(db or 0),
+            username=urllib.parse.unquote(parsed.username or "") or None,
+            password=(
+                None
+                if parsed.password is None
+                else urllib.parse.unquote(parsed.password)
+            ),
+        )
+    raise ValueError(
+        f"Unknown cache {url!r}, use memory, sqlite:///<path>, or redis://<host>"
+    )
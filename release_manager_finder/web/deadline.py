@@ -0,0 +1,102 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import collections
+import time
+import typing
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """Time budget shared by all upstream calls made for one request"""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.end = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(self.end - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, timeout: float = None) -> float:
+        """Timeout for the next call, i.e., ``timeout`` capped by the budget"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Budget of {self.budget}s exhausted")
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+class LatencyTracker:
+    """Keeps the latencies of the last ``window`` successful calls"""
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.samples = collections.deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def percentile(self, fraction: float) -> typing.Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def hedged(
+    func: typing.Callable[[float], typing.Any],
+    timeout: float,
+    hedge_after: float = None,
+) -> typing.Any:
+    """Call ``func(timeout)`` in an executor and return the first result
+
+    If the call did not finish after ``hedge_after`` seconds (e.g., the p95
+    latency of earlier calls) or failed, a second call is sent. Without
+    ``hedge_after``, no second call is sent. Raises :py:class:`DeadlineExceeded`
+    if no call succeeded within ``timeout`` seconds. As threads can not be
+    cancelled, ``func`` should not block for longer than the timeout it is
+    called with.
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    pending = {loop.run_in_executor(None, func, timeout)}
+    spare = hedge_after is not None
+    error = None
+    while pending or spare:
+        remaining = end - loop.time()
+        if remaining <= 0:
+            break
+        if not pending:
+            # the first call failed, so do not wait for the hedge delay
+            pending.add(loop.run_in_executor(None, func, remaining))
+            spare = False
+            continue
+        done, pending = await asyncio.wait(
+            pending,
+            timeout=min(remaining, hedge_after) if spare else remaining,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        if spare and not done:
+            pending.add(loop.run_in_executor(None, func, end - loop.time()))
+            spare = False
+    if error is not None and not pending:
+        raise error
+    raise DeadlineExceeded(f"No result within {timeout}s") from error
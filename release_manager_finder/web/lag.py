@@ -0,0 +1,124 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import bisect
+import collections
+import logging
+import sys
+import threading
+import time
+import traceback
+import typing
+
+from release_manager_finder.web.deadline import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of the lag histogram buckets in seconds
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, float("inf"))
+
+
+class LagMonitor:  # pylint: disable=too-many-instance-attributes
+    """Measures how late the event loop wakes up and catches blocking calls
+
+    A task sleeps for ``interval`` seconds over and over again, any time it
+    wakes up later than that is the lag of the loop. A watchdog thread checks
+    that the task keeps ticking. If it did not tick for ``threshold`` seconds,
+    the loop is blocked and the watchdog captures the stack of the loop's
+    thread, so the blocking call can be found. Once the loop wakes up again,
+    the block is counted with its duration and the stack is logged. The stack
+    is only logged, as :py:meth:`stats` are served to anyone.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        recent: int = 20,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.lag = LatencyTracker(window=1000, min_samples=1)
+        self.histogram = [0] * len(LAG_BUCKETS)
+        self.ticks = 0
+        self.blocked = 0
+        self.blocks: typing.Deque[dict] = collections.deque(maxlen=recent)
+        self._heartbeat = time.monotonic()
+        self._stack: typing.Optional[list[str]] = None
+        self._task: typing.Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+
+    def record(self, lag: float) -> None:
+        self.ticks += 1
+        self.lag.record(lag)
+        self.histogram[bisect.bisect_left(LAG_BUCKETS, lag)] += 1
+        if lag >= self.threshold:
+            self.blocked += 1
+            stack, self._stack = self._stack, None
+            self.blocks.append({"lag": lag, "time": time.time()})
+            logger.warning(
+                "Event loop was blocked for %.3fs%s",
+                lag,
+                "".join(["\n"] + stack) if stack else "",
+            )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            self.record(max(loop.time() - expected, 0.0))
+
+    def _watch(self, thread_id: int) -> None:
+        while not self._stopped.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+            if self._stack is None and (
+                time.monotonic() - heartbeat >= self.threshold + self.interval
+            ):
+                frame = sys._current_frames().get(  # pylint: disable=protected-access
+                    thread_id
+                )
+                if frame is not None and heartbeat == self._heartbeat:
+                    self._stack = traceback.format_stack(frame)
+
+    def start(self) -> None:
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run())
+        threading.Thread(
+            target=self._watch,
+            args=(threading.get_ident(),),
+            name="loop-lag-watchdog",
+            daemon=True,
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "ticks": self.ticks,
+            "blocked": self.blocked,
+            "lag": {
+                "p50": self.lag.percentile(0.5),
+                "p99": self.lag.percentile(0.99),
+                "max": max(self.lag.samples, default=None),
+            },
+            "histogram": {
+                str(bound): count for bound, count in zip(LAG_BUCKETS, self.histogram)
+            },
+            "recent_blocks": list(self.blocks),
+        }
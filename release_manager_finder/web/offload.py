@@ -0,0 +1,57 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import concurrent.futures
+import functools
+import typing
+
+EXECUTORS = {
+    "thread": concurrent.futures.ThreadPoolExecutor,
+    "process": concurrent.futures.ProcessPoolExecutor,
+}
+
+
+def make_executor(
+    kind: str = "thread", workers: int = None
+) -> concurrent.futures.Executor:
+    """Executor for the CPU-bound stages of a request
+
+    Processes sidestep the GIL, but everything sent to them is pickled, so
+    only module-level functions can be run in them.
+    """
+    try:
+        executor_class = EXECUTORS[kind]
+    except KeyError:
+        raise ValueError(
+            f"Unknown executor {kind!r}, use one of {', '.join(EXECUTORS)}"
+        ) from None
+    return executor_class(max_workers=workers)
+
+
+def thread_executor(
+    executor: typing.Optional[concurrent.futures.Executor],
+) -> typing.Optional[concurrent.futures.Executor]:
+    """``executor`` if it runs functions in threads, else the loop's default
+    executor (``None``), for functions that can not be pickled"""
+    if isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+        return executor
+    return None
+
+
+async def run(
+    executor: typing.Optional[concurrent.futures.Executor],
+    func: typing.Callable,
+    *args,
+    **kwargs,
+) -> typing.Any:
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
@@ -0,0 +1,362 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import logging
+import pickle
+import random
+import time
+import typing
+
+import tornado.web
+
+from release_manager_finder.web.cache import CacheBackend
+from release_manager_finder.web.deadline import Deadline, LatencyTracker, hedged
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class CacheEntry:  # pylint: disable=too-many-instance-attributes
+    fetch: typing.Optional[typing.Callable[[float], typing.Any]]
+    value: typing.Any = None
+    updated: typing.Optional[float] = None
+    failures: int = 0
+    error: typing.Optional[str] = None
+    latency: LatencyTracker = dataclasses.field(default_factory=LatencyTracker)
+    digest: typing.Optional[str] = None
+    # the refresh all callers wait for while it runs
+    refreshing: typing.Optional[asyncio.Future] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def warm(self) -> bool:
+        return self.updated is not None
+
+    def age(self, now: float = None) -> typing.Optional[float]:
+        if self.updated is None:
+            return None
+        return (now or time.time()) - self.updated
+
+
+class UpstreamUnavailable(Exception):
+    pass
+
+
+class UpstreamData:
+    """Upstream data (e.g. maintainers, release tally) shared by all handlers
+
+    Values are refreshed in the background by a :py:class:`Prefetcher`. If a
+    value is requested before it was fetched once, it is fetched on demand.
+    Concurrent refreshes of a value, on demand or by the prefetcher, share a
+    single fetch.
+
+    Fetchers are called with a timeout in seconds they should not exceed. Calls
+    slower than the p95 latency of the previous calls are hedged with a second
+    call (see :py:func:`~release_manager_finder.web.deadline.hedged`).
+
+    With a shared ``cache``, fetched values are published to it, and a refresh
+    takes a value another instance published less than ``shared_max_age``
+    seconds ago instead of fetching it again.
+
+    ``derived`` values are computed from another value, given as ``(source,
+    function)``, whenever that one changes. They are never fetched on their
+    own, refreshing them refreshes their source.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        fetchers: dict[str, typing.Callable[[float], typing.Any]],
+        timeout: float = 10.0,
+        optional: typing.Iterable[str] = (),
+        cache: CacheBackend = None,
+        shared_max_age: float = 240.0,
+        *,
+        derived: dict[
+            str, tuple[str, typing.Callable[[typing.Any], typing.Any]]
+        ] = None,
+    ):
+        self.entries = {name: CacheEntry(fetch) for name, fetch in fetchers.items()}
+        self.derived = dict(derived or {})
+        for name in self.derived:
+            # never fetched on their own
+            self.entries[name] = CacheEntry(None)
+        self.timeout = timeout
+        self.cache = cache
+        self.shared_max_age = shared_max_age
+        # entries only some requests need, so they do not count for readiness
+        self.optional = frozenset(optional)
+        # increases with every update, so it can be used to validate results
+        # derived from the data
+        self.version = 0
+
+    def set(self, name: str, value: typing.Any, updated: float = None) -> None:
+        entry = self.entries[name]
+        if not entry.warm or entry.value != value:
+            self.version += 1
+        entry.value = value
+        entry.updated = updated or time.time()
+        entry.failures = 0
+        entry.error = None
+        entry.digest = None
+        self._derive(name)
+
+    def _derive(self, name: str) -> None:
+        entry = self.entries[name]
+        for derived, (source, func) in self.derived.items():
+            if source == name:
+                self.set(derived, func(entry.value), entry.updated)
+
+    def digest(self, name: str) -> str:
+        """Digest of a value, the same on all instances that have the value"""
+        entry = self.entries[name]
+        if entry.digest is None:
+            entry.digest = hashlib.sha1(pickle.dumps(entry.value)).hexdigest()
+        return entry.digest
+
+    def publish(self, name: str) -> None:
+        """Put a value into the shared cache, in the background if on the loop"""
+        if self.cache is None:
+            return
+        entry = self.entries[name]
+        args = (f"upstream:{name}", (entry.value, entry.updated))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # not on the loop, so blocking does not hurt
+            self.cache.set(*args)
+            return
+        # shared caches may block on I/O, so do not use them on the loop
+        future = loop.run_in_executor(None, self.cache.set, *args)
+        future.add_done_callback(functools.partial(self._published, name))
+
+    @staticmethod
+    def _published(name: str, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Unable to publish %s: %r", name, future.exception())
+
+    def shared(self, name: str) -> typing.Optional[tuple[typing.Any, float]]:
+        """Value and fetch time of ``name`` in the shared cache, if any"""
+        if self.cache is None:
+            return None
+        return self.cache.get(f"upstream:{name}")
+
+    def adopt(
+        self, name: str, shared: typing.Optional[tuple[typing.Any, float]]
+    ) -> bool:
+        """Take a value from the shared cache if it is fresh and newer"""
+        if shared is None:
+            return False
+        value, updated = shared
+        entry = self.entries[name]
+        if time.time() - updated >= self.shared_max_age or (
+            entry.warm and entry.updated >= updated
+        ):
+            return False
+        self.set(name, value, updated)
+        return True
+
+    def update(
+        self, name: str, func: typing.Callable[[typing.Any], typing.Any]
+    ) -> bool:
+        """Incrementally update a value that was already fetched
+
+        Values that were not fetched yet are left alone, as fetching them
+        includes the update. The age of the value is not changed.
+        """
+        entry = self.entries[name]
+        if not entry.warm:
+            return False
+        value = func(entry.value)
+        if value != entry.value:
+            entry.value = value
+            entry.digest = None
+            self.version += 1
+            self.publish(name)
+            self._derive(name)
+        return True
+
+    def get(self, name: str) -> typing.Any:
+        entry = self.entries[name]
+        if not entry.warm:
+            if name in self.derived:
+                self.get(self.derived[name][0])
+            else:
+                self.set(name, entry.fetch(self.timeout))
+        return entry.value
+
+    async def fetch(
+        self, name: str, deadline: Deadline = None, max_age: float = None
+    ) -> typing.Any:
+        """Get a value without blocking longer than ``deadline`` allows
+
+        Cached values younger than ``max_age`` (any age if ``None``) are
+        returned right away. Otherwise, the value is refreshed within the
+        remaining budget, falling back to the cached value if that fails.
+        Raises :py:class:`UpstreamUnavailable` if there is no cached value to
+        fall back to.
+        """
+        entry = self.entries[name]
+        if entry.warm and (max_age is None or entry.age() <= max_age):
+            return entry.value
+        try:
+            timeout = (
+                self.timeout if deadline is None else deadline.timeout(self.timeout)
+            )
+            await self.refresh(name, timeout)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if not entry.warm:
+                raise UpstreamUnavailable(f"Unable to fetch {name}: {exc!r}") from exc
+            logger.warning("Serving stale %s: %r", name, exc)
+        return entry.value
+
+    async def fetch_all(
+        self, names: typing.Iterable[str], deadline: Deadline = None
+    ) -> list:
+        return await asyncio.gather(*(self.fetch(name, deadline) for name in names))
+
+    @staticmethod
+    def _refreshed(entry: CacheEntry, future: asyncio.Future) -> None:
+        entry.refreshing = None
+        if not future.cancelled():
+            # the callers that awaited it may have given up already
+            future.exception()
+
+    async def refresh(self, name: str, timeout: float = None) -> None:
+        if name in self.derived:
+            await self.refresh(self.derived[name][0], timeout)
+            return
+        entry = self.entries[name]
+        if entry.refreshing is not None:
+            # wait for the running refresh, but not longer than allowed
+            await asyncio.wait_for(
+                asyncio.shield(entry.refreshing),
+                self.timeout if timeout is None else timeout,
+            )
+            return
+        entry.refreshing = asyncio.ensure_future(self._refresh(name, timeout))
+        entry.refreshing.add_done_callback(functools.partial(self._refreshed, entry))
+        # a cancelled caller must not cancel the refresh the others wait for
+        await asyncio.shield(entry.refreshing)
+
+    async def _refresh(self, name: str, timeout: float = None) -> None:
+        entry = self.entries[name]
+        loop = asyncio.get_running_loop()
+        if self.cache is not None:
+            # shared caches may block on I/O, so do not use them on the loop
+            if self.adopt(name, await loop.run_in_executor(None, self.shared, name)):
+                return
+        start = loop.time()
+        try:
+            value = await hedged(
+                entry.fetch,
+                self.timeout if timeout is None else timeout,
+                entry.latency.percentile(0.95),
+            )
+        except Exception as exc:
+            entry.failures += 1
+            entry.error = repr(exc)
+            raise
+        entry.latency.record(loop.time() - start)
+        self.set(name, value)
+        if self.cache is not None:
+            await loop.run_in_executor(
+                None, self.cache.set, f"upstream:{name}", (value, entry.updated)
+            )
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            entry.warm
+            for name, entry in self.entries.items()
+            if name not in self.optional
+        )
+
+    def status(self) -> dict:
+        now = time.time()
+        return {
+            "ready": self.ready,
+            "version": self.version,
+            "caches": {
+                name: {
+                    "warm": entry.warm,
+                    "age": entry.age(now),
+                    "failures": entry.failures,
+                    "error": entry.error,
+                }
+                for name, entry in self.entries.items()
+            },
+        }
+
+
+async def fetch_upstream(handler: tornado.web.RequestHandler, *names: str) -> list:
+    """Fetch upstream data for a request within the ``upstream_budget``"""
+    try:
+        return await handler.settings["upstream"].fetch_all(
+            names, Deadline(handler.settings["upstream_budget"])
+        )
+    except UpstreamUnavailable as exc:
+        raise tornado.web.HTTPError(503, str(exc)) from exc
+
+
+class Prefetcher:
+    """Periodically refreshes all entries of an :py:class:`UpstreamData`
+
+    Refreshes are spread with ``jitter`` (a fraction of the delay) and failed
+    refreshes are retried with exponential backoff, starting at
+    ``retry_interval`` and capped at ``interval``.
+    """
+
+    def __init__(
+        self,
+        data: UpstreamData,
+        interval: float = 300.0,
+        retry_interval: float = 5.0,
+        jitter: float = 0.1,
+    ):
+        self.data = data
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.jitter = jitter
+        self._tasks: list[asyncio.Task] = []
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_delay(self, name: str) -> float:
+        failures = self.data.entries[name].failures
+        if failures:
+            backoff = self.retry_interval * 2 ** (failures - 1)
+            return self._jittered(min(backoff, self.interval))
+        return self._jittered(self.interval)
+
+    async def _run(self, name: str) -> None:
+        while True:
+            try:
+                await self.data.refresh(name)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Unable to refresh %s: %r", name, exc)
+            await asyncio.sleep(self.next_delay(name))
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run(name))
+            for name in self.data.entries
+            if name not in self.data.derived
+        ]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
@@ -0,0 +1,130 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import gzip
+import logging
+import os
+import pathlib
+import pickle
+import time
+import typing
+
+from release_manager_finder.web.prefetch import UpstreamData
+
+logger = logging.getLogger(__name__)
+
+# bump when the layout of the snapshot or the cached values changes, older
+# snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+
+def dump(upstream: UpstreamData, memberships: dict[str, float]) -> bytes:
+    """Compressed snapshot of all warm upstream values and team memberships"""
+    return gzip.compress(
+        pickle.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "saved": time.time(),
+                "upstream": {
+                    name: (entry.value, entry.updated)
+                    for name, entry in upstream.entries.items()
+                    if entry.warm
+                },
+                "memberships": dict(memberships),
+            },
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    )
+
+
+def write(path: typing.Union[str, pathlib.Path], data: bytes) -> None:
+    # write to a temporary file first, so a crash never leaves half a snapshot
+    path = pathlib.Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load(
+    path: typing.Union[str, pathlib.Path],
+    upstream: UpstreamData,
+    memberships: dict[str, float],
+) -> bool:
+    """Restore a snapshot written by :py:class:`Snapshotter`
+
+    Values keep the time they were fetched, so the
+    :py:class:`~release_manager_finder.web.prefetch.Prefetcher` revalidates
+    them while they are already served. Missing, corrupt, and outdated
+    snapshots are ignored.
+    """
+    try:
+        snapshot = pickle.loads(gzip.decompress(pathlib.Path(path).read_bytes()))
+    except FileNotFoundError:
+        return False
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.warning("Ignoring unreadable snapshot %s: %r", path, exc)
+        return False
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.warning("Ignoring snapshot %s of another version", path)
+        return False
+    for name, (value, updated) in snapshot["upstream"].items():
+        # caches may have been removed since the snapshot was taken
+        if name in upstream.entries:
+            upstream.set(name, value, updated)
+    memberships.update(snapshot["memberships"])
+    return True
+
+
+class Snapshotter:
+    """Periodically saves an :py:class:`UpstreamData` and the team memberships
+
+    :py:meth:`save` should be called on shutdown as well, so a restarted
+    server starts with the latest values.
+    """
+
+    def __init__(
+        self,
+        path: typing.Union[str, pathlib.Path],
+        upstream: UpstreamData,
+        memberships: dict[str, float],
+        interval: float = 600.0,
+    ):
+        self.path = pathlib.Path(path)
+        self.upstream = upstream
+        self.memberships = memberships
+        self.interval = interval
+        self._task: typing.Optional[asyncio.Task] = None
+
+    def load(self) -> bool:
+        return load(self.path, self.upstream, self.memberships)
+
+    def save(self) -> None:
+        write(self.path, dump(self.upstream, self.memberships))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                # only the file is written off the event loop, the values may
+                # change while the loop runs
+                data = dump(self.upstream, self.memberships)
+                await loop.run_in_executor(None, write, self.path, data)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Unable to save snapshot %s: %r", self.path, exc)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
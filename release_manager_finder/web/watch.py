@@ -0,0 +1,183 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import ctypes
+import ctypes.util
+import http.client
+import logging
+import os
+import struct
+import time
+import typing
+
+import tornado.ioloop
+
+from release_manager_finder import forum
+from release_manager_finder.web import offload
+
+logger = logging.getLogger(__name__)
+
+# see inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+INOTIFY_EVENT = struct.Struct("iIII")
+# editors tend to replace files instead of writing them in-place, so watch the
+# directory instead of the file itself
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def inotify_init(directory: str) -> typing.Optional[int]:
+    """Returns a non-blocking inotify file descriptor watching ``directory``
+
+    Returns None, if inotify is not available on this platform.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (AttributeError, OSError):
+        return None
+    fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    if add_watch(fd, os.fsencode(directory), INOTIFY_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def inotify_read(fd: int) -> list[str]:
+    names = []
+    try:
+        buf = os.read(fd, 4096)
+    except BlockingIOError:
+        return names
+    offset = 0
+    while offset + INOTIFY_EVENT.size <= len(buf):
+        _, _, _, length = INOTIFY_EVENT.unpack_from(buf, offset)
+        offset += INOTIFY_EVENT.size
+        names.append(os.fsdecode(buf[offset : offset + length].rstrip(b"\0")))
+        offset += length
+    return names
+
+
+class RosterFile:
+    """A roster file (e.g. the opt-out list) that is kept up-to-date
+
+    Uses inotify to get notified about changes and falls back to polling the
+    file where inotify is not available. The file is only re-read if its
+    modification time changed (see
+    :py:func:`release_manager_finder.read_roster_file`).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        loader: typing.Callable[[str], list[str]],
+        poll_interval: float = 2.0,
+    ):
+        self.filename = filename
+        self.loader = loader
+        self.poll_interval = poll_interval
+        self.roster = loader(filename)
+        self._inotify_fd = None
+        self._poller = None
+
+    def refresh(self) -> None:
+        try:
+            roster = self.loader(self.filename)
+        except OSError as exc:
+            # keep the last known roster while the file is being replaced
+            logger.warning("Unable to read %s: %s", self.filename, exc)
+            return
+        if roster != self.roster:
+            logger.info("Reloaded %s", self.filename)
+            self.roster = roster
+
+    def _on_inotify(self, fd, _):
+        if os.path.basename(self.filename) in inotify_read(fd):
+            self.refresh()
+
+    def start(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        self._inotify_fd = inotify_init(directory)
+        if self._inotify_fd is not None:
+            tornado.ioloop.IOLoop.current().add_handler(
+                self._inotify_fd, self._on_inotify, tornado.ioloop.IOLoop.READ
+            )
+        else:
+            self._poller = tornado.ioloop.PeriodicCallback(
+                self.refresh, self.poll_interval * 1000
+            )
+            self._poller.start()
+
+    def stop(self) -> None:
+        if self._inotify_fd is not None:
+            tornado.ioloop.IOLoop.current().remove_handler(self._inotify_fd)
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+
+class ForumRoster:  # pylint: disable=too-few-public-methods
+    """The opt-out list of a forum thread that is kept up-to-date
+
+    Meant to be refreshed on every page load, but fetches new posts at most
+    every ``min_interval`` seconds. Concurrent refreshes wait for the same
+    fetch, and a failed fetch keeps the last known roster.
+    """
+
+    def __init__(
+        self,
+        thread: forum.OptOutThread,
+        min_interval: float = 10.0,
+        timeout: float = 5.0,
+    ):
+        self.thread = thread
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.roster = thread.opt_out
+        self._refreshed = -float("inf")
+        self._refreshing: typing.Optional[asyncio.Future] = None
+
+    async def _refresh(self) -> None:
+        try:
+            full = self.thread.full_read_due
+            # only the fetch runs in a thread, the thread is updated on the loop
+            posts = await offload.run(None, self.thread.fetch_posts, self.timeout, full)
+        except (
+            OSError,
+            # e.g. IncompleteRead if the forum closes the connection early
+            http.client.HTTPException,
+            ValueError,
+            KeyError,
+            TypeError,
+        ) as exc:
+            logger.warning("Unable to refresh %s: %s", self.thread.url, exc)
+        else:
+            if self.thread.apply(posts, full):
+                logger.info("Reloaded %s", self.thread.url)
+                self.roster = self.thread.opt_out
+        finally:
+            self._refreshed = time.monotonic()
+            self._refreshing = None
+
+    async def refresh(self) -> None:
+        if self._refreshing is None:
+            if time.monotonic() - self._refreshed < self.min_interval:
+                return
+            self._refreshing = asyncio.ensure_future(self._refresh())
+        # a cancelled request must not cancel the fetch the others wait for
+        await asyncio.shield(self._refreshing)
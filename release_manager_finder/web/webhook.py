@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+#
+# Copyright (C) 2025 TU Dresden
+#
+# Distributed under terms of the MIT license.
+
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import collections
+import hashlib
+import hmac
+import json
+import logging
+
+import tornado.web
+
+from .. import GITHUB_ORGA, GITHUB_REPO, release_manager_of
+
+logger = logging.getLogger(__name__)
+
+# number of delivery IDs remembered to ignore redeliveries
+DELIVERY_HISTORY = 256
+
+
+def signature(secret: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def count_release(tally: dict[str, int], release_manager: str, delta: int) -> dict:
+    tally = dict(tally)
+    tally[release_manager] = tally.get(release_manager, 0) + delta
+    return tally
+
+
+class GitHubWebhookHandler(tornado.web.RequestHandler):
+    """Receives release events from GitHub to update the release history and
+    tally
+
+    See https://docs.github.com/en/webhooks/webhook-events-and-payloads#release
+    """
+
+    def initialize(self, deliveries: collections.OrderedDict):
+        # pylint: disable=attribute-defined-outside-init
+        self.deliveries = deliveries
+
+    def check_xsrf_cookie(self):
+        # requests are authenticated by their signature instead
+        return None
+
+    def verify_signature(self) -> bool:
+        secret = self.settings.get("webhook_secret")
+        if not secret:
+            return False
+        return hmac.compare_digest(
+            signature(secret, self.request.body),
+            self.request.headers.get("X-Hub-Signature-256", ""),
+        )
+
+    def seen(self, delivery: str) -> bool:
+        if not delivery:
+            return False
+        if delivery in self.deliveries:
+            return True
+        self.deliveries[delivery] = True
+        while len(self.deliveries) > DELIVERY_HISTORY:
+            self.deliveries.popitem(last=False)
+        return False
+
+    def post(self):
+        if not self.verify_signature():
+            raise tornado.web.HTTPError(403, "Invalid signature")
+        event = self.request.headers.get("X-GitHub-Event")
+        if event == "ping":
+            self.write("pong")
+            return
+        if event != "release":
+            self.set_status(204)
+            return
+        try:
+            payload = json.loads(self.request.body)
+            repository = payload["repository"]["full_name"]
+            if repository != f"{GITHUB_ORGA}/{GITHUB_REPO}":
+                raise tornado.web.HTTPError(400, f"Unexpected repository {repository}")
+            release_manager = release_manager_of(payload["release"])
+        except (ValueError, KeyError, TypeError) as exc:
+            raise tornado.web.HTTPError(400, f"Invalid release event: {exc!r}") from exc
+        # an unpublished release becomes a draft again, it is deleted as a draft
+        delta = {"published": 1, "unpublished": -1, "deleted": -1}.get(
+            payload.get("action")
+        )
+        if (
+            delta is None
+            or release_manager is None
+            # drafts are not released (yet), they are published again once done
+            or payload["release"].get("draft")
+            or self.seen(self.request.headers.get("X-GitHub-Delivery"))
+        ):
+            self.set_status(204)
+            return
+        upstream = self.settings["upstream"]
+        # the tally is derived from the history, so only update the tally on
+        # its own if the history was not fetched yet
+        if upstream.update(
+            "release_history",
+            lambda index: index.count_release(payload["release"], delta),
+        ) or upstream.update(
+            "past_release_managers",
+            lambda tally: count_release(tally, release_manager, delta),
+        ):
+            logger.info(
+                "Release %s %s by %s",
+                payload["release"]["tag_name"],
+                payload["action"],
+                release_manager,
+            )
+        self.set_status(202)
+
+    def data_received(self, chunk):
+        # implemented to make pylint happy
+        return None